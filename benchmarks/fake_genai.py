@@ -0,0 +1,116 @@
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterator, Optional
+
+@dataclass
+class FakeUsageMetadata:
+    prompt_token_count: int
+    candidates_token_count: int
+
+@dataclass
+class FakeResponse:
+    text: str
+    usage_metadata: FakeUsageMetadata
+
+class FakeModels:
+    """Stand-in for genai.Client().models with configurable latency and failure injection"""
+
+    def __init__(self, latency: float = 0.5, jitter: float = 0.2, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, seed: Optional[int] = None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def _start_call(self) -> float:
+        """Count the call, apply failure injection and return the simulated latency"""
+        with self._lock:
+            self.calls += 1
+            roll = self._random.random()
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+
+        if roll < self.rate_limit_rate + self.error_rate:
+            # Fail after the latency, like a real round trip
+            time.sleep(delay)
+            if roll < self.rate_limit_rate:
+                raise Exception("429 RESOURCE_EXHAUSTED. Resource has been exhausted (e.g. check quota).")
+            raise Exception("503 UNAVAILABLE. The service is currently unavailable.")
+        return delay
+
+    def generate_content(self, model: str, contents: str, config=None) -> FakeResponse:
+        delay = self._start_call()
+        # Blocking sleep on purpose: the real SDK call is synchronous too
+        time.sleep(delay)
+        return _fake_response(contents)
+
+    def generate_content_stream(self, model: str, contents: str, config=None) -> Iterator[FakeResponse]:
+        """Same reply as generate_content, delivered in chunks: half the latency to the first one"""
+        delay = self._start_call()
+        response = _fake_response(contents)
+        chunk_count = 4
+        size = max(1, -(-len(response.text) // chunk_count))
+        time.sleep(delay / 2)
+        for i in range(0, len(response.text), size):
+            yield FakeResponse(text=response.text[i:i + size], usage_metadata=response.usage_metadata)
+            time.sleep(delay / 2 / chunk_count)
+
+class FakeGenaiClient:
+    """In-process replacement for google.genai.Client used by the benchmark harness"""
+
+    def __init__(self, **kwargs):
+        self.models = FakeModels(**kwargs)
+
+def _fake_response(prompt: str) -> FakeResponse:
+    text = _fake_reply(prompt)
+    return FakeResponse(
+        text=text,
+        usage_metadata=FakeUsageMetadata(
+            prompt_token_count=len(prompt) // 4,
+            candidates_token_count=len(text) // 4
+        )
+    )
+
+def _fake_reply(prompt: str) -> str:
+    """Return a plausible reply shaped like what each GeminiAIClient prompt expects"""
+    if '"score": <number 1-10>' in prompt:
+        return json.dumps({
+            "score": 7,
+            "reasoning": "Large organisation with clear automation pain points",
+            "aiOpportunities": ["Claims automation", "Fraud detection"],
+            "businessImpact": "3x ROI within 18 months",
+            "feasibilityRisk": "Moderate integration complexity",
+            "nextSteps": "Schedule data readiness workshop"
+        })
+    if '"status": "valid|ambiguous|invalid"' in prompt:
+        return json.dumps({"status": "valid", "message": "Known company", "suggestions": [], "company_name": "Fixture Corp"})
+    if '"company_size": "size_category"' in prompt:
+        return json.dumps({"industry": "banking", "company_size": "large",
+                           "description": "A fixture financial services company.", "confidence": "high"})
+    if '"research_findings"' in prompt:
+        return json.dumps({
+            "research_findings": ["Finding one", "Finding two", "Finding three"],
+            "strategic_hypotheses": [
+                {"hypothesis": f"Hypothesis {i}", "rationale": "Rationale", "ai_opportunity": "Opportunity"}
+                for i in range(1, 5)
+            ]
+        })
+    if '"hypothesis_alignment"' in prompt:
+        return json.dumps({
+            "projects": [
+                {
+                    "title": f"Project {i}", "description": "Description", "priority": "High",
+                    "expected_roi": "250% ROI within 12 months", "timeline": "4-6 months",
+                    "investment_range": "$200K-$400K", "business_value": "Value",
+                    "implementation_notes": "Notes", "hypothesis_alignment": f"Solves hypothesis {i}"
+                }
+                for i in range(1, 4)
+            ],
+            "strategic_insights": "Insights"
+        })
+    return "Thanks for sharing. Which processes consume the most manual effort today?"
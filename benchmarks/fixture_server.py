@@ -0,0 +1,121 @@
+import html
+import re
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+# Companies the fixture "web" knows about: name -> primary domain
+FIXTURE_COMPANIES = {
+    "Fixture Bank": "fixturebank.com",
+    "Acme Insurance": "acmeinsurance.com",
+    "Globex": "globex.com",
+    "Initech": "initech.com",
+    "Umbrella Health": "umbrellahealth.com",
+    "Stark Industries": "starkindustries.com",
+}
+
+# Domains that exist but answer 403, like sites behind bot protection
+BLOCKED_DOMAINS = {"initech.com"}
+
+class FixtureWebServer:
+    """Local HTTP server standing in for company sites and the DuckDuckGo results page.
+
+    Point the validator at it with:
+        VALIDATOR_DOMAIN_URL_TEMPLATE=http://127.0.0.1:<port>/site/{domain}
+        VALIDATOR_SEARCH_URL=http://127.0.0.1:<port>/search
+    """
+
+    def __init__(self, latency: float = 0.05, companies: Optional[Dict[str, str]] = None):
+        self.latency = latency
+        self.companies = companies or FIXTURE_COMPANIES
+        self.domains = {domain: name for name, domain in self.companies.items()}
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    @property
+    def domain_url_template(self) -> str:
+        return f"http://127.0.0.1:{self.port}/site/{{domain}}"
+
+    @property
+    def search_url(self) -> str:
+        return f"http://127.0.0.1:{self.port}/search"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _handler_class(self):
+        fixture = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                time.sleep(fixture.latency)
+                parsed = urllib.parse.urlparse(self.path)
+                if parsed.path.startswith("/site/"):
+                    self._site(parsed.path[len("/site/"):])
+                elif parsed.path == "/search":
+                    query = urllib.parse.parse_qs(parsed.query).get("q", [""])[0]
+                    self._search(query)
+                else:
+                    self._send(404, "<title>Not found</title>")
+
+            def _site(self, domain: str):
+                name = fixture.domains.get(domain)
+                if name is None:
+                    self._send(404, "<title>Not found</title>")
+                elif domain in BLOCKED_DOMAINS:
+                    self._send(403, "<title>Access denied</title>")
+                else:
+                    self._send(200, f"<html><head><title>{html.escape(name)} | Official Site</title></head>"
+                                    f"<body><h1>{html.escape(name)}</h1></body></html>")
+
+            def _search(self, query: str):
+                quoted = re.search(r'"([^"]+)"', query)
+                term = quoted.group(1) if quoted else query
+                results = []
+                for name, domain in fixture.companies.items():
+                    if term.lower() not in name.lower():
+                        continue
+                    slug = name.lower().replace(" ", "")
+                    links = [
+                        (f"https://www.linkedin.com/company/{slug}", f"{name} | LinkedIn"),
+                        (f"https://en.wikipedia.org/wiki/{name.replace(' ', '_')}", f"{name} - Wikipedia"),
+                        (f"https://www.{domain}/", f"{name} - Official Site"),
+                    ]
+                    for url, title in links:
+                        results.append(
+                            f'<article data-testid="result"><h2><a data-testid="result-title-a" '
+                            f'href="{html.escape(url)}">{html.escape(title)}</a></h2></article>'
+                        )
+                self._send(200, f"<html><head><title>{html.escape(query)} at DuckDuckGo</title></head>"
+                                f"<body>{''.join(results)}</body></html>")
+
+            def _send(self, status: int, body: str):
+                payload = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
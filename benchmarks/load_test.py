@@ -0,0 +1,239 @@
+"""Offline load test for the API.
+
+Runs the FastAPI app in-process with a fake Gemini client and a local HTTP
+fixture server standing in for company websites and DuckDuckGo, then drives
+the main endpoints at a configurable concurrency and reports throughput and
+latency percentiles.
+
+    uv run python -m benchmarks.load_test --concurrency 16 --requests 400
+    uv run python -m benchmarks.load_test --scenarios chat,roi --latency 0.8 --rate-limit-rate 0.05
+
+Pass --base-url to drive an already running server instead (fakes are then
+not installed, so that server talks to whatever backends it is configured with).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.fake_genai import FakeGenaiClient
+from benchmarks.fixture_server import FIXTURE_COMPANIES, FixtureWebServer
+
+CHAT_MESSAGES = [
+    "We are a multinational bank with 20,000 employees.",
+    "Our loan approvals are slow and mostly manual.",
+    "Fraud alerts generate too many false positives for the team.",
+    "We have a data warehouse but little machine learning in production.",
+    "Budget for this year is around $500K and the CIO is sponsoring it.",
+]
+
+HYPOTHESES = [
+    "Manual loan processing and credit assessment creates operational bottlenecks",
+    "Fraud detection systems may have high false positive rates",
+    "Customer service operations face scalability challenges",
+    "Risk management relies heavily on historical data analysis",
+]
+
+COMPANY_INFO = {"companyName": "Fixture Bank", "industry": "banking", "companySize": "large"}
+
+ROI_INPUT = {
+    "company_name": "Fixture Bank",
+    "industry": "banking",
+    "company_size": "large",
+    "use_case": "Claims triage",
+    "current_process_cost": 50000,
+    "current_accuracy": 85,
+    "current_processing_time": 30,
+    "expected_ai_accuracy": 95,
+    "expected_ai_processing_time": 5,
+    "ai_implementation_cost": 400000,
+    "ai_annual_cost": 60000,
+    "consulting_engagement_scale": "enterprise",
+}
+
+PROJECT_ROI_INPUT = {
+    "project_title": "Fraud Detection",
+    "current_process_cost": 40000,
+    "current_accuracy": 80,
+    "current_processing_time": 20,
+    "expected_improvement": 3,
+    "implementation_cost": 300000,
+    "annual_operating_cost": 50000,
+}
+
+Request = Tuple[str, str, Optional[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+def _catalog_roi_request(rng: random.Random, state: Dict) -> Request:
+    from src.catalog_manager import CatalogManager
+    if "catalog_roi_configs" not in state:
+        catalog = CatalogManager().catalog_data
+        state["catalog_roi_configs"] = [
+            project["roi_calculator"] for projects in catalog.values() for project in projects
+            if "roi_calculator" in project
+        ]
+    roi_config = dict(rng.choice(state["catalog_roi_configs"]))
+    roi_config.setdefault("implementation_cost", 500000)
+    roi_config.setdefault("ongoing_cost", 100000)
+    variable_values = {name: spec.get("default", 0) for name, spec in roi_config["variables"].items()}
+    return "POST", "/catalog-roi", {"roi_config": roi_config, "variable_values": variable_values}, None
+
+def _chat_request(rng: random.Random, state: Dict) -> Request:
+    payload = {"message": CHAT_MESSAGES[state.get("turn", 0) % len(CHAT_MESSAGES)]}
+    if state.get("conversation_id"):
+        payload["conversation_id"] = state["conversation_id"]
+    state["turn"] = state.get("turn", 0) + 1
+    return "POST", "/chat", payload, None
+
+SCENARIOS: Dict[str, Callable[[random.Random, Dict], Request]] = {
+    "chat": _chat_request,
+    "validate": lambda rng, state: (
+        "POST", "/validate-company", {"company_name": rng.choice(list(FIXTURE_COMPANIES) + ["Nonexistent Widgets"])}, None
+    ),
+    "recommendations": lambda rng, state: (
+        "POST", "/ai-recommendations", {"company_info": COMPANY_INFO, "selected_hypotheses": []}, None
+    ),
+    "recommendations_hypotheses": lambda rng, state: (
+        "POST", "/ai-recommendations",
+        {"company_info": COMPANY_INFO, "selected_hypotheses": rng.sample(HYPOTHESES, 2)}, None
+    ),
+    "roi": lambda rng, state: ("POST", "/roi-calculator", ROI_INPUT, None),
+    "project_roi": lambda rng, state: (
+        "POST", "/project-roi", PROJECT_ROI_INPUT, {"industry": "banking", "company_size": "large"}
+    ),
+    "catalog_roi": _catalog_roi_request,
+}
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, int(round(pct / 100 * len(sorted_values) + 0.5)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+def summarize(samples: List[Tuple[str, float, int]], elapsed: float) -> Dict[str, Dict[str, float]]:
+    by_scenario: Dict[str, List[Tuple[float, int]]] = {}
+    for scenario, latency, status in samples:
+        by_scenario.setdefault(scenario, []).append((latency, status))
+    by_scenario["all"] = [(latency, status) for _, latency, status in samples]
+
+    report = {}
+    for scenario, values in by_scenario.items():
+        latencies = sorted(latency for latency, _ in values)
+        report[scenario] = {
+            "requests": len(values),
+            "errors": sum(1 for _, status in values if status >= 400),
+            "throughput_rps": len(values) / elapsed if elapsed else 0.0,
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "p99_ms": percentile(latencies, 99) * 1000,
+            "max_ms": (latencies[-1] if latencies else 0.0) * 1000,
+        }
+    return report
+
+def format_report(report: Dict[str, Dict[str, float]]) -> str:
+    header = f"{'scenario':<28}{'reqs':>7}{'errs':>7}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+    lines = [header, "-" * len(header)]
+    for scenario, stats in report.items():
+        lines.append(
+            f"{scenario:<28}{stats['requests']:>7}{stats['errors']:>7}{stats['throughput_rps']:>10.1f}"
+            f"{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}{stats['p99_ms']:>10.1f}{stats['max_ms']:>10.1f}"
+        )
+    return "\n".join(lines)
+
+async def run_load(client: httpx.AsyncClient, scenarios: List[str], total_requests: int,
+                   concurrency: int, seed: int) -> Tuple[List[Tuple[str, float, int]], float]:
+    samples: List[Tuple[str, float, int]] = []
+    remaining = [total_requests]
+
+    async def worker(worker_id: int):
+        rng = random.Random(seed + worker_id)
+        state: Dict[str, Any] = {}
+        while remaining[0] > 0:
+            remaining[0] -= 1
+            scenario = rng.choice(scenarios)
+            method, path, payload, params = SCENARIOS[scenario](rng, state)
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=payload, params=params)
+                status = response.status_code
+                if scenario == "chat" and status == 200:
+                    state["conversation_id"] = response.json().get("conversation_id")
+            except httpx.HTTPError:
+                status = 599
+            samples.append((scenario, time.perf_counter() - start, status))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return samples, time.perf_counter() - start
+
+def install_fakes(args, fixture: FixtureWebServer):
+    """Configure the in-process app to use the fake Gemini client and fixture web server"""
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark-fake-key")
+    os.environ["VALIDATOR_DOMAIN_URL_TEMPLATE"] = fixture.domain_url_template
+    os.environ["VALIDATOR_SEARCH_URL"] = fixture.search_url
+
+    from src import main as app_module
+    ai_client = app_module.conversation_manager.ai_client
+    ai_client.client = FakeGenaiClient(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate, seed=args.seed
+    )
+    ai_client.base_delay = args.retry_base_delay
+    return app_module.app
+
+async def main_async(args) -> Dict[str, Dict[str, float]]:
+    scenarios = [s.strip() for s in args.scenarios.split(",") if s.strip()]
+    unknown = [s for s in scenarios if s not in SCENARIOS]
+    if unknown:
+        raise SystemExit(f"Unknown scenarios: {', '.join(unknown)}. Available: {', '.join(SCENARIOS)}")
+
+    if args.base_url:
+        async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout) as client:
+            samples, elapsed = await run_load(client, scenarios, args.requests, args.concurrency, args.seed)
+        return summarize(samples, elapsed)
+
+    with FixtureWebServer(latency=args.web_latency) as fixture:
+        app = install_fakes(args, fixture)
+        transport = httpx.ASGITransport(app=app)
+        # ASGITransport does not send lifespan events; run start-up/shutdown as uvicorn would
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://benchmark", timeout=args.timeout) as client:
+                if args.warmup:
+                    await run_load(client, scenarios, args.warmup, min(args.concurrency, args.warmup), args.seed + 10_000)
+                samples, elapsed = await run_load(client, scenarios, args.requests, args.concurrency, args.seed)
+    return summarize(samples, elapsed)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline load test with fake Gemini and fixture web backends")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS),
+                        help=f"Comma-separated scenarios ({', '.join(SCENARIOS)})")
+    parser.add_argument("--requests", type=int, default=200, help="Total requests to send")
+    parser.add_argument("--concurrency", type=int, default=8, help="Concurrent virtual users")
+    parser.add_argument("--warmup", type=int, default=0, help="Warm-up requests excluded from the report")
+    parser.add_argument("--latency", type=float, default=0.5, help="Fake Gemini mean latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Fake Gemini latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of Gemini calls failing with 503")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Fraction of Gemini calls failing with 429")
+    parser.add_argument("--retry-base-delay", type=float, default=0.1, help="Override of the client's retry base delay (s)")
+    parser.add_argument("--web-latency", type=float, default=0.05, help="Fixture web server latency (s)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Per-request timeout (s)")
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument("--base-url", help="Drive an already running server instead of the in-process app")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
+    report = asyncio.run(main_async(args))
+    print(format_report(report))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
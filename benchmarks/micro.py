@@ -0,0 +1,342 @@
+"""Micro-benchmarks for the pure-Python hot paths.
+
+Each benchmark runs at several scale factors (synthetic catalogs 10-1000x the
+size of catalog.json, longer conversations, more hypotheses) so the output is
+a scaling curve rather than a single number. Results can be stored as a
+baseline and later runs compared against it:
+
+    uv run python -m benchmarks.micro --save-baseline
+    uv run python -m benchmarks.micro --compare            # exits 1 on regression
+    uv run python -m benchmarks.micro --filter catalog --scales 1,100
+"""
+import argparse
+import copy
+import json
+import os
+import platform
+import random
+import statistics
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi.responses import JSONResponse
+
+from src.ai_client import GeminiAIClient
+from src.catalog_manager import CatalogManager
+from src.conversation_manager import ConversationManager
+from src.fast_json import FastJSONResponse
+from src.gazetteer import Gazetteer, GazetteerEntry
+from src.models import (ChatMessage, ConversationResponse, ProjectROIInput, ROICalculatorInput,
+                        ROICalculatorResult)
+from src.roi_calculator import ROICalculator
+from src.state_backend import MemoryBackend
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), "baselines", "micro.json")
+DEFAULT_SCALES = (1, 10, 100, 1000)
+PRIORITIES = ["critical", "high", "medium", "low"]
+SIZES = ["startup", "small", "medium", "large", "enterprise"]
+
+HYPOTHESES = [
+    "Manual loan processing and credit assessment creates operational bottlenecks",
+    "Fraud detection systems may have high false positive rates",
+    "Customer service operations face scalability challenges",
+    "Risk management relies heavily on historical data analysis",
+    "Data insights are underutilized for strategic decisions",
+    "Customer interactions are reactive rather than proactive",
+]
+
+USER_MESSAGES = [
+    "We are a regional bank with a growing team of analysts.",
+    "Our warehouse and delivery operations are mostly manual.",
+    "The fortune 500 customers we serve expect faster onboarding.",
+    "We run a SaaS platform for hospitals and clinics.",
+]
+
+# name -> (setup(scale) -> zero-arg callable)
+BENCHMARKS: Dict[str, Callable[[int], Callable[[], Any]]] = {}
+
+def benchmark(name: str):
+    def register(setup: Callable[[int], Callable[[], Any]]):
+        BENCHMARKS[name] = setup
+        return setup
+    return register
+
+def synthetic_catalog(scale: int, seed: int = 42) -> Dict[str, List[Dict[str, Any]]]:
+    """Replicate catalog.json projects `scale` times with varied priority and cost"""
+    rng = random.Random(seed)
+    base = CatalogManager().catalog_data
+    catalog = {}
+    for industry, projects in base.items():
+        expanded = []
+        for i in range(scale):
+            for project in projects:
+                clone = copy.deepcopy(project)
+                clone["title"] = f"{project['title']} #{i}"
+                clone["priority"] = rng.choice(PRIORITIES)
+                clone["implementation_cost"] = rng.randint(150, 1500)
+                clone["ongoing_cost"] = rng.randint(20, 300)
+                expanded.append(clone)
+        catalog[industry] = expanded
+    return catalog
+
+def _catalog_manager(scale: int) -> CatalogManager:
+    manager = CatalogManager()
+    manager.catalog_data = synthetic_catalog(scale)
+    return manager
+
+def _roi_configs(scale: int) -> List[Dict[str, Any]]:
+    return [p["roi_calculator"] for projects in synthetic_catalog(scale).values() for p in projects
+            if "roi_calculator" in p]
+
+ROI_INPUT = ROICalculatorInput(
+    company_name="Benchmark Bank", industry="banking", company_size="large", use_case="Claims triage",
+    current_process_cost=50000, current_accuracy=85, current_processing_time=30, expected_ai_accuracy=95,
+    expected_ai_processing_time=5, ai_implementation_cost=400000, ai_annual_cost=60000,
+    consulting_engagement_scale="enterprise"
+)
+
+PROJECT_ROI_INPUT = ProjectROIInput(
+    project_title="Fraud Detection", current_process_cost=40000, current_accuracy=80,
+    current_processing_time=20, expected_improvement=3, implementation_cost=300000, annual_operating_cost=50000
+)
+
+@benchmark("roi.calculate_roi")
+def bench_calculate_roi(scale: int):
+    calculator = ROICalculator()
+    inputs = [ROI_INPUT] * scale
+    return lambda: [calculator.calculate_roi(i) for i in inputs]
+
+@benchmark("roi.calculate_project_roi")
+def bench_calculate_project_roi(scale: int):
+    calculator = ROICalculator()
+    inputs = [PROJECT_ROI_INPUT] * scale
+    return lambda: [calculator.calculate_project_roi(i, "banking", "large") for i in inputs]
+
+@benchmark("roi.calculate_catalog_roi")
+def bench_calculate_catalog_roi(scale: int):
+    calculator = ROICalculator()
+    configs = []
+    for config in _roi_configs(scale):
+        config = dict(config, implementation_cost=500000, ongoing_cost=100000)
+        values = {name: spec.get("default", 0) for name, spec in config["variables"].items()}
+        configs.append((config, values))
+    return lambda: [calculator.calculate_catalog_roi(c, v) for c, v in configs]
+
+@benchmark("roi.safe_eval_formula")
+def bench_safe_eval_formula(scale: int):
+    calculator = ROICalculator()
+    jobs = []
+    for config in _roi_configs(scale):
+        variables = {name: spec.get("default", 0) for name, spec in config["variables"].items()}
+        variables.update(implementation_cost=500000, ongoing_cost=100000)
+        jobs.append((config["formula"], variables))
+    return lambda: [calculator._safe_eval_formula(f, v) for f, v in jobs]
+
+@benchmark("catalog.filter_projects_by_criteria")
+def bench_filter_projects(scale: int):
+    manager = _catalog_manager(scale)
+    industries = manager.get_available_industries()
+    return lambda: [manager.filter_projects_by_criteria(i, s, limit=3) for i in industries for s in SIZES]
+
+@benchmark("catalog.format_project_for_response")
+def bench_format_projects(scale: int):
+    manager = _catalog_manager(scale)
+    projects = [p for projects in manager.catalog_data.values() for p in projects]
+    return lambda: [manager.format_project_for_response(p, "large") for p in projects]
+
+@benchmark("ai.hypothesis_demo_recommendations")
+def bench_hypothesis_recommendations(scale: int):
+    client = GeminiAIClient()
+    hypotheses = [f"{HYPOTHESES[i % len(HYPOTHESES)]} (variant {i})" for i in range(max(3, scale))]
+    company_info = {"companyName": "Benchmark Bank", "industry": "banking", "companySize": "large"}
+    return lambda: client._get_hypothesis_demo_recommendations(company_info, hypotheses)
+
+def _gazetteer(scale: int) -> Gazetteer:
+    """Bundled gazetteer padded with synthetic entries to roughly 100 * scale companies"""
+    base = Gazetteer.from_env()
+    rng = random.Random(7)
+    syllables = ["ac", "bel", "cor", "dyn", "ex", "for", "gen", "hal", "in", "jun", "kor", "lum", "mer", "nov"]
+    synthetic = [GazetteerEntry(name="".join(rng.choice(syllables) for _ in range(3)).title() + f" {i} Holdings",
+                                industry="technology", company_size="medium")
+                 for i in range(max(0, 100 * scale - len(base)))]
+    return Gazetteer(base.entries + synthetic)
+
+@benchmark("gazetteer.lookup")
+def bench_gazetteer_lookup(scale: int):
+    """Exact, suffix-insensitive, fuzzy and missing names"""
+    gazetteer = _gazetteer(scale)
+    names = ["Wells Fargo", "Apple Incorporated", "Microsfot", "Nonexistent Widgets"]
+    return lambda: [gazetteer.lookup(name) for name in names]
+
+class _NoAIClient:
+    """Stands in for GeminiAIClient; the conversation benchmarks never call the model"""
+
+def _conversation(scale: int):
+    """A ConversationManager without a Gemini client, holding one conversation of `scale` messages"""
+    manager = ConversationManager(backend=MemoryBackend(), max_cached=10, ai_client=_NoAIClient())
+    conversation_id = "benchmark"
+    for i in range(scale):
+        manager.add_message(conversation_id, "user" if i % 2 == 0 else "assistant", USER_MESSAGES[i % len(USER_MESSAGES)])
+    return manager, conversation_id
+
+@benchmark("conversation.extract_company_info")
+def bench_extract_company_info(scale: int):
+    """One turn (append + extract) on a conversation that already has `scale` messages"""
+    manager, conversation_id = _conversation(scale)
+    manager._extract_company_info(conversation_id)
+    messages = manager.backend._lists[("conversations", conversation_id)]
+    log = manager._logs[conversation_id]
+
+    def turn():
+        manager.add_message(conversation_id, "user", USER_MESSAGES[0])
+        manager._extract_company_info(conversation_id)
+        # Keep the conversation length constant between timed iterations
+        messages.pop()
+        for column in (log.roles, log.timestamps, log.contents):
+            column.pop()
+        manager.company_profiles[conversation_id]["processed"] -= 1
+    return turn
+
+@benchmark("conversation.serialize_history")
+def bench_serialize_history(scale: int):
+    """A new message, then the turn's context and the qualification payload for `scale` earlier messages"""
+    manager, conversation_id = _conversation(scale)
+    manager.get_messages(conversation_id)
+    messages = manager.backend._lists[("conversations", conversation_id)]
+    log = manager._logs[conversation_id]
+
+    def turn():
+        manager.add_message(conversation_id, "user", USER_MESSAGES[0])
+        context = manager._build_context(conversation_id)
+        json.dumps(context)
+        payload = log.to_json()
+        messages.pop()
+        for column in (log.roles, log.timestamps, log.contents, log._json):
+            column.pop()
+        manager.company_profiles[conversation_id]["processed"] -= 1
+        return payload
+    return turn
+
+@benchmark("models.serialize")
+def bench_model_serialization(scale: int):
+    roi_result = ROICalculator().calculate_roi(ROI_INPUT)
+    messages = [ChatMessage(role="user", content=USER_MESSAGES[i % len(USER_MESSAGES)], timestamp="2024-01-01T00:00:00")
+                for i in range(scale)]
+    payload = {
+        "response": "Thanks", "conversation_id": "c", "lead_score": 7, "next_steps": "Workshop",
+        "ai_opportunities": ["Fraud detection", "Claims automation"], "business_impact": "High",
+        "feasibility_risk": "Medium"
+    }
+
+    def run():
+        roi_result.model_dump_json()
+        ConversationResponse(**payload).model_dump()
+        return [m.model_dump() for m in messages]
+    return run
+
+def _recommendations_payload(scale: int) -> Dict[str, Any]:
+    """A recommendations response with every project of a synthetic catalog"""
+    manager = _catalog_manager(scale)
+    projects = [manager.format_project_for_response(copy.deepcopy(p), "large")
+                for projects in manager.catalog_data.values() for p in projects]
+    return {"projects": projects, "strategic_insights": "Focus on quick wins with measurable ROI. " * 10}
+
+@benchmark("json.render_recommendations")
+def bench_render_recommendations(scale: int):
+    """Response body for a recommendations payload with orjson (FastJSONResponse)"""
+    payload = _recommendations_payload(scale)
+    response = FastJSONResponse(payload)
+    return lambda: response.render(payload)
+
+@benchmark("json.render_recommendations_stdlib")
+def bench_render_recommendations_stdlib(scale: int):
+    """The same body through Starlette's json.dumps-based JSONResponse, for comparison"""
+    payload = _recommendations_payload(scale)
+    response = JSONResponse(payload)
+    return lambda: response.render(payload)
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> Dict[str, float]:
+    """Per-call timings using timeit's autorange to pick the loop count"""
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    runs = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {"min_s": min(runs), "median_s": statistics.median(runs), "loops": number}
+
+def run_benchmarks(names: List[str], scales: List[int], repeat: int, min_time: float) -> Dict[str, Dict[str, Dict[str, float]]]:
+    results: Dict[str, Dict[str, Dict[str, float]]] = {}
+    for name in names:
+        results[name] = {}
+        for scale in scales:
+            func = BENCHMARKS[name](scale)
+            results[name][str(scale)] = measure(func, repeat, min_time)
+            stats = results[name][str(scale)]
+            print(f"{name:<40}{scale:>7}x {stats['median_s'] * 1e6:>14.1f} us  (min {stats['min_s'] * 1e6:.1f} us)")
+    return results
+
+def compare(results: Dict, baseline: Dict, threshold: float) -> List[str]:
+    """Return regression descriptions where median time grew by more than threshold"""
+    regressions = []
+    print(f"\n{'benchmark':<40}{'scale':>8}{'baseline us':>14}{'current us':>14}{'change':>9}")
+    for name, by_scale in results.items():
+        for scale, stats in by_scale.items():
+            base = baseline.get("results", {}).get(name, {}).get(scale)
+            if not base:
+                continue
+            change = stats["median_s"] / base["median_s"] - 1 if base["median_s"] else 0.0
+            flag = "  REGRESSION" if change > threshold else ""
+            print(f"{name:<40}{scale:>7}x{base['median_s'] * 1e6:>14.1f}{stats['median_s'] * 1e6:>14.1f}{change:>+8.0%}{flag}")
+            if flag:
+                regressions.append(f"{name} @ {scale}x: {change:+.0%}")
+    return regressions
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Micro-benchmarks for pure-Python hot paths")
+    parser.add_argument("--filter", default="", help="Only run benchmarks whose name contains this text")
+    parser.add_argument("--scales", default=",".join(str(s) for s in DEFAULT_SCALES), help="Comma-separated scale factors")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per timing run")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline file path")
+    parser.add_argument("--save-baseline", action="store_true", help="Store results as the new baseline")
+    parser.add_argument("--compare", action="store_true", help="Compare against the baseline, exit 1 on regression")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown before flagging a regression")
+    return parser.parse_args(argv)
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    names = [name for name in BENCHMARKS if args.filter in name]
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    results = run_benchmarks(names, scales, args.repeat, args.min_time)
+
+    exit_code = 0
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"No baseline at {args.baseline}; run with --save-baseline first")
+        else:
+            with open(args.baseline, encoding="utf-8") as f:
+                regressions = compare(results, json.load(f), args.threshold)
+            if regressions:
+                print("\nRegressions:\n  " + "\n  ".join(regressions))
+                exit_code = 1
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(args.baseline), exist_ok=True)
+        baseline: Dict[str, Any] = {"results": {}}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, encoding="utf-8") as f:
+                baseline = json.load(f)
+        baseline["python"] = platform.python_version()
+        baseline["machine"] = platform.machine()
+        for name, by_scale in results.items():
+            baseline.setdefault("results", {}).setdefault(name, {}).update(by_scale)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"\nBaseline written to {args.baseline}")
+    return exit_code
+
+if __name__ == "__main__":
+    raise SystemExit(main())
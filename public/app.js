@@ -3,6 +3,8 @@ class AIDiscoveryApp {
         this.discoveryForm = document.getElementById('discoveryForm');
         this.discoverButton = document.getElementById('discoverButton');
         this.companyForm = document.getElementById('companyForm');
+        this.companyNameInput = document.getElementById('companyName');
+        this.companySuggestions = document.getElementById('companySuggestions');
         
         // Validation phase elements
         this.validationContainer = document.getElementById('validationContainer');
@@ -38,6 +40,10 @@ class AIDiscoveryApp {
         this.validationResult = null;
         this.researchData = null;
         this.selectedHypotheses = [];
+        this.suggestTimer = null;
+        this.suggestRequest = null;
+        this.activeSuggestion = -1;
+        this.discovery = null;
         
         this.initEventListeners();
     }
@@ -97,25 +103,15 @@ class AIDiscoveryApp {
         this.updateRecommendationLoadingMessage('Generating AI project recommendations based on validated hypotheses...');
         
         try {
-            const response = await fetch('/ai-recommendations', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({
-                    company_info: this.companyInfo,
-                    selected_hypotheses: this.selectedHypotheses
-                })
-            });
-            
-            if (!response.ok) {
-                if (response.status === 429) {
-                    this.updateRecommendationLoadingMessage('API quota exceeded. Implementing exponential backoff retry. This may take up to 10 minutes...');
+            const data = await this.runJob('ai_recommendations', {
+                company_info: this.companyInfo,
+                selected_hypotheses: this.selectedHypotheses
+            }, (event) => {
+                const message = this.jobProgressMessage(event);
+                if (message) {
+                    this.updateRecommendationLoadingMessage(message);
                 }
-                throw new Error(`Failed to get AI recommendations (${response.status})`);
-            }
-            
-            const data = await response.json();
+            });
             console.log('Recommendations data:', data);
             this.displayRecommendations(data, this.companyInfo);
             
@@ -130,6 +126,72 @@ class AIDiscoveryApp {
         }
     }
     
+    async jobKey(kind, params) {
+        // The same request always maps to the same key, so resubmitting it (e.g. after a refresh) reattaches
+        const payload = new TextEncoder().encode(JSON.stringify({ kind, params }));
+        if (!window.crypto || !window.crypto.subtle) {
+            return null;
+        }
+        const digest = await window.crypto.subtle.digest('SHA-256', payload);
+        return Array.from(new Uint8Array(digest)).map(b => b.toString(16).padStart(2, '0')).join('');
+    }
+
+    async runJob(kind, params, onEvent) {
+        // Submit a background job and follow its stage events until it finishes
+        const headers = { 'Content-Type': 'application/json' };
+        const key = await this.jobKey(kind, params);
+        if (key) {
+            headers['Idempotency-Key'] = key;
+        }
+        const response = await fetch('/jobs', {
+            method: 'POST',
+            headers: headers,
+            body: JSON.stringify({ kind, params })
+        });
+        if (!response.ok) {
+            throw new Error(`Failed to start ${kind} (${response.status})`);
+        }
+        const job = await response.json();
+
+        return new Promise((resolve, reject) => {
+            // EventSource reconnects by itself and resumes after the last event it saw
+            const source = new EventSource(`/jobs/${job.job_id}/events`);
+            source.onmessage = (message) => {
+                const event = JSON.parse(message.data);
+                if (onEvent) {
+                    onEvent(event);
+                }
+                if (event.stage === 'done') {
+                    source.close();
+                    resolve(event.result);
+                } else if (event.stage === 'failed') {
+                    source.close();
+                    reject(new Error(event.error || `${kind} failed`));
+                }
+            };
+            source.onerror = () => {
+                if (source.readyState === EventSource.CLOSED) {
+                    reject(new Error(`Lost connection to ${kind} job`));
+                }
+            };
+        });
+    }
+
+    jobProgressMessage(event) {
+        switch (event.stage) {
+            case 'queued':
+                return 'Waiting for a free worker...';
+            case 'model_call':
+                return event.attempt > 1 ? `Calling the AI model (attempt ${event.attempt})...` : null;
+            case 'retrying':
+                return `The AI model is busy, retrying in ${Math.round(event.delay)}s (attempt ${event.attempt} failed)...`;
+            case 'partial':
+                return 'Receiving research findings...';
+            default:
+                return null;
+        }
+    }
+
     showResearchError(message) {
         this.researchContent.innerHTML = `
             <div class="error-message" style="color: #dc3545; text-align: center; padding: 20px;">
@@ -267,6 +329,9 @@ class AIDiscoveryApp {
     
     initEventListeners() {
         this.discoveryForm.addEventListener('submit', (e) => this.handleFormSubmit(e));
+        this.companyNameInput.addEventListener('input', () => this.scheduleSuggestions());
+        this.companyNameInput.addEventListener('keydown', (e) => this.handleSuggestionKeys(e));
+        this.companyNameInput.addEventListener('blur', () => setTimeout(() => this.hideSuggestions(), 150));
         this.proceedButton.addEventListener('click', () => this.proceedToAnalysis());
         this.backToInputButton.addEventListener('click', () => this.showCompanyForm());
         this.validateHypothesesButton.addEventListener('click', () => this.handleHypothesesValidation());
@@ -275,8 +340,113 @@ class AIDiscoveryApp {
         this.backToHypothesesButton.addEventListener('click', () => this.showResearchStep());
     }
     
+    scheduleSuggestions() {
+        // Debounced: only ask once the rep pauses typing
+        clearTimeout(this.suggestTimer);
+        const query = this.companyNameInput.value.trim();
+        if (!query) {
+            this.hideSuggestions();
+            return;
+        }
+        this.suggestTimer = setTimeout(() => this.fetchSuggestions(query), 150);
+    }
+
+    async fetchSuggestions(query) {
+        if (this.suggestRequest) {
+            this.suggestRequest.abort();
+        }
+        this.suggestRequest = new AbortController();
+        try {
+            const response = await fetch(`/companies/suggest?q=${encodeURIComponent(query)}`, {
+                signal: this.suggestRequest.signal
+            });
+            if (!response.ok) {
+                return;
+            }
+            const result = await response.json();
+            // Ignore answers for text the rep has already changed
+            if (result.query === this.companyNameInput.value.trim()) {
+                this.showSuggestions(result);
+            }
+        } catch (error) {
+            if (error.name !== 'AbortError') {
+                console.error('Suggestion error:', error);
+            }
+        }
+    }
+
+    showSuggestions(result) {
+        this.companySuggestions.innerHTML = '';
+        this.activeSuggestion = -1;
+        if (result.suggestions.length === 0) {
+            this.hideSuggestions();
+            return;
+        }
+        if (result.ambiguous) {
+            const hint = document.createElement('div');
+            hint.className = 'company-suggestions-hint';
+            hint.textContent = `Several companies match "${result.query}" - pick one:`;
+            this.companySuggestions.appendChild(hint);
+        }
+        result.suggestions.forEach(suggestion => {
+            const option = document.createElement('div');
+            option.className = 'company-suggestion';
+            option.setAttribute('role', 'option');
+            option.dataset.name = suggestion.name;
+            const name = document.createElement('span');
+            name.textContent = suggestion.name;
+            option.appendChild(name);
+            if (suggestion.industry || suggestion.domain) {
+                const meta = document.createElement('span');
+                meta.className = 'company-suggestion-meta';
+                meta.textContent = [suggestion.industry, suggestion.domain].filter(Boolean).join(' · ');
+                option.appendChild(meta);
+            }
+            // mousedown fires before the input's blur hides the list
+            option.addEventListener('mousedown', (e) => {
+                e.preventDefault();
+                this.selectSuggestion(suggestion.name);
+            });
+            this.companySuggestions.appendChild(option);
+        });
+        this.companySuggestions.style.display = 'block';
+        this.companyNameInput.setAttribute('aria-expanded', 'true');
+    }
+
+    hideSuggestions() {
+        clearTimeout(this.suggestTimer);
+        this.companySuggestions.style.display = 'none';
+        this.companyNameInput.setAttribute('aria-expanded', 'false');
+        this.activeSuggestion = -1;
+    }
+
+    selectSuggestion(name) {
+        this.companyNameInput.value = name;
+        this.hideSuggestions();
+        this.companyNameInput.focus();
+    }
+
+    handleSuggestionKeys(e) {
+        const options = this.companySuggestions.querySelectorAll('.company-suggestion');
+        if (this.companySuggestions.style.display === 'none' || options.length === 0) {
+            return;
+        }
+        if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+            e.preventDefault();
+            const step = e.key === 'ArrowDown' ? 1 : -1;
+            this.activeSuggestion = (this.activeSuggestion + step + options.length) % options.length;
+            options.forEach((option, i) => option.classList.toggle('active', i === this.activeSuggestion));
+        } else if (e.key === 'Enter' && this.activeSuggestion >= 0) {
+            e.preventDefault();
+            this.selectSuggestion(options[this.activeSuggestion].dataset.name);
+        } else if (e.key === 'Escape') {
+            this.hideSuggestions();
+        }
+    }
+
     async handleFormSubmit(e) {
         e.preventDefault();
+        this.hideSuggestions();
         
         const formData = new FormData(this.discoveryForm);
         const companyName = formData.get('companyName');
@@ -291,24 +461,10 @@ class AIDiscoveryApp {
         this.updateValidationLoadingMessage('Validating company name...');
         
         try {
-            // First, validate the company name
-            const validationResponse = await fetch('/validate-company', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify({ company_name: companyName })
-            });
-            
-            if (!validationResponse.ok) {
-                if (validationResponse.status === 429) {
-                    this.updateValidationLoadingMessage('API rate limit reached. Retrying with backoff strategy...');
-                    // Let it retry automatically via backend
-                }
-                throw new Error(`Failed to validate company name (${validationResponse.status})`);
-            }
-            
-            this.validationResult = await validationResponse.json();
+            // Validate the company name; the server starts research in parallel
+            this.discovery = this.startDiscovery(companyName);
+            this.validationResult = await this.discovery.validation;
+            this.discovery.validationResult = this.validationResult;
             console.log('Validation result:', this.validationResult);
             this.displayValidationResult(this.validationResult);
             
@@ -323,6 +479,79 @@ class AIDiscoveryApp {
         }
     }
 
+    startDiscovery(companyName) {
+        // Stream /discover events: validation first, then speculative details and research
+        const deferred = () => {
+            const d = {};
+            d.promise = new Promise((resolve, reject) => { d.resolve = resolve; d.reject = reject; });
+            return d;
+        };
+        const validation = deferred();
+        const analysis = deferred();
+        // Research may never be awaited (e.g. the rep picks a suggestion instead)
+        analysis.promise.catch(() => {});
+        
+        const handleEvent = (event) => {
+            if (event.stage === 'validation') {
+                validation.resolve(event.result);
+            } else if (event.stage === 'company_details') {
+                this.updateResearchLoadingMessage('Conducting pre-engagement research and hypothesis generation...');
+            } else if (event.stage === 'pre_engagement_analysis_partial') {
+                const findings = (event.result.research_findings || []).length;
+                const hypotheses = (event.result.strategic_hypotheses || []).length;
+                this.updateResearchLoadingMessage(`Researching... ${findings} findings and ${hypotheses} hypotheses so far`);
+            } else if (event.stage === 'pre_engagement_analysis') {
+                analysis.resolve({ companyInfo: event.company_info, researchData: event.result });
+            } else if (event.stage === 'cancelled' || event.stage === 'error') {
+                const error = new Error(event.message || event.reason);
+                validation.reject(error);
+                analysis.reject(error);
+            }
+        };
+        
+        const run = async () => {
+            const response = await fetch('/discover', {
+                method: 'POST',
+                headers: {
+                    'Content-Type': 'application/json',
+                },
+                body: JSON.stringify({ company_name: companyName })
+            });
+            
+            if (!response.ok) {
+                if (response.status === 429) {
+                    this.updateValidationLoadingMessage('API rate limit reached. Retrying with backoff strategy...');
+                }
+                throw new Error(`Failed to validate company name (${response.status})`);
+            }
+            
+            const reader = response.body.getReader();
+            const decoder = new TextDecoder();
+            let buffer = '';
+            while (true) {
+                const { value, done } = await reader.read();
+                if (done) break;
+                buffer += decoder.decode(value, { stream: true });
+                let newline;
+                while ((newline = buffer.indexOf('\n')) >= 0) {
+                    const line = buffer.slice(0, newline).trim();
+                    buffer = buffer.slice(newline + 1);
+                    if (line) handleEvent(JSON.parse(line));
+                }
+            }
+            const ended = new Error('Discovery stream ended early');
+            validation.reject(ended);
+            analysis.reject(ended);
+        };
+        
+        run().catch(error => {
+            validation.reject(error);
+            analysis.reject(error);
+        });
+        
+        return { companyName, validation: validation.promise, analysis: analysis.promise };
+    }
+
     async proceedToAnalysis() {
         const companyName = this.validationResult.company_name || this.validationResult.original_name;
         
@@ -331,6 +560,18 @@ class AIDiscoveryApp {
         this.updateResearchLoadingMessage('Analyzing company details...');
         
         try {
+            // Use the research the discovery pipeline already started, if it is for this result
+            if (this.discovery && this.discovery.validationResult === this.validationResult) {
+                const pipelined = await this.discovery.analysis.catch(() => null);
+                if (pipelined) {
+                    this.companyInfo = pipelined.companyInfo;
+                    this.researchData = pipelined.researchData;
+                    console.log('Research data:', this.researchData);
+                    this.displayResearchFindings(this.researchData);
+                    return;
+                }
+            }
+            
             // Infer company details from the validated name
             const detailsResponse = await fetch('/infer-company-details', {
                 method: 'POST',
@@ -361,22 +602,12 @@ class AIDiscoveryApp {
             // Now do the pre-engagement analysis
             this.updateResearchLoadingMessage('Conducting pre-engagement research and hypothesis generation...');
             
-            const analysisResponse = await fetch('/pre-engagement-analysis', {
-                method: 'POST',
-                headers: {
-                    'Content-Type': 'application/json',
-                },
-                body: JSON.stringify(this.companyInfo)
-            });
-            
-            if (!analysisResponse.ok) {
-                if (analysisResponse.status === 429) {
-                    this.updateResearchLoadingMessage('API quota reached. Retrying with intelligent backoff. Please wait as this may take several minutes...');
+            this.researchData = await this.runJob('pre_engagement_analysis', this.companyInfo, (event) => {
+                const message = this.jobProgressMessage(event);
+                if (message) {
+                    this.updateResearchLoadingMessage(message);
                 }
-                throw new Error(`Failed to get pre-engagement analysis (${analysisResponse.status})`);
-            }
-            
-            this.researchData = await analysisResponse.json();
+            });
             console.log('Research data:', this.researchData);
             this.displayResearchFindings(this.researchData);
             
@@ -679,6 +910,7 @@ class AIDiscoveryApp {
         this.validationResult = null;
         this.researchData = null;
         this.selectedHypotheses = [];
+        this.discovery = null;
     }
     
     async handleROICalculation(e) {
@@ -1,25 +1,241 @@
-import google.genai as genai
-import json
 import os
 import asyncio
+import contextvars
 import random
-from typing import Dict, List, Any
+import time
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Awaitable, Callable, Dict, Iterator, List, Any, Optional, Union
 from .catalog_manager import CatalogManager
-from .web_validator import get_web_validator
+from . import fast_json
+from .gazetteer import Gazetteer
+from .job_manager import report_progress
+from .web_validator import ValidationResult, get_web_validator
+from .validation_pool import ValidatorBusy
+from .keyword_matcher import KeywordMatcher
+from .model_router import ModelRouter
+from .models import (CompanyDetails, CompanyValidation, HypothesisRecommendations, LeadQualification,
+                     PreEngagementAnalysis)
+from .structured_output import IncrementalJSONParser, parse_json, response_config
+from . import tracing
+from .metrics import AI_FALLBACKS, GEMINI_REQUEST_DURATION, GEMINI_RETRIES, GEMINI_TOKENS, record_cache_lookup
+
+# Fallback reasons whose result is demo or apology output rather than an answer
+DEGRADED_FALLBACK_REASONS = ('error', 'no_client')
+_degraded: contextvars.ContextVar[Optional[List[str]]] = contextvars.ContextVar('ai_degraded', default=None)
+
+def record_fallback(operation: str, reason: str):
+    AI_FALLBACKS.inc(operation=operation, reason=reason)
+    degraded = _degraded.get()
+    if degraded is not None and reason in DEGRADED_FALLBACK_REASONS:
+        degraded.append(f"{operation}: {reason}")
+
+@contextmanager
+def track_degraded() -> Iterator[List[str]]:
+    """Collect the degraded fallbacks ("operation: reason") taken by AI calls in this block"""
+    degraded: List[str] = []
+    token = _degraded.set(degraded)
+    try:
+        yield degraded
+    finally:
+        _degraded.reset(token)
+
+def _hypothesis_term_groups(templates: Dict, fuzzy_matches: Dict, category_boosts: Dict,
+                            secondary_connections: Dict, improvement_terms: List[str]) -> Dict[str, List[str]]:
+    """Collect every term used by hypothesis scoring, grouped by category"""
+    groups = {category: [kw for variant in variations.values() for kw in variant["keywords"]]
+              for category, variations in templates.items()}
+    groups["fuzzy"] = [term for terms in fuzzy_matches.values() for term in terms]
+    for category, terms in list(category_boosts.items()) + list(secondary_connections.items()):
+        groups.setdefault(category, []).extend(terms)
+    groups["improvement"] = list(improvement_terms)
+    return groups
 
 class GeminiAIClient:
+    # Demo industry detection for company names (checked in order, first match wins)
+    DEMO_INDUSTRY_KEYWORDS = {
+        "banking": ['bank', 'financial', 'credit', 'goldman', 'jpmorgan', 'wells fargo', 'citi'],
+        "insurance": ['insurance', 'aetna', 'allstate', 'progressive', 'geico'],
+        "technology": ['tech', 'software', 'apple', 'google', 'microsoft', 'amazon', 'meta', 'tesla'],
+        "healthcare": ['hospital', 'health', 'medical', 'pharma', 'bio']
+    }
+    
+    # Enhanced semantic project templates with industry-specific variations
+    HYPOTHESIS_PROJECT_TEMPLATES = {
+        "process_automation": {
+            "banking": {
+                "title": "AI-Powered Loan Processing Automation",
+                "description": "Automate credit assessment, loan approval workflows, and compliance checks using machine learning to eliminate manual bottlenecks and reduce approval times.",
+                "keywords": ["manual", "loan", "processing", "credit", "approval", "assessment", "bottleneck"],
+                "roi": "350% ROI within 12 months",
+                "timeline": "6-9 months",
+                "investment": "$300K-$600K"
+            },
+            "insurance": {
+                "title": "Automated Claims Processing System",
+                "description": "Deploy AI to automatically process claims, validate documentation, and make approval decisions, reducing manual review time and improving accuracy.",
+                "keywords": ["manual", "claims", "processing", "review", "documentation", "approval"],
+                "roi": "280% ROI within 10 months", 
+                "timeline": "4-7 months",
+                "investment": "$250K-$500K"
+            },
+            "default": {
+                "title": "Intelligent Process Automation Platform",
+                "description": "Implement AI-powered automation to streamline manual processes, reduce human error, and improve operational efficiency across key business functions.",
+                "keywords": ["manual", "process", "bottleneck", "inefficien", "workflow"],
+                "roi": "300% ROI within 15 months",
+                "timeline": "6-8 months",
+                "investment": "$250K-$450K"
+            }
+        },
+        "fraud_detection": {
+            "banking": {
+                "title": "Advanced ML Fraud Detection System",
+                "description": "Replace rule-based fraud systems with machine learning models that reduce false positives while improving detection accuracy across all banking channels.",
+                "keywords": ["fraud", "detection", "false positive", "rule-based", "alarm"],
+                "roi": "400% ROI within 18 months",
+                "timeline": "5-8 months",
+                "investment": "$400K-$800K"
+            },
+            "insurance": {
+                "title": "AI Insurance Fraud Prevention Platform",
+                "description": "Deploy sophisticated ML algorithms to identify fraudulent claims patterns and reduce false alarms, improving both detection accuracy and claim processing speed.",
+                "keywords": ["fraud", "detection", "claims", "false", "pattern"],
+                "roi": "320% ROI within 16 months",
+                "timeline": "4-7 months",
+                "investment": "$300K-$600K"
+            },
+            "default": {
+                "title": "Machine Learning Fraud Detection",
+                "description": "Advanced fraud detection system using ML to identify suspicious patterns while minimizing false positives and improving operational efficiency.",
+                "keywords": ["fraud", "detection", "false positive", "suspicious"],
+                "roi": "350% ROI within 12 months",
+                "timeline": "4-6 months",
+                "investment": "$200K-$400K"
+            }
+        },
+        "customer_service": {
+            "banking": {
+                "title": "Intelligent Banking Chatbot & Virtual Assistant",
+                "description": "Deploy AI-powered conversational agents to handle routine banking inquiries, account services, and transaction support, reducing call center volume.",
+                "keywords": ["customer", "service", "inquir", "scalability", "call", "support"],
+                "roi": "250% ROI within 10 months",
+                "timeline": "3-5 months", 
+                "investment": "$150K-$300K"
+            },
+            "insurance": {
+                "title": "AI Customer Support Automation",
+                "description": "Implement intelligent chatbots and automated support systems to handle policy inquiries, claims status, and customer service requests 24/7.",
+                "keywords": ["customer", "service", "inquir", "support", "scalability"],
+                "roi": "220% ROI within 8 months",
+                "timeline": "3-6 months",
+                "investment": "$120K-$250K"
+            },
+            "default": {
+                "title": "AI-Powered Customer Service Platform",
+                "description": "Intelligent customer service automation to handle routine inquiries, improve response times, and scale support operations efficiently.",
+                "keywords": ["customer", "service", "inquir", "support", "scalability"],
+                "roi": "200% ROI within 12 months",
+                "timeline": "4-6 months",
+                "investment": "$100K-$200K"
+            }
+        },
+        "risk_management": {
+            "banking": {
+                "title": "Predictive Risk Analytics Platform",
+                "description": "Advanced ML models for real-time risk assessment, market pattern analysis, and proactive risk management beyond traditional historical data approaches.",
+                "keywords": ["risk", "management", "historical", "pattern", "predictive", "analyt"],
+                "roi": "300% ROI within 16 months",
+                "timeline": "7-12 months",
+                "investment": "$500K-$1M"
+            },
+            "insurance": {
+                "title": "Dynamic Risk Assessment Engine",
+                "description": "AI-powered risk evaluation system that incorporates real-time data sources and predictive modeling to improve underwriting accuracy and pricing.",
+                "keywords": ["risk", "assessment", "underwriting", "pricing", "predictive"],
+                "roi": "280% ROI within 14 months",
+                "timeline": "6-10 months",
+                "investment": "$400K-$700K"
+            },
+            "default": {
+                "title": "AI Risk Management System",
+                "description": "Predictive risk analytics platform using machine learning to identify patterns and enable proactive risk management strategies.",
+                "keywords": ["risk", "management", "predictive", "proactive", "pattern"],
+                "roi": "250% ROI within 12 months",
+                "timeline": "5-8 months",
+                "investment": "$300K-$500K"
+            }
+        }
+    }
+    
+    # Fuzzy/related concepts: a variant whose keywords mention the base concept also scores related terms
+    HYPOTHESIS_FUZZY_MATCHES = {
+        "data": ["insights", "analytics", "intelligence", "information", "decisions"],
+        "predictive": ["forecasting", "prediction", "anticipate", "proactive", "future"],
+        "customer": ["client", "user", "experience", "satisfaction", "service"],
+        "reactive": ["responsive", "after", "post", "following"],
+        "scalability": ["scale", "growth", "volume", "capacity", "expansion"],
+        "inefficien": ["slow", "bottleneck", "delay", "waste", "suboptimal"]
+    }
+    
+    # Category-specific semantic boosts
+    HYPOTHESIS_CATEGORY_BOOSTS = {
+        "process_automation": ["manual", "bottleneck", "workflow", "approval", "processing"],
+        "fraud_detection": ["fraud", "detection", "security", "false", "alarm"],
+        "customer_service": ["customer", "service", "support", "inquiry", "satisfaction"],
+        "risk_management": ["risk", "management", "assessment", "prediction", "analytics"]
+    }
+    
+    # Secondary/supporting connections used to rank filler projects
+    HYPOTHESIS_SECONDARY_CONNECTIONS = {
+        "process_automation": ["efficiency", "optimization", "streamline", "improve"],
+        "fraud_detection": ["security", "protection", "monitoring", "compliance"],
+        "customer_service": ["experience", "satisfaction", "engagement", "retention"],
+        "risk_management": ["analysis", "monitoring", "assessment", "evaluation"]
+    }
+    
+    HYPOTHESIS_IMPROVEMENT_TERMS = ["competitive", "advantage", "growth", "transformation", "moderniz"]
+    
+    # Bump whenever a prompt or demo template changes so materialized results are recomputed
+    PROMPT_VERSION = "2"
+
+    DEMO_INDUSTRY_MATCHER = KeywordMatcher(DEMO_INDUSTRY_KEYWORDS)
+    HYPOTHESIS_MATCHER = KeywordMatcher(_hypothesis_term_groups(
+        HYPOTHESIS_PROJECT_TEMPLATES, HYPOTHESIS_FUZZY_MATCHES, HYPOTHESIS_CATEGORY_BOOSTS,
+        HYPOTHESIS_SECONDARY_CONNECTIONS, HYPOTHESIS_IMPROVEMENT_TERMS
+    ))
+    
     def __init__(self):
         api_key = os.getenv('GEMINI_API_KEY')
-        if api_key and api_key != 'your_gemini_api_key_here':
-            self.client = genai.Client(api_key=api_key)
-        else:
-            self.client = None
-        self.model = 'gemini-1.5-flash'
+        self._api_key = api_key if api_key and api_key != 'your_gemini_api_key_here' else None
+        self._client = None
+        self._client_loaded = False
+        # Per-operation model selection; self.model is the default for unrouted operations
+        self.router = ModelRouter.from_env()
+        self.model = self.router.default_model
+        self._shadow_tasks = set()
         self.catalog_manager = CatalogManager()
+        # Known companies, resolved locally before the browser or the model
+        self.gazetteer = Gazetteer.from_env()
         # Retry configuration
         self.max_retries = 5
         self.base_delay = 2  # seconds
     
+    @property
+    def client(self):
+        """Gemini SDK client (None in demo mode), created on first use to keep app import cheap"""
+        if not self._client_loaded:
+            if self._api_key:
+                from google import genai
+                self._client = genai.Client(api_key=self._api_key)
+            self._client_loaded = True
+        return self._client
+
+    @client.setter
+    def client(self, value):
+        self._client = value
+        self._client_loaded = True
+    
     async def generate_response(self, user_message: str, context: Dict = None) -> str:
         if not self.client:
             return "I apologize, but AI chat functionality requires a valid API key configuration."
@@ -30,10 +246,11 @@ class GeminiAIClient:
             full_prompt = f"{system_prompt}\n\nUser: {user_message}\n\nAssistant:"
             
             response = await self._retry_api_call(
-                lambda: self.client.models.generate_content(
-                    model=self.model,
+                lambda model: self.client.models.generate_content(
+                    model=model,
                     contents=full_prompt
-                )
+                ),
+                "Chat response"
             )
             
             if not response or not response.text:
@@ -42,8 +259,53 @@ class GeminiAIClient:
             return response.text.strip()
         except Exception as e:
             print(f"AI API Error: {e}")
+            record_fallback(operation="Chat response", reason="error")
             return "I apologize, but I'm experiencing technical difficulties. Please try again in a moment."
     
+    async def stream_response(self, user_message: str, context: Dict,
+                              on_token: Callable[[Optional[str]], None]) -> str:
+        """generate_response, passing text deltas to on_token on the event loop as they arrive.
+
+        on_token(None) marks the start of an attempt: text received before it
+        belongs to an attempt that failed and is being retried.
+        """
+        if not self.client:
+            text = "I apologize, but AI chat functionality requires a valid API key configuration."
+            on_token(text)
+            return text
+
+        try:
+            full_prompt = f"{self._build_system_prompt(context or {})}\n\nUser: {user_message}\n\nAssistant:"
+            loop = asyncio.get_running_loop()
+
+            def stream_content(model: str):
+                loop.call_soon_threadsafe(on_token, None)
+                chunks = []
+                usage = None
+                for chunk in self.client.models.generate_content_stream(model=model, contents=full_prompt):
+                    text = chunk.text or ""
+                    usage = getattr(chunk, 'usage_metadata', None) or usage
+                    if text:
+                        chunks.append(text)
+                        loop.call_soon_threadsafe(on_token, text)
+                return SimpleNamespace(text="".join(chunks), usage_metadata=usage)
+
+            def generate_content(model: str):
+                return self.client.models.generate_content(model=model, contents=full_prompt)
+
+            # Shadow calls must not stream to the user, so they use the non-streaming request
+            response = await self._retry_api_call(stream_content, "Chat response", shadow_call_func=generate_content)
+            if not response.text:
+                raise Exception("Empty response from AI model")
+            return response.text.strip()
+        except Exception as e:
+            print(f"AI API Error: {e}")
+            record_fallback(operation="Chat response", reason="error")
+            text = "I apologize, but I'm experiencing technical difficulties. Please try again in a moment."
+            on_token(None)
+            on_token(text)
+            return text
+
     def _build_system_prompt(self, context: Dict) -> str:
         return f"""You are an expert AI project sales consultant working for Capgemini, specializing in identifying and selling high-value AI transformation projects to enterprise clients.
 
@@ -77,50 +339,153 @@ Your expertise includes:
 - Build roadmap from quick wins to transformational projects
 - Address data privacy, governance, and ethical AI concerns proactively
 
-Current conversation context: {json.dumps(context)}
+Current conversation context: {fast_json.dumps(context)}
 
 Always lead with business impact and proven results. Ask strategic questions to uncover AI opportunities the client may not have considered."""
     
-    async def _retry_api_call(self, api_call_func, operation_name="API operation"):
-        """Retry API calls with exponential backoff for rate limits and transient errors"""
+    async def _retry_api_call(self, api_call_func, operation_name="API operation", shadow_call_func=None):
+        """Retry API calls with exponential backoff for rate limits and transient errors.
+
+        api_call_func takes the model name; the router picks it per attempt, so a
+        retry after a rate limit can land on the faster fallback model. When the
+        operation is shadowed, shadow_call_func (default api_call_func) is run
+        against the shadow model in the background and the outputs are compared.
+        """
         last_exception = None
         
-        for attempt in range(self.max_retries):
+        with tracing.span("gemini.call", operation=operation_name) as call_span:
+            for attempt in range(self.max_retries):
+                call_span.set_attribute("gemini.attempts", attempt + 1)
+                model = self.router.select(operation_name)
+                call_span.set_attribute("model", model)
+                report_progress("model_call", operation=operation_name, model=model, attempt=attempt + 1)
+                self.router.acquire(model)
+                start = time.perf_counter()
+                try:
+                    error = None
+                    try:
+                        with tracing.span("gemini.attempt", operation=operation_name, attempt=attempt + 1, model=model) as attempt_span:
+                            # The SDK call is blocking; run it off the event loop so concurrent requests overlap
+                            response = await asyncio.to_thread(api_call_func, model)
+                            self._record_token_usage(response, operation_name, attempt_span)
+                    except BaseException as e:
+                        error = e
+                        raise
+                    finally:
+                        # Also on cancellation, or the model would look saturated for good
+                        duration = time.perf_counter() - start
+                        self.router.release(operation_name, model, duration, error=error)
+                    GEMINI_REQUEST_DURATION.observe(duration, operation=operation_name, model=model, outcome="success")
+                    self._start_shadow(operation_name, model, shadow_call_func or api_call_func, response)
+                    return response
+                except Exception as e:
+                    GEMINI_REQUEST_DURATION.observe(duration, operation=operation_name, model=model, outcome="error")
+                    last_exception = e
+                    error_str = str(e).lower()
+                    
+                    # Check if it's a retryable error
+                    is_retryable = any(code in error_str for code in [
+                        '429',  # Rate limit
+                        'resource_exhausted',
+                        'quota',
+                        'rate limit',
+                        'too many requests',
+                        '500',  # Server error
+                        '502',  # Bad gateway
+                        '503',  # Service unavailable
+                        '504',  # Gateway timeout
+                        'timeout',
+                        'connection error',
+                        'service unavailable'
+                    ])
+                    
+                    if not is_retryable or attempt == self.max_retries - 1:
+                        print(f"{operation_name} failed: {e}")
+                        raise e
+                    
+                    GEMINI_RETRIES.inc(operation=operation_name)
+                    
+                    # Calculate delay with exponential backoff + jitter
+                    delay = self.base_delay * (2 ** attempt) + random.uniform(0, 1)
+                    print(f"{operation_name} failed (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {delay:.1f} seconds...")
+                    report_progress("retrying", operation=operation_name, attempt=attempt + 1, delay=round(delay, 1))
+                    with tracing.span("gemini.backoff", attempt=attempt + 1, delay_seconds=round(delay, 3)):
+                        await asyncio.sleep(delay)
+            
+            # This should never be reached due to the raise in the loop, but just in case
+            raise last_exception
+    
+    def _start_shadow(self, operation_name: str, served_model: str, api_call_func, response):
+        """Fire-and-forget comparison of the served response against the shadow model"""
+        shadow_model = self.router.shadow_model_for(operation_name, served_model)
+        if not shadow_model:
+            return
+
+        async def run_shadow():
             try:
-                return api_call_func()
+                shadow_response = await asyncio.to_thread(api_call_func, shadow_model)
+                agreement = self.router.record_shadow(
+                    operation_name, shadow_model, getattr(response, 'text', '') or '', shadow_response.text or ''
+                )
+                print(f"{operation_name} shadow {shadow_model} vs {served_model}: agreement {agreement:.2f}")
             except Exception as e:
-                last_exception = e
-                error_str = str(e).lower()
-                
-                # Check if it's a retryable error
-                is_retryable = any(code in error_str for code in [
-                    '429',  # Rate limit
-                    'resource_exhausted',
-                    'quota',
-                    'rate limit',
-                    'too many requests',
-                    '500',  # Server error
-                    '502',  # Bad gateway
-                    '503',  # Service unavailable
-                    '504',  # Gateway timeout
-                    'timeout',
-                    'connection error',
-                    'service unavailable'
-                ])
-                
-                if not is_retryable or attempt == self.max_retries - 1:
-                    print(f"{operation_name} failed: {e}")
-                    raise e
-                
-                # Calculate delay with exponential backoff + jitter
-                delay = self.base_delay * (2 ** attempt) + random.uniform(0, 1)
-                print(f"{operation_name} failed (attempt {attempt + 1}/{self.max_retries}): {e}. Retrying in {delay:.1f} seconds...")
-                await asyncio.sleep(delay)
-        
-        # This should never be reached due to the raise in the loop, but just in case
-        raise last_exception
+                print(f"{operation_name} shadow {shadow_model} failed: {e}")
+
+        task = asyncio.create_task(run_shadow())
+        # Keep a reference so the task is not garbage collected mid-flight
+        self._shadow_tasks.add(task)
+        task.add_done_callback(self._shadow_tasks.discard)
+
+    async def _generate_json(self, prompt: str, schema, operation_name: str,
+                             on_partial: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Request JSON constrained to a Pydantic schema and parse it tolerantly.
+
+        With on_partial the response is streamed, and on_partial is called on the
+        event loop with each new partial object as its fields arrive.
+        """
+        config = response_config(schema)
+
+        def generate_content(model: str):
+            return self.client.models.generate_content(model=model, contents=prompt, config=config)
+
+        if on_partial is None:
+            response = await self._retry_api_call(generate_content, operation_name)
+            return parse_json(response.text)
+
+        loop = asyncio.get_running_loop()
 
-    async def qualify_lead(self, conversation: List[Dict]) -> Dict[str, Any]:
+        def stream_content(model: str):
+            parser = IncrementalJSONParser()
+            chunks = []
+            usage = None
+            for chunk in self.client.models.generate_content_stream(model=model, contents=prompt, config=config):
+                text = chunk.text or ""
+                chunks.append(text)
+                usage = getattr(chunk, 'usage_metadata', None) or usage
+                partial = parser.feed(text)
+                if partial is not None:
+                    loop.call_soon_threadsafe(on_partial, partial)
+            return SimpleNamespace(text="".join(chunks), usage_metadata=usage)
+
+        # Shadow calls must not emit partials, so they use the non-streaming request
+        response = await self._retry_api_call(stream_content, operation_name, shadow_call_func=generate_content)
+        return parse_json(response.text)
+
+    def _record_token_usage(self, response, operation_name: str, span=None):
+        """Record prompt/response token counts reported by the API"""
+        usage = getattr(response, 'usage_metadata', None)
+        if not usage:
+            return
+        for kind, attr in (("prompt", "prompt_token_count"), ("response", "candidates_token_count")):
+            count = getattr(usage, attr, None)
+            if count:
+                GEMINI_TOKENS.inc(count, operation=operation_name, kind=kind)
+                if span:
+                    span.set_attribute(f"gemini.{kind}_tokens", count)
+
+    async def qualify_lead(self, conversation: Union[List[Dict], str]) -> Dict[str, Any]:
+        """Score a conversation, given as message dicts or as their JSON array"""
+        conversation_json = conversation if isinstance(conversation, str) else fast_json.dumps(conversation)
         qualification_prompt = f"""Analyze this conversation for AI project sales qualification. Score the lead from 1-10 based on:
 
 **Scoring Criteria:**
@@ -138,7 +503,7 @@ Identify specific AI projects with high potential based on:
 - Low risk (incremental implementation, clear success metrics)
 - Competitive advantage (competitors already implementing similar solutions)
 
-Conversation: {json.dumps(conversation)}
+Conversation: {conversation_json}
 
 Respond in JSON format:
 {{
@@ -154,16 +519,10 @@ Respond in JSON format:
             if not self.client:
                 raise Exception("API client not configured")
                 
-            response = await self._retry_api_call(
-                lambda: self.client.models.generate_content(
-                    model=self.model,
-                    contents=qualification_prompt
-                ),
-                "Lead qualification"
-            )
-            return json.loads(response.text)
+            return await self._generate_json(qualification_prompt, LeadQualification, "Lead qualification")
         except Exception as e:
             print(f"Lead qualification error: {e}")
+            record_fallback(operation="Lead qualification", reason="error")
             return {
                 "score": 5,
                 "reasoning": "Unable to qualify due to technical error",
@@ -173,8 +532,13 @@ Respond in JSON format:
                 "nextSteps": "Continue conversation to gather more information about AI readiness"
             }
 
-    async def validate_company_name(self, company_name: str) -> Dict[str, Any]:
-        """Validate if the input is a real company using web validation first, then LLM fallback"""
+    async def validate_company_name(self, company_name: str,
+                                    web_validation: Optional[Awaitable[ValidationResult]] = None) -> Dict[str, Any]:
+        """Validate if the input is a real company using web validation first, then LLM fallback.
+
+        web_validation is a web validation job already submitted by the caller;
+        by default one is submitted here.
+        """
         
         # Input validation
         if not company_name or len(company_name.strip()) < 2:
@@ -186,11 +550,18 @@ Respond in JSON format:
                 "confidence": 0,
                 "sources": []
             }
-        
+
+        known = self.lookup_known_company(company_name)
+        if known is not None:
+            return known
+
         try:
             # Primary: Web validation
-            web_validator = await get_web_validator()
-            web_result = await web_validator.validate_company(company_name.strip())
+            report_progress("web_validation")
+            if web_validation is None:
+                web_validator = await get_web_validator()
+                web_validation = await web_validator.submit(company_name.strip())
+            web_result = await web_validation
             
             # Convert web validation result to expected format
             result = {
@@ -209,7 +580,11 @@ Respond in JSON format:
             
             # Fallback: LLM validation for ambiguous cases
             print(f"Web validation low confidence ({web_result.confidence}%), trying LLM fallback...")
-            llm_result = await self._llm_validate_company(company_name.strip())
+            record_fallback(operation="Web company validation", reason="low_confidence")
+            report_progress("llm_fallback", reason="low_confidence", web_confidence=web_result.confidence)
+            with tracing.span("validation.llm_fallback", fallback_reason="low_confidence",
+                              web_confidence=web_result.confidence):
+                llm_result = await self._llm_validate_company(company_name.strip())
             
             # Merge results - prioritize web validation but supplement with LLM insights
             if llm_result.get("status") == "valid" and web_result.confidence >= 20:
@@ -225,12 +600,50 @@ Respond in JSON format:
                 result["status"] = "ambiguous"
             
             return result
-            
+
+        except ValidatorBusy:
+            # Shed browser work during a validation spike; the model alone still gives an answer
+            record_fallback(operation="Web company validation", reason="busy")
+            report_progress("llm_fallback", reason="busy")
+            with tracing.span("validation.llm_fallback", fallback_reason="busy"):
+                return await self._llm_validate_company(company_name.strip())
         except Exception as e:
             print(f"Company validation error: {e}")
+            record_fallback(operation="Web company validation", reason="error")
+            tracing.current_span().set_attribute("validation.fallback_reason", "error")
             # Final fallback to demo validation
             return self._get_demo_company_validation(company_name)
     
+    def lookup_known_company(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """Validation result for a company in the gazetteer, or None when it is unknown"""
+        match = self.gazetteer.lookup(company_name.strip())
+        record_cache_lookup('gazetteer', match is not None)
+        if match is None:
+            return None
+        if match.status == 'ambiguous':
+            if match.match_type == 'fuzzy':
+                message = f"'{company_name}' is not a company we know. Did you mean:"
+            else:
+                message = f"Multiple companies match '{company_name}'. Please select the specific company you're referring to:"
+            return {
+                "status": "ambiguous",
+                "message": message,
+                "suggestions": [entry.name for entry in match.entries],
+                "company_name": None,
+                "confidence": match.confidence,
+                "sources": ["Gazetteer"]
+            }
+        entry = match.entries[0]
+        return {
+            "status": "valid",
+            "message": f"Company validated: {entry.name}",
+            "suggestions": [],
+            "company_name": entry.name,
+            "confidence": match.confidence,
+            "sources": ["Gazetteer"],
+            "validation_details": {"gazetteer": {"match_type": match.match_type, "domain": entry.domain}}
+        }
+
     async def _llm_validate_company(self, company_name: str) -> Dict[str, Any]:
         """LLM-based company validation (fallback method)"""
         
@@ -262,21 +675,14 @@ Examples:
 
         try:
             if not self.client:
+                record_fallback(operation="LLM Company validation", reason="no_client")
                 return self._get_demo_company_validation(company_name)
                 
-            response = await self._retry_api_call(
-                lambda: self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt
-                ),
-                "LLM Company validation"
-            )
-            
-            result = json.loads(response.text)
-            return result
+            return await self._generate_json(prompt, CompanyValidation, "LLM Company validation")
             
         except Exception as e:
             print(f"LLM company validation error: {e}")
+            record_fallback(operation="LLM Company validation", reason="error")
             return self._get_demo_company_validation(company_name)
     
     def _get_demo_company_validation(self, company_name: str) -> Dict[str, Any]:
@@ -284,44 +690,11 @@ Examples:
         
         company_lower = company_name.lower().strip()
         
-        # List of known real companies for demo
-        valid_companies = {
-            'apple': 'Apple Inc.',
-            'microsoft': 'Microsoft Corporation',
-            'google': 'Google (Alphabet Inc.)',
-            'amazon': 'Amazon.com Inc.',
-            'tesla': 'Tesla Inc.',
-            'netflix': 'Netflix Inc.',
-            'goldman sachs': 'Goldman Sachs Group Inc.',
-            'jpmorgan': 'JPMorgan Chase & Co.',
-            'wells fargo': 'Wells Fargo & Company',
-            'bank of america': 'Bank of America Corporation',
-            'aetna': 'Aetna Inc.',
-            'allstate': 'The Allstate Corporation',
-            'progressive': 'Progressive Corporation',
-            'geico': 'GEICO (Berkshire Hathaway)',
-            'walmart': 'Walmart Inc.',
-            'coca cola': 'The Coca-Cola Company',
-            'pepsi': 'PepsiCo Inc.',
-            'ford': 'Ford Motor Company',
-            'general motors': 'General Motors Company',
-            'ibm': 'International Business Machines Corporation',
-            'intel': 'Intel Corporation',
-            'cisco': 'Cisco Systems Inc.'
-        }
-        
-        # Ambiguous cases that need clarification
-        ambiguous_cases = {
-            'goldman': ['Goldman Sachs Group Inc.', 'Goldman Properties', 'Goldman Capital Management'],
-            'morgan': ['JPMorgan Chase & Co.', 'Morgan Stanley', 'Morgan & Morgan Law Firm'],
-            'wells': ['Wells Fargo & Company', 'Wells Enterprises', 'Wells Real Estate'],
-            'progressive': ['Progressive Corporation (Insurance)', 'Progressive Field (Stadium)', 'Progressive Media'],
-            'ford': ['Ford Motor Company', 'Ford Foundation', 'Ford Modeling Agency'],
-            'capital': ['Capital One Financial', 'Capital Group', 'Capital Airlines'],
-            'first': ['First American Corporation', 'First Data Corporation', 'First National Bank'],
-            'american': ['American Express', 'American Airlines', 'American International Group']
-        }
-        
+        # Known companies (including ambiguous short names) come from the gazetteer
+        known = self.lookup_known_company(company_name)
+        if known is not None:
+            return known
+
         # Invalid inputs (test data, generic terms, etc.)
         invalid_patterns = ['test', 'example', 'sample', 'demo', 'xyz', 'abc corp', 'company', 'business', 'inc', 'corp', '123', 'foo', 'bar']
         
@@ -334,26 +707,6 @@ Examples:
                 "company_name": None
             }
         
-        # Check for ambiguous cases
-        for key, suggestions in ambiguous_cases.items():
-            if key in company_lower:
-                return {
-                    "status": "ambiguous",
-                    "message": f"Multiple companies match '{company_name}'. Please select the specific company you're referring to:",
-                    "suggestions": suggestions,
-                    "company_name": None
-                }
-        
-        # Check for valid companies
-        for key, full_name in valid_companies.items():
-            if key in company_lower or company_lower in key:
-                return {
-                    "status": "valid",
-                    "message": f"Company validated: {full_name}",
-                    "suggestions": [],
-                    "company_name": full_name
-                }
-        
         # If not found in known lists, assume it might be valid but with low confidence
         if len(company_name.strip()) > 3 and not any(char.isdigit() for char in company_name):
             return {
@@ -373,6 +726,18 @@ Examples:
 
     async def infer_company_details(self, company_name: str) -> Dict[str, Any]:
         """Infer industry and company size from company name using LLM"""
+
+        match = self.gazetteer.lookup(company_name)
+        # Only a name the gazetteer knows for certain; a typo match may be another company
+        if (match is not None and match.status == 'valid' and match.match_type in ('exact', 'base')
+                and match.entries[0].industry):
+            entry = match.entries[0]
+            return {
+                "industry": entry.industry,
+                "company_size": entry.company_size or "large",
+                "description": entry.description or f"{entry.name} operates in the {entry.industry} industry.",
+                "confidence": "high"
+            }
         
         prompt = f"""You are a business analyst. Given the company name "{company_name}", please analyze and provide the following information:
 
@@ -392,51 +757,44 @@ If you're not familiar with the company, make reasonable inferences based on the
 
         try:
             if not self.client:
+                record_fallback(operation="Company details inference", reason="no_client")
                 return self._get_demo_company_details(company_name)
                 
-            response = await self._retry_api_call(
-                lambda: self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt
-                ),
-                "Company details inference"
-            )
-            
-            result = json.loads(response.text)
-            return result
+            return await self._generate_json(prompt, CompanyDetails, "Company details inference")
             
         except Exception as e:
             print(f"Company details inference error: {e}")
+            record_fallback(operation="Company details inference", reason="error")
             return self._get_demo_company_details(company_name)
     
     def _get_demo_company_details(self, company_name: str) -> Dict[str, Any]:
         """Generate demo company details when API is not available"""
         
         # Simple pattern matching for demo purposes
-        company_lower = company_name.lower()
+        industry = self.DEMO_INDUSTRY_MATCHER.match_first(company_name)
         
-        if any(keyword in company_lower for keyword in ['bank', 'financial', 'credit', 'goldman', 'jpmorgan', 'wells fargo', 'citi']):
+        if industry == "banking":
             return {
                 "industry": "banking",
                 "company_size": "large",
                 "description": f"{company_name} is a financial services company providing banking and related services.",
                 "confidence": "medium"
             }
-        elif any(keyword in company_lower for keyword in ['insurance', 'aetna', 'allstate', 'progressive', 'geico']):
+        elif industry == "insurance":
             return {
                 "industry": "insurance", 
                 "company_size": "large",
                 "description": f"{company_name} is an insurance company providing various insurance products and services.",
                 "confidence": "medium"
             }
-        elif any(keyword in company_lower for keyword in ['tech', 'software', 'apple', 'google', 'microsoft', 'amazon', 'meta', 'tesla']):
+        elif industry == "technology":
             return {
                 "industry": "technology",
                 "company_size": "enterprise",
                 "description": f"{company_name} is a technology company focused on innovative products and services.",
                 "confidence": "medium"
             }
-        elif any(keyword in company_lower for keyword in ['hospital', 'health', 'medical', 'pharma', 'bio']):
+        elif industry == "healthcare":
             return {
                 "industry": "healthcare",
                 "company_size": "large", 
@@ -451,8 +809,12 @@ If you're not familiar with the company, make reasonable inferences based on the
                 "confidence": "low"
             }
 
-    async def generate_pre_engagement_analysis(self, company_info: Dict) -> Dict[str, Any]:
-        """Generate pre-engagement research and hypotheses for a company"""
+    async def generate_pre_engagement_analysis(self, company_info: Dict,
+                                               on_partial: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """Generate pre-engagement research and hypotheses for a company.
+
+        on_partial, if given, receives partial results while the response streams in.
+        """
         
         company_name = company_info.get('companyName', 'the target company')
         industry = company_info.get('industry', '')
@@ -488,21 +850,14 @@ Format the response as JSON with the following structure:
 
         try:
             if not self.client:
+                record_fallback(operation="Pre-engagement analysis", reason="no_client")
                 return self._get_demo_pre_engagement_analysis(company_info)
                 
-            response = await self._retry_api_call(
-                lambda: self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt
-                ),
-                "Pre-engagement analysis"
-            )
-            
-            result = json.loads(response.text)
-            return result
+            return await self._generate_json(prompt, PreEngagementAnalysis, "Pre-engagement analysis", on_partial)
             
         except Exception as e:
             print(f"Pre-engagement analysis error: {e}")
+            record_fallback(operation="Pre-engagement analysis", reason="error")
             return self._get_demo_pre_engagement_analysis(company_info)
 
     async def generate_ai_project_recommendations(self, company_info: Dict, selected_hypotheses: List[str] = None) -> Dict[str, Any]:
@@ -513,28 +868,33 @@ Format the response as JSON with the following structure:
         
         # If hypotheses are provided, use them to filter/prioritize projects
         if selected_hypotheses:
-            return await self._generate_hypothesis_based_recommendations(company_info, selected_hypotheses)
+            with tracing.span("recommendations.hypothesis_based", industry=industry,
+                              hypothesis_count=len(selected_hypotheses)):
+                return await self._generate_hypothesis_based_recommendations(company_info, selected_hypotheses)
         
         # Fallback to original behavior if no hypotheses provided
         # Check if industry is supported in catalog
         available_industries = self.catalog_manager.get_available_industries()
         if industry not in available_industries:
             # Fallback to demo recommendations for unsupported industries
+            record_fallback(operation="Catalog recommendations", reason="unsupported_industry")
+            tracing.current_span().set_attribute("recommendations.fallback_reason", "unsupported_industry")
             return self._get_demo_recommendations(company_info)
         
         try:
-            # Get filtered projects from catalog - remove role parameter
-            filtered_projects = self.catalog_manager.filter_projects_by_criteria(
-                industry=industry,
-                company_size=company_size,
-                limit=3
-            )
-            
-            # Format projects for response
-            formatted_projects = []
-            for project in filtered_projects:
-                formatted_project = self.catalog_manager.format_project_for_response(project, company_size)
-                formatted_projects.append(formatted_project)
+            with tracing.span("recommendations.catalog", industry=industry, company_size=company_size):
+                # Get filtered projects from catalog - remove role parameter
+                filtered_projects = self.catalog_manager.filter_projects_by_criteria(
+                    industry=industry,
+                    company_size=company_size,
+                    limit=3
+                )
+                
+                # Format projects for response
+                formatted_projects = []
+                for project in filtered_projects:
+                    formatted_project = self.catalog_manager.format_project_for_response(project, company_size)
+                    formatted_projects.append(formatted_project)
             
             # Generate strategic insights without role
             strategic_insights = self._generate_strategic_insights(industry, company_size)
@@ -546,6 +906,7 @@ Format the response as JSON with the following structure:
             
         except Exception as e:
             print(f"Catalog-based recommendation error: {e}")
+            record_fallback(operation="Catalog recommendations", reason="error")
             # Fallback to demo recommendations
             return self._get_demo_recommendations(company_info)
     
@@ -637,21 +998,14 @@ BE SPECIFIC TO THE ACTUAL HYPOTHESES PROVIDED."""
         try:
             if not self.client:
                 # Fallback to demo recommendations with hypothesis context
+                record_fallback(operation="Hypothesis-based recommendations", reason="no_client")
                 return self._get_hypothesis_demo_recommendations(company_info, selected_hypotheses)
                 
-            response = await self._retry_api_call(
-                lambda: self.client.models.generate_content(
-                    model=self.model,
-                    contents=prompt
-                ),
-                "Hypothesis-based recommendations"
-            )
-            
-            result = json.loads(response.text)
-            return result
+            return await self._generate_json(prompt, HypothesisRecommendations, "Hypothesis-based recommendations")
             
         except Exception as e:
             print(f"Hypothesis-based recommendation error: {e}")
+            record_fallback(operation="Hypothesis-based recommendations", reason="error")
             return self._get_hypothesis_demo_recommendations(company_info, selected_hypotheses)
     
     def _get_demo_pre_engagement_analysis(self, company_info: Dict) -> Dict[str, Any]:
@@ -768,121 +1122,18 @@ BE SPECIFIC TO THE ACTUAL HYPOTHESES PROVIDED."""
         company_name = company_info.get('companyName', 'Your Company')
         industry = company_info.get('industry', 'technology')
         
-        # Enhanced semantic project templates with industry-specific variations
-        project_templates = {
-            "process_automation": {
-                "banking": {
-                    "title": "AI-Powered Loan Processing Automation",
-                    "description": "Automate credit assessment, loan approval workflows, and compliance checks using machine learning to eliminate manual bottlenecks and reduce approval times.",
-                    "keywords": ["manual", "loan", "processing", "credit", "approval", "assessment", "bottleneck"],
-                    "roi": "350% ROI within 12 months",
-                    "timeline": "6-9 months",
-                    "investment": "$300K-$600K"
-                },
-                "insurance": {
-                    "title": "Automated Claims Processing System",
-                    "description": "Deploy AI to automatically process claims, validate documentation, and make approval decisions, reducing manual review time and improving accuracy.",
-                    "keywords": ["manual", "claims", "processing", "review", "documentation", "approval"],
-                    "roi": "280% ROI within 10 months", 
-                    "timeline": "4-7 months",
-                    "investment": "$250K-$500K"
-                },
-                "default": {
-                    "title": "Intelligent Process Automation Platform",
-                    "description": "Implement AI-powered automation to streamline manual processes, reduce human error, and improve operational efficiency across key business functions.",
-                    "keywords": ["manual", "process", "bottleneck", "inefficien", "workflow"],
-                    "roi": "300% ROI within 15 months",
-                    "timeline": "6-8 months",
-                    "investment": "$250K-$450K"
-                }
-            },
-            "fraud_detection": {
-                "banking": {
-                    "title": "Advanced ML Fraud Detection System",
-                    "description": "Replace rule-based fraud systems with machine learning models that reduce false positives while improving detection accuracy across all banking channels.",
-                    "keywords": ["fraud", "detection", "false positive", "rule-based", "alarm"],
-                    "roi": "400% ROI within 18 months",
-                    "timeline": "5-8 months",
-                    "investment": "$400K-$800K"
-                },
-                "insurance": {
-                    "title": "AI Insurance Fraud Prevention Platform",
-                    "description": "Deploy sophisticated ML algorithms to identify fraudulent claims patterns and reduce false alarms, improving both detection accuracy and claim processing speed.",
-                    "keywords": ["fraud", "detection", "claims", "false", "pattern"],
-                    "roi": "320% ROI within 16 months",
-                    "timeline": "4-7 months",
-                    "investment": "$300K-$600K"
-                },
-                "default": {
-                    "title": "Machine Learning Fraud Detection",
-                    "description": "Advanced fraud detection system using ML to identify suspicious patterns while minimizing false positives and improving operational efficiency.",
-                    "keywords": ["fraud", "detection", "false positive", "suspicious"],
-                    "roi": "350% ROI within 12 months",
-                    "timeline": "4-6 months",
-                    "investment": "$200K-$400K"
-                }
-            },
-            "customer_service": {
-                "banking": {
-                    "title": "Intelligent Banking Chatbot & Virtual Assistant",
-                    "description": "Deploy AI-powered conversational agents to handle routine banking inquiries, account services, and transaction support, reducing call center volume.",
-                    "keywords": ["customer", "service", "inquir", "scalability", "call", "support"],
-                    "roi": "250% ROI within 10 months",
-                    "timeline": "3-5 months", 
-                    "investment": "$150K-$300K"
-                },
-                "insurance": {
-                    "title": "AI Customer Support Automation",
-                    "description": "Implement intelligent chatbots and automated support systems to handle policy inquiries, claims status, and customer service requests 24/7.",
-                    "keywords": ["customer", "service", "inquir", "support", "scalability"],
-                    "roi": "220% ROI within 8 months",
-                    "timeline": "3-6 months",
-                    "investment": "$120K-$250K"
-                },
-                "default": {
-                    "title": "AI-Powered Customer Service Platform",
-                    "description": "Intelligent customer service automation to handle routine inquiries, improve response times, and scale support operations efficiently.",
-                    "keywords": ["customer", "service", "inquir", "support", "scalability"],
-                    "roi": "200% ROI within 12 months",
-                    "timeline": "4-6 months",
-                    "investment": "$100K-$200K"
-                }
-            },
-            "risk_management": {
-                "banking": {
-                    "title": "Predictive Risk Analytics Platform",
-                    "description": "Advanced ML models for real-time risk assessment, market pattern analysis, and proactive risk management beyond traditional historical data approaches.",
-                    "keywords": ["risk", "management", "historical", "pattern", "predictive", "analyt"],
-                    "roi": "300% ROI within 16 months",
-                    "timeline": "7-12 months",
-                    "investment": "$500K-$1M"
-                },
-                "insurance": {
-                    "title": "Dynamic Risk Assessment Engine",
-                    "description": "AI-powered risk evaluation system that incorporates real-time data sources and predictive modeling to improve underwriting accuracy and pricing.",
-                    "keywords": ["risk", "assessment", "underwriting", "pricing", "predictive"],
-                    "roi": "280% ROI within 14 months",
-                    "timeline": "6-10 months",
-                    "investment": "$400K-$700K"
-                },
-                "default": {
-                    "title": "AI Risk Management System",
-                    "description": "Predictive risk analytics platform using machine learning to identify patterns and enable proactive risk management strategies.",
-                    "keywords": ["risk", "management", "predictive", "proactive", "pattern"],
-                    "roi": "250% ROI within 12 months",
-                    "timeline": "5-8 months",
-                    "investment": "$300K-$500K"
-                }
-            }
-        }
+        project_templates = self.HYPOTHESIS_PROJECT_TEMPLATES
         
         # Enhanced semantic analysis to match hypotheses to appropriate projects
         selected_projects = []
         matched_categories = set()
         hypothesis_project_map = {}  # Track which hypothesis led to each project
         
+        # Single pass over each hypothesis finds every scoring term it contains
+        hypothesis_terms_map = {h: self.HYPOTHESIS_MATCHER.find_keywords(h) for h in selected_hypotheses}
+        
         for hypothesis in selected_hypotheses:
-            hypothesis_lower = hypothesis.lower()
+            hypothesis_terms = hypothesis_terms_map[hypothesis]
             best_match = None
             best_score = 0
             
@@ -894,38 +1145,17 @@ BE SPECIFIC TO THE ACTUAL HYPOTHESES PROVIDED."""
                 score = 0
                 
                 # Direct keyword matches (highest weight)
-                for keyword in project_variant["keywords"]:
-                    if keyword in hypothesis_lower:
-                        score += 2
+                score += 2 * len(hypothesis_terms.intersection(project_variant["keywords"]))
                 
                 # Fuzzy/related concept matching (medium weight)
-                fuzzy_matches = {
-                    "data": ["insights", "analytics", "intelligence", "information", "decisions"],
-                    "predictive": ["forecasting", "prediction", "anticipate", "proactive", "future"],
-                    "customer": ["client", "user", "experience", "satisfaction", "service"],
-                    "reactive": ["responsive", "after", "post", "following"],
-                    "scalability": ["scale", "growth", "volume", "capacity", "expansion"],
-                    "inefficien": ["slow", "bottleneck", "delay", "waste", "suboptimal"]
-                }
-                
-                for base_concept, related_terms in fuzzy_matches.items():
-                    if base_concept in " ".join(project_variant["keywords"]):
-                        for term in related_terms:
-                            if term in hypothesis_lower:
-                                score += 1
+                variant_keywords = " ".join(project_variant["keywords"])
+                for base_concept, related_terms in self.HYPOTHESIS_FUZZY_MATCHES.items():
+                    if base_concept in variant_keywords:
+                        score += len(hypothesis_terms.intersection(related_terms))
                 
                 # Category-specific semantic boosts
-                category_boosts = {
-                    "process_automation": ["manual", "bottleneck", "workflow", "approval", "processing"],
-                    "fraud_detection": ["fraud", "detection", "security", "false", "alarm"],
-                    "customer_service": ["customer", "service", "support", "inquiry", "satisfaction"],
-                    "risk_management": ["risk", "management", "assessment", "prediction", "analytics"]
-                }
-                
-                if category in category_boosts:
-                    for boost_term in category_boosts[category]:
-                        if boost_term in hypothesis_lower:
-                            score += 1
+                if category in self.HYPOTHESIS_CATEGORY_BOOSTS:
+                    score += len(hypothesis_terms.intersection(self.HYPOTHESIS_CATEGORY_BOOSTS[category]))
                 
                 # Prioritize unused categories and higher scores
                 if score > best_score and category not in matched_categories:
@@ -968,27 +1198,15 @@ BE SPECIFIC TO THE ACTUAL HYPOTHESES PROVIDED."""
                 
                 # Find the best hypothesis connection for this filler project
                 for hypothesis in selected_hypotheses:
-                    hypothesis_lower = hypothesis.lower()
+                    hypothesis_terms = hypothesis_terms_map[hypothesis]
                     connection_score = 0
                     
                     # Look for secondary/supporting connections
-                    secondary_connections = {
-                        "process_automation": ["efficiency", "optimization", "streamline", "improve"],
-                        "fraud_detection": ["security", "protection", "monitoring", "compliance"],
-                        "customer_service": ["experience", "satisfaction", "engagement", "retention"],
-                        "risk_management": ["analysis", "monitoring", "assessment", "evaluation"]
-                    }
-                    
-                    if category in secondary_connections:
-                        for connection_term in secondary_connections[category]:
-                            if connection_term in hypothesis_lower:
-                                connection_score += 1
+                    if category in self.HYPOTHESIS_SECONDARY_CONNECTIONS:
+                        connection_score += len(hypothesis_terms.intersection(self.HYPOTHESIS_SECONDARY_CONNECTIONS[category]))
                     
                     # Also check for general business improvement connections
-                    improvement_terms = ["competitive", "advantage", "growth", "transformation", "moderniz"]
-                    for term in improvement_terms:
-                        if term in hypothesis_lower:
-                            connection_score += 0.5
+                    connection_score += 0.5 * len(hypothesis_terms.intersection(self.HYPOTHESIS_IMPROVEMENT_TERMS))
                     
                     if connection_score > best_connection_score:
                         best_connection_score = connection_score
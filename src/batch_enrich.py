@@ -0,0 +1,228 @@
+"""Offline batch enrichment of prospect accounts.
+
+Reads company names from a CSV, JSONL or plain text file and runs each one
+through validation, company detail inference, pre-engagement research and
+catalog recommendations with a bounded pool of async workers. Every finished
+company is appended to a JSONL checkpoint right away, so an interrupted run
+picks up where it stopped when started again with the same output:
+
+    uv run ai-sales-enrich accounts.csv --output enriched.jsonl --concurrency 16
+    uv run ai-sales-enrich accounts.csv --output enriched.parquet --validation llm
+
+Parquet output (requires pyarrow) is written from the checkpoint once all
+companies are done; nested stage results are stored as JSON strings.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+from typing import Any, Dict, Iterator, Optional, Set
+
+from dotenv import load_dotenv
+
+from src.ai_client import GeminiAIClient
+from src.discovery_pipeline import DiscoveryPipeline
+from src.web_validator import close_web_validator
+
+NAME_FIELDS = ("company_name", "company", "name", "account_name")
+STAGE_FIELDS = ("validation", "company_info", "research", "recommendations")
+
+def _company_key(company_name: str) -> str:
+    return " ".join(company_name.lower().split())
+
+def read_companies(path: str, column: Optional[str] = None) -> Iterator[str]:
+    """Yield company names from a CSV (header row), JSONL or one-name-per-line text file"""
+    extension = os.path.splitext(path)[1].lower()
+    with open(path, encoding="utf-8", newline="") as f:
+        if extension == ".csv":
+            reader = csv.DictReader(f)
+            field = column or next((name for name in NAME_FIELDS if name in (reader.fieldnames or [])), None)
+            if field is None:
+                raise ValueError(f"{path} has no company name column; pass --column (found {reader.fieldnames})")
+            rows = (row.get(field) for row in reader)
+        elif extension in (".jsonl", ".ndjson"):
+            rows = (json.loads(line).get(column or "company_name") for line in f if line.strip())
+        else:
+            rows = (line for line in f)
+        for name in rows:
+            if name and name.strip():
+                yield name.strip()
+
+def load_checkpoint(path: str, retry_errors: bool = True) -> Set[str]:
+    """Keys of companies already enriched in a previous run"""
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short when the previous run was killed
+                continue
+            if retry_errors and record.get("status") == "error":
+                continue
+            done.add(_company_key(record["company_name"]))
+    return done
+
+class BatchEnricher:
+    """Runs the enrichment stages for many companies with bounded concurrency"""
+
+    def __init__(self, ai_client: GeminiAIClient, concurrency: int = 8, validation: str = "web"):
+        self.ai_client = ai_client
+        self.concurrency = concurrency
+        self.validation = validation
+        self.pipeline = DiscoveryPipeline(ai_client)
+        if validation != "web":
+            # Swap the validation stage used by the pipeline for this enricher only
+            self.pipeline.ai_client = _ValidationOverride(ai_client, validation)
+
+    async def enrich(self, company_name: str) -> Dict[str, Any]:
+        """Enrich one company; never raises, failures are reported in the record"""
+        record: Dict[str, Any] = {"company_name": company_name, "status": "ok"}
+        start = time.perf_counter()
+        try:
+            async for event in self.pipeline.run(company_name):
+                stage = event["stage"]
+                if stage == "validation":
+                    record["validation"] = event["result"]
+                elif stage == "pre_engagement_analysis":
+                    record["company_info"] = event["company_info"]
+                    record["research"] = event["result"]
+                elif stage == "cancelled":
+                    record["status"] = "invalid"
+                elif stage == "error":
+                    record["status"] = "error"
+                    record["error"] = f"{event['failed_stage']}: {event['message']}"
+
+            if record["status"] == "ok":
+                record["recommendations"] = await self.ai_client.generate_ai_project_recommendations(
+                    record["company_info"]
+                )
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+        record["duration_seconds"] = round(time.perf_counter() - start, 3)
+        return record
+
+    async def run(self, companies: Iterator[str], checkpoint_path: str, skip: Set[str]) -> Dict[str, int]:
+        """Enrich companies not in skip, appending each record to checkpoint_path as it finishes"""
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        counts = {"ok": 0, "invalid": 0, "error": 0, "skipped": 0}
+        started = time.perf_counter()
+
+        with open(checkpoint_path, "a+", encoding="utf-8") as out:
+            # Start on a fresh line if the previous run died mid-write
+            if out.tell():
+                out.seek(out.tell() - 1)
+                if out.read(1) != "\n":
+                    out.write("\n")
+
+            async def worker():
+                while True:
+                    company_name = await queue.get()
+                    if company_name is None:
+                        return
+                    record = await self.enrich(company_name)
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                    counts[record["status"]] += 1
+                    finished = counts["ok"] + counts["invalid"] + counts["error"]
+                    if finished % 100 == 0:
+                        rate = finished / (time.perf_counter() - started)
+                        print(f"{finished} enriched ({counts['error']} errors, {rate:.1f}/s)")
+
+            workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+            seen = set(skip)
+            for company_name in companies:
+                key = _company_key(company_name)
+                if key in seen:
+                    counts["skipped"] += 1
+                    continue
+                seen.add(key)
+                await queue.put(company_name)
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        return counts
+
+class _ValidationOverride:
+    """Proxy for GeminiAIClient whose validate_company_name uses the LLM only or is skipped"""
+
+    def __init__(self, ai_client: GeminiAIClient, mode: str):
+        self._ai_client = ai_client
+        self._mode = mode
+
+    def __getattr__(self, name):
+        return getattr(self._ai_client, name)
+
+    async def validate_company_name(self, company_name: str) -> Dict[str, Any]:
+        if self._mode == "llm":
+            known = self._ai_client.lookup_known_company(company_name)
+            return known or await self._ai_client._llm_validate_company(company_name)
+        return {"status": "valid", "message": "Validation skipped", "suggestions": [], "company_name": company_name}
+
+def write_parquet(checkpoint_path: str, output_path: str):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit("Parquet output requires pyarrow: uv pip install pyarrow")
+
+    # Retried companies appear more than once in the checkpoint; the last record wins
+    rows: Dict[str, Dict[str, Any]] = {}
+    with open(checkpoint_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            row = {key: record.get(key) for key in ("company_name", "status", "error", "duration_seconds")}
+            for field in STAGE_FIELDS:
+                row[field] = json.dumps(record[field]) if field in record else None
+            rows[_company_key(record["company_name"])] = row
+    pq.write_table(pa.Table.from_pylist(list(rows.values())), output_path)
+
+async def run_batch(enricher: BatchEnricher, companies: Iterator[str], checkpoint_path: str,
+                    skip: Set[str]) -> Dict[str, int]:
+    """enricher.run(), then shut down the browser workers web validation started"""
+    try:
+        return await enricher.run(companies, checkpoint_path, skip)
+    finally:
+        await close_web_validator()
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Batch-enrich prospect accounts with validation, research and recommendations")
+    parser.add_argument("input", help="CSV, JSONL or text file of company names")
+    parser.add_argument("--output", required=True, help="Output path (.jsonl or .parquet)")
+    parser.add_argument("--column", help="Input column/field holding the company name")
+    parser.add_argument("--concurrency", type=int, default=8, help="Companies enriched in parallel")
+    parser.add_argument("--validation", choices=("web", "llm", "skip"), default="web",
+                        help="Company validation mode: web lookup with LLM fallback, LLM only, or none")
+    parser.add_argument("--checkpoint", help="JSONL checkpoint path (defaults to the output for .jsonl)")
+    parser.add_argument("--no-retry-errors", action="store_true", help="On resume, do not retry companies that failed")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    load_dotenv()
+    args = parse_args(argv)
+    parquet = args.output.lower().endswith(".parquet")
+    checkpoint_path = args.checkpoint or (args.output + ".checkpoint.jsonl" if parquet else args.output)
+
+    skip = load_checkpoint(checkpoint_path, retry_errors=not args.no_retry_errors)
+    if skip:
+        print(f"Resuming: {len(skip)} companies already enriched in {checkpoint_path}")
+
+    enricher = BatchEnricher(GeminiAIClient(), concurrency=args.concurrency, validation=args.validation)
+    counts = asyncio.run(run_batch(enricher, read_companies(args.input, args.column), checkpoint_path, skip))
+    print(f"Done: {counts['ok']} enriched, {counts['invalid']} invalid, {counts['error']} errors, "
+          f"{counts['skipped']} skipped")
+
+    if parquet:
+        write_parquet(checkpoint_path, args.output)
+        print(f"Wrote {args.output}")
+
+if __name__ == "__main__":
+    main()
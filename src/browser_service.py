@@ -0,0 +1,170 @@
+"""Browser service: a single process owning the browsers for all API workers.
+
+With several uvicorn workers each one would otherwise run its own browser
+pool. Instead the service runs one ValidationPool and answers validation
+requests over a Unix socket as JSON lines: a validate request is first
+answered with an acceptance (or a busy error carrying retry_after when the
+queue is full), then with the result. Workers talk to it through
+RemoteWebValidator, which get_web_validator() returns when
+BROWSER_SERVICE_SOCKET is set:
+
+    uv run python -m src.browser_service /tmp/ai-sales-browser.sock
+"""
+import asyncio
+import json
+import os
+import signal
+import subprocess
+import sys
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from src.validation_pool import ValidationPool, ValidatorBusy
+from src.web_validator import ValidationResult
+
+class RemoteWebValidator:
+    """Client for the browser service with the WebCompanyValidator interface"""
+
+    def __init__(self, socket_path: str, timeout: float = 300.0, connect_timeout: float = 60.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.ready = False
+
+    async def __aenter__(self):
+        # The service may still be launching Chromium; wait for it to accept connections
+        deadline = asyncio.get_running_loop().time() + self.connect_timeout
+        while True:
+            try:
+                response = await self._request({"op": "ping"})
+                break
+            except (ConnectionRefusedError, FileNotFoundError):
+                if asyncio.get_running_loop().time() >= deadline:
+                    raise
+                await asyncio.sleep(0.2)
+        self.ready = response.get("ready", False)
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        # The service outlives the workers; nothing to release per client
+        self.ready = False
+
+    async def _read(self, reader: asyncio.StreamReader) -> Dict[str, Any]:
+        line = await asyncio.wait_for(reader.readline(), self.timeout)
+        if not line:
+            raise ConnectionError("Browser service closed the connection")
+        response = json.loads(line)
+        if response.get("error") == "busy":
+            raise ValidatorBusy(response["retry_after"])
+        if "error" in response:
+            raise RuntimeError(f"Browser service error: {response['error']}")
+        return response
+
+    async def _request(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=2 ** 20)
+        try:
+            writer.write(json.dumps(payload).encode("utf-8") + b"\n")
+            await writer.drain()
+            return await self._read(reader)
+        finally:
+            writer.close()
+
+    async def submit(self, company_name: str) -> asyncio.Future:
+        """Queue a validation with the service; raises ValidatorBusy when its queue is full"""
+        reader, writer = await asyncio.open_unix_connection(self.socket_path, limit=2 ** 20)
+        try:
+            writer.write(json.dumps({"op": "validate", "company_name": company_name}).encode("utf-8") + b"\n")
+            await writer.drain()
+            await self._read(reader)
+        except BaseException:
+            writer.close()
+            raise
+
+        async def result() -> ValidationResult:
+            try:
+                return ValidationResult(**(await self._read(reader))["result"])
+            finally:
+                writer.close()
+        return asyncio.ensure_future(result())
+
+    async def validate_company(self, company_name: str) -> ValidationResult:
+        return await (await self.submit(company_name))
+
+    async def strategy_stats(self) -> Dict[str, Any]:
+        return (await self._request({"op": "stats"}))["stats"]
+
+class BrowserService:
+    """Serves validation requests from one shared ValidationPool"""
+
+    def __init__(self, socket_path: str):
+        self.socket_path = socket_path
+        self.pool = ValidationPool.from_env()
+
+    def _write(self, writer: asyncio.StreamWriter, message: Dict[str, Any]):
+        writer.write(json.dumps(message).encode("utf-8") + b"\n")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                request = json.loads(line)
+                if request.get("op") == "ping":
+                    response = {"ready": self.pool.ready, "queue_depth": self.pool.queue_depth}
+                elif request.get("op") == "stats":
+                    response = {"stats": await self.pool.strategy_stats()}
+                elif request.get("op") == "validate":
+                    future = await self.pool.submit(request["company_name"])
+                    self._write(writer, {"accepted": True})
+                    await writer.drain()
+                    response = {"result": asdict(await future)}
+                else:
+                    raise ValueError(f"unknown op {request.get('op')!r}")
+            except ValidatorBusy as e:
+                response = {"error": "busy", "retry_after": e.retry_after}
+            except ConnectionError:
+                raise
+            except Exception as e:
+                response = {"error": str(e)}
+            self._write(writer, response)
+            await writer.drain()
+        except ConnectionError:
+            # The worker went away (timeout or shutdown) before the answer was ready
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        await self.pool.__aenter__()
+        if not self.pool.ready:
+            # Keep serving so workers get a prompt error and use their fallback
+            print("Browser service could not launch Chromium")
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle, self.socket_path, limit=2 ** 20)
+        print(f"Browser service listening on {self.socket_path}")
+        # Stop cleanly on SIGTERM so Chromium is not left behind
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, stop.set)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            await self.pool.__aexit__(None, None, None)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+def start_browser_service(socket_path: str) -> subprocess.Popen:
+    """Run the browser service in a child process"""
+    return subprocess.Popen([sys.executable, "-m", "src.browser_service", socket_path])
+
+def main(argv: Optional[list] = None):
+    argv = sys.argv[1:] if argv is None else argv
+    socket_path = argv[0] if argv else os.getenv("BROWSER_SERVICE_SOCKET", "ai-sales-browser.sock")
+    asyncio.run(BrowserService(socket_path).serve())
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import hashlib
 import json
 import os
 from typing import Dict, List, Any
@@ -6,6 +7,15 @@ class CatalogManager:
     def __init__(self):
         self.catalog_path = os.path.join(os.path.dirname(__file__), 'data', 'catalog.json')
         self.catalog_data = self._load_catalog()
+        self.catalog_version = self._compute_catalog_version()
+    
+    def _compute_catalog_version(self) -> str:
+        """Short content hash of the catalog file, used to version results derived from it"""
+        try:
+            with open(self.catalog_path, 'rb') as f:
+                return hashlib.sha256(f.read()).hexdigest()[:12]
+        except FileNotFoundError:
+            return "missing"
     
     def _format_currency_range(self, min_cost: int, max_cost: int) -> str:
         """Format currency range with M USD for millions, K for thousands"""
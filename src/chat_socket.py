@@ -0,0 +1,169 @@
+"""WebSocket transport for chat.
+
+One socket per conversation carries JSON frames both ways:
+
+client -> server
+    {"type": "message", "content": "..."}   a user message
+    {"type": "ping"} / {"type": "pong"}     heartbeats
+
+server -> client
+    {"type": "ready", "conversation_id", "message_count"}
+    {"type": "message", "index", "role", "content", "timestamp"}   stored messages, in order
+    {"type": "token", "text"}           reply text as it streams in
+    {"type": "token_reset"}             discard streamed text: the model call is being retried
+    {"type": "lead_score", "index", "score", ...}   qualification, pushed when it is ready
+    {"type": "ping"} / {"type": "pong"} / {"type": "error", "detail"}
+
+Connecting with after=N first replays the stored messages from index N, so a
+client that lost its connection resumes from the last message it saw. A
+client with more than max_pending unanswered messages is disconnected with
+close code 1008.
+"""
+import asyncio
+import json
+from typing import Any, Dict, Optional, Set
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+from src.conversation_manager import ConversationManager
+
+# A reply already started outlives its socket: a client that drops mid-stream
+# reconnects with after=N and gets the stored reply instead of a question left unanswered
+_replies: Set[asyncio.Task] = set()
+
+class ChatSocket:
+    """Serves one chat WebSocket connection"""
+
+    def __init__(self, websocket: WebSocket, manager: ConversationManager, heartbeat: float = 20.0,
+                 max_pending: int = 3):
+        self.websocket = websocket
+        self.manager = manager
+        self.heartbeat = heartbeat
+        self.max_pending = max_pending
+        self._send_lock = asyncio.Lock()
+        # User messages are answered one at a time, in order, while pings keep flowing
+        self._reply_lock = asyncio.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+        self._pending: Set[asyncio.Task] = set()  # replies of this socket not finished yet
+        self._waiting: Set[asyncio.Task] = set()  # ...of which not started (waiting for _reply_lock)
+        self._closed = False
+
+    async def send(self, frame: Dict[str, Any]):
+        if self._closed:
+            return
+        async with self._send_lock:
+            try:
+                await self.websocket.send_json(frame)
+            except (WebSocketDisconnect, RuntimeError):
+                self._closed = True
+
+    def _spawn(self, coro):
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def serve(self, conversation_id: Optional[str], after: int = 0):
+        await self.websocket.accept()
+        opened = await self.manager.open_conversation(conversation_id)
+        if opened != conversation_id:
+            conversation_id, after = opened, 0
+        messages = await self.manager.backend.run(self.manager.get_messages, conversation_id, max(0, after))
+        for offset, message in enumerate(messages):
+            await self.send({"type": "message", "index": max(0, after) + offset, **message})
+        await self.send({"type": "ready", "conversation_id": conversation_id,
+                         "message_count": max(0, after) + len(messages)})
+
+        try:
+            missed = 0
+            while True:
+                try:
+                    text = await asyncio.wait_for(self.websocket.receive_text(), self.heartbeat)
+                except asyncio.TimeoutError:
+                    # Nothing from the client for a whole interval: ping, and give up after two silent ones
+                    missed += 1
+                    if missed > 2:
+                        await self.websocket.close(code=1001)
+                        return
+                    await self.send({"type": "ping"})
+                    continue
+                missed = 0
+                try:
+                    frame = json.loads(text)
+                except ValueError:
+                    frame = None
+                kind = frame.get("type") if isinstance(frame, dict) else None
+                if kind == "ping":
+                    await self.send({"type": "pong"})
+                elif kind == "message":
+                    content = (frame.get("content") or "").strip()
+                    if content and len(self._pending) >= self.max_pending:
+                        await self.send({"type": "error", "detail": "Too many messages waiting for a reply"})
+                        self._closed = True
+                        await self.websocket.close(code=1008)
+                        return
+                    if content:
+                        reply = asyncio.create_task(self._handle_message(conversation_id, content))
+                        for tasks in (_replies, self._pending, self._waiting):
+                            tasks.add(reply)
+                            reply.add_done_callback(tasks.discard)
+                    else:
+                        await self.send({"type": "error", "detail": "Message cannot be empty"})
+                elif kind != "pong":
+                    await self.send({"type": "error", "detail": f"Unknown frame type {kind!r}"})
+        except (WebSocketDisconnect, RuntimeError):
+            # RuntimeError: receive after the client closed mid-handshake
+            pass
+        finally:
+            # Replies in progress finish and are stored; queued ones and lead score pushes stop
+            self._closed = True
+            for task in list(self._tasks) + list(self._waiting):
+                task.cancel()
+
+    async def _handle_message(self, conversation_id: str, content: str):
+        async with self._reply_lock:
+            self._waiting.discard(asyncio.current_task())
+            # Stored messages and streamed tokens reach the client in the order they happen
+            frames: asyncio.Queue = asyncio.Queue()
+            forward = asyncio.create_task(self._forward(frames))
+            try:
+                _, message_count = await self.manager.reply(
+                    conversation_id, content,
+                    on_token=lambda text: frames.put_nowait({"type": "token_reset"} if text is None
+                                                            else {"type": "token", "text": text}),
+                    on_message=lambda index, message: frames.put_nowait({"type": "message", "index": index,
+                                                                         **message}),
+                )
+            except Exception as e:
+                print(f"WebSocket chat error: {e}")
+                frames.put_nowait({"type": "error", "detail": "An unexpected error occurred"})
+                return
+            finally:
+                frames.put_nowait(None)
+                await forward
+        # Qualification takes another model call; push the score whenever it is ready
+        if not self._closed:
+            self._spawn(self._push_lead_score(conversation_id, message_count))
+
+    async def _forward(self, frames: asyncio.Queue):
+        while True:
+            frame = await frames.get()
+            if frame is None:
+                return
+            await self.send(frame)
+
+    async def _push_lead_score(self, conversation_id: str, message_count: int):
+        try:
+            qualification = await self.manager.qualify(conversation_id, message_count)
+        except Exception as e:
+            print(f"WebSocket lead qualification error: {e}")
+            return
+        if qualification:
+            await self.send({
+                "type": "lead_score",
+                "index": message_count - 1,
+                "score": qualification.get("score"),
+                "next_steps": qualification.get("nextSteps"),
+                "ai_opportunities": qualification.get("aiOpportunities"),
+                "business_impact": qualification.get("businessImpact"),
+                "feasibility_risk": qualification.get("feasibilityRisk"),
+            })
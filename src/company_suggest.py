@@ -0,0 +1,106 @@
+import threading
+import time
+from bisect import bisect_left
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .gazetteer import Gazetteer, GazetteerEntry, normalize_name
+from .state_backend import StateBackend, get_state_backend
+
+@dataclass
+class _Completion:
+    name: str
+    source: str  # 'gazetteer' or 'validated'
+    word_start: bool  # key starts at a later word of the name ("chase" in "JPMorgan Chase")
+    entry: Optional[GazetteerEntry] = None
+
+class CompanySuggester:
+    """Typeahead completions over known and previously validated company names.
+
+    Every name, alias and later word of a name is a key in one sorted array,
+    so a completion is a binary search plus a short scan of the keys sharing
+    the typed prefix. Validated names come from the web validator's results
+    in the shared state backend and are re-read in the background at most
+    every refresh_interval seconds; queries never wait for the refresh.
+    """
+
+    def __init__(self, gazetteer: Gazetteer, state: Optional[StateBackend] = None,
+                 refresh_interval: float = 60.0, max_scan: int = 200):
+        self.gazetteer = gazetteer
+        self.state = state or get_state_backend()
+        self.refresh_interval = refresh_interval
+        self.max_scan = max_scan
+        self._known = self._keys_for_gazetteer(gazetteer)
+        self._keys: List[str] = []
+        self._completions: List[_Completion] = []
+        self._build([])
+        self._refreshed_at = 0.0
+        self._refreshing = threading.Lock()
+
+    @staticmethod
+    def _keys_for(name: str, completion: _Completion) -> List[Tuple[str, _Completion]]:
+        normalized = normalize_name(name)
+        words = normalized.split()
+        keys = [(normalized, completion)]
+        for i in range(1, len(words)):
+            keys.append((' '.join(words[i:]), _Completion(completion.name, completion.source, True, completion.entry)))
+        return keys
+
+    def _keys_for_gazetteer(self, gazetteer: Gazetteer) -> List[Tuple[str, _Completion]]:
+        keys = []
+        for entry in gazetteer.entries:
+            completion = _Completion(entry.name, 'gazetteer', False, entry)
+            for name in [entry.name] + entry.aliases:
+                keys.extend(self._keys_for(name, completion))
+        return keys
+
+    def _build(self, validated_names: List[str]):
+        keys = list(self._known)
+        known = {normalize_name(entry.name) for entry in self.gazetteer.entries}
+        for name in validated_names:
+            if normalize_name(name) not in known:
+                keys.extend(self._keys_for(name, _Completion(name, 'validated', False)))
+        keys.sort(key=lambda item: item[0])
+        # Swap both arrays at once so concurrent queries see a consistent index
+        self._keys, self._completions = [key for key, _ in keys], [completion for _, completion in keys]
+
+    def refresh(self):
+        """Re-read validated company names from the validator cache"""
+        if not self._refreshing.acquire(blocking=False):
+            return
+        try:
+            names = {value['company_name'] for _, value in self.state.items('validator_cache')
+                     if value.get('status') == 'valid' and value.get('company_name')}
+            self._build(sorted(names))
+            self._refreshed_at = time.monotonic()
+        finally:
+            self._refreshing.release()
+
+    @property
+    def stale(self) -> bool:
+        return time.monotonic() - self._refreshed_at >= self.refresh_interval
+
+    def suggest(self, query: str, limit: int = 8) -> List[Dict[str, Any]]:
+        """Completions for a typed prefix, best first"""
+        prefix = normalize_name(query)
+        if not prefix:
+            return []
+        keys, completions = self._keys, self._completions
+        found: Dict[str, Tuple[Tuple, _Completion]] = {}
+        start = bisect_left(keys, prefix)
+        for i in range(start, min(start + self.max_scan, len(keys))):
+            if not keys[i].startswith(prefix):
+                break
+            completion = completions[i]
+            # Whole-name matches first, then known companies, then exact key hits and shorter names
+            rank = (completion.word_start, completion.source != 'gazetteer', keys[i] != prefix, len(completion.name))
+            if completion.name not in found or rank < found[completion.name][0]:
+                found[completion.name] = (rank, completion)
+
+        suggestions = []
+        for _, completion in sorted(found.values(), key=lambda item: item[0])[:limit]:
+            suggestion = {"name": completion.name, "source": completion.source}
+            if completion.entry is not None:
+                suggestion.update(domain=completion.entry.domain, industry=completion.entry.industry)
+            suggestions.append(suggestion)
+        return suggestions
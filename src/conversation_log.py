@@ -0,0 +1,80 @@
+import sys
+from array import array
+from datetime import datetime
+from typing import Any, Dict, List, Sequence, Tuple
+
+from . import fast_json
+
+# Role codes are indexes into ROLES; unknown roles are appended on first use
+ROLES: List[str] = ['user', 'assistant', 'system']
+_ROLE_CODES: Dict[str, int] = {role: code for code, role in enumerate(ROLES)}
+
+MessageRow = Tuple[str, float, str]  # (role, epoch seconds, content)
+
+def role_code(role: str) -> int:
+    code = _ROLE_CODES.get(role)
+    if code is None:
+        if len(ROLES) > 255:
+            raise ValueError(f"Too many distinct message roles to add {role!r}")
+        code = _ROLE_CODES[role] = len(ROLES)
+        ROLES.append(sys.intern(role))
+    return code
+
+def message_row(role: str, content: str, timestamp: float) -> MessageRow:
+    """Compact form of a message for the state backend"""
+    return (ROLES[role_code(role)], timestamp, content)
+
+def _unpack(row: Any) -> MessageRow:
+    # Conversations stored before the compact form hold ChatMessage dicts
+    if isinstance(row, dict):
+        timestamp = row.get('timestamp')
+        return row['role'], datetime.fromisoformat(timestamp).timestamp() if timestamp else 0.0, row['content']
+    return row[0], row[1], row[2]
+
+class ConversationLog:
+    """One conversation's messages in parallel arrays.
+
+    Roles are one byte each and timestamps eight, with no per-message
+    object; message dicts are built only for the slice a caller asks for.
+    The JSON form of each message is encoded once, the first time the
+    conversation is serialized, so re-sending the history to the model
+    each turn only encodes the new messages.
+    """
+
+    __slots__ = ('roles', 'timestamps', 'contents', '_json')
+
+    def __init__(self):
+        self.roles = array('B')
+        self.timestamps = array('d')
+        self.contents: List[str] = []
+        self._json: List[str] = []
+
+    def __len__(self) -> int:
+        return len(self.contents)
+
+    def append(self, role: str, timestamp: float, content: str):
+        self.roles.append(role_code(role))
+        self.timestamps.append(timestamp)
+        self.contents.append(content)
+
+    def extend(self, rows: Sequence[Any]):
+        """Append rows read from the state backend"""
+        for row in rows:
+            self.append(*_unpack(row))
+
+    def role(self, index: int) -> str:
+        return ROLES[self.roles[index]]
+
+    def message(self, index: int) -> Dict[str, Any]:
+        """API form of one message, as ChatMessage.model_dump() would give it"""
+        return {'role': ROLES[self.roles[index]], 'content': self.contents[index],
+                'timestamp': datetime.fromtimestamp(self.timestamps[index]).isoformat()}
+
+    def messages(self, start: int = 0) -> List[Dict[str, Any]]:
+        return [self.message(i) for i in range(max(0, start), len(self))]
+
+    def to_json(self, start: int = 0) -> str:
+        """JSON array of the messages from start, decoding to self.messages(start)"""
+        for i in range(len(self._json), len(self)):
+            self._json.append(fast_json.dumps(self.message(i)))
+        return '[' + ','.join(self._json[max(0, start):]) + ']'
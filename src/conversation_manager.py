@@ -1,52 +1,106 @@
+import os
+import threading
+import time
 import uuid
-from typing import Dict, List
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
 from datetime import datetime
 from src.models import ChatMessage, LeadQualification
 from src.ai_client import GeminiAIClient
+from src.conversation_log import ConversationLog, message_row
+from src.keyword_matcher import KeywordMatcher
+from src.state_backend import StateBackend, get_state_backend
+from src import tracing
 
 class ConversationManager:
-    def __init__(self):
-        self.conversations: Dict[str, List[ChatMessage]] = {}
-        self.ai_client = GeminiAIClient()
+    # Industry detection keywords (checked in order, first match wins)
+    INDUSTRY_KEYWORDS = {
+        "manufacturing": ["manufacturing", "factory", "production", "assembly"],
+        "retail": ["retail", "store", "ecommerce", "shopping", "merchandise"],
+        "finance": ["bank", "financial", "insurance", "investment", "fintech"],
+        "healthcare": ["healthcare", "hospital", "medical", "pharmaceutical", "clinic"],
+        "logistics": ["shipping", "logistics", "supply chain", "warehouse", "delivery"],
+        "technology": ["software", "tech", "saas", "platform", "development"]
+    }
+
+    # Company size indicators (checked in order, first match wins)
+    SIZE_KEYWORDS = {
+        "large": ["enterprise", "corporation", "multinational", "fortune", "1000+", "5000+"],
+        "medium": ["medium", "500", "growing", "expanding", "regional"],
+        "small": ["startup", "small", "team", "local", "boutique"]
+    }
+
+    INDUSTRY_MATCHER = KeywordMatcher(INDUSTRY_KEYWORDS)
+    SIZE_MATCHER = KeywordMatcher(SIZE_KEYWORDS)
+
+    def __init__(self, backend: Optional[StateBackend] = None, max_cached: Optional[int] = None,
+                 ai_client: Optional[GeminiAIClient] = None):
+        # Messages live in the state backend so every API worker sees the same conversations
+        self.backend = backend or get_state_backend()
+        # Compact copies of recently used conversations, topped up from the backend as messages arrive
+        self.max_cached = max_cached or int(os.getenv('CONVERSATION_CACHE_SIZE', 10000))
+        self._logs: "OrderedDict[str, ConversationLog]" = OrderedDict()
+        # Per-conversation keyword hits, updated incrementally as messages arrive
+        self.company_profiles: Dict[str, Dict] = {}
+        # Backend calls run in worker threads when the backend blocks (see StateBackend.run)
+        self._lock = threading.Lock()
+        self.ai_client = ai_client or GeminiAIClient()
     
     def create_conversation(self) -> str:
         conversation_id = str(uuid.uuid4())
-        self.conversations[conversation_id] = []
+        self.backend.set("conversation_meta", conversation_id, {"created_at": datetime.now().isoformat()})
         return conversation_id
     
-    def add_message(self, conversation_id: str, role: str, content: str):
-        if conversation_id not in self.conversations:
-            self.conversations[conversation_id] = []
-        
-        message = ChatMessage(
-            role=role,
-            content=content,
-            timestamp=datetime.now().isoformat()
-        )
-        self.conversations[conversation_id].append(message)
+    def conversation_exists(self, conversation_id: Optional[str]) -> bool:
+        return bool(conversation_id) and self.backend.get("conversation_meta", conversation_id) is not None
     
-    async def process_user_message(self, conversation_id: str, user_message: str) -> Dict:
-        if conversation_id not in self.conversations:
-            conversation_id = self.create_conversation()
-        
-        # Add user message to conversation
-        self.add_message(conversation_id, "user", user_message)
-        
-        # Get conversation context
-        context = self._build_context(conversation_id)
-        
-        # Generate AI response
-        ai_response = await self.ai_client.generate_response(user_message, context)
-        
-        # Add AI response to conversation
-        self.add_message(conversation_id, "assistant", ai_response)
+    def add_message(self, conversation_id: str, role: str, content: str) -> int:
+        """Append a message and return the conversation length"""
+        return self._store_message(conversation_id, role, content)[0]
+    
+    def _store_message(self, conversation_id: str, role: str, content: str) -> Tuple[int, Dict]:
+        """Append a message; returns the conversation length and the stored message"""
+        if not self.conversation_exists(conversation_id):
+            self.backend.set("conversation_meta", conversation_id, {"created_at": datetime.now().isoformat()})
+        
+        timestamp = time.time()
+        length = self.backend.append("conversations", conversation_id, message_row(role, content, timestamp))
+        with self._lock:
+            log = self._logs.get(conversation_id)
+            if log is not None and len(log) == length - 1:
+                # Nothing was added by another worker in between; skip re-reading the backend
+                log.append(role, timestamp, content)
+        return length, {"role": role, "content": content, "timestamp": datetime.fromtimestamp(timestamp).isoformat()}
+    
+    def _log(self, conversation_id: str) -> ConversationLog:
+        """The conversation's compact log, with any messages it has not seen yet"""
+        with self._lock:
+            log = self._logs.get(conversation_id)
+            if log is None:
+                log = self._logs[conversation_id] = ConversationLog()
+                while len(self._logs) > self.max_cached:
+                    evicted, _ = self._logs.popitem(last=False)
+                    self.company_profiles.pop(evicted, None)
+            else:
+                self._logs.move_to_end(conversation_id)
+            start = len(log)
+        rows = self.backend.get_list("conversations", conversation_id, start)
+        with self._lock:
+            # Another thread may have topped the log up while the rows were read
+            log.extend(rows[len(log) - start:])
+        return log
+    
+    async def open_conversation(self, conversation_id: Optional[str]) -> str:
+        """conversation_id if it exists, else the ID of a new conversation"""
+        def open_sync() -> str:
+            return conversation_id if self.conversation_exists(conversation_id) else self.create_conversation()
+        return await self.backend.run(open_sync)
+    
+    async def process_user_message(self, conversation_id: Optional[str], user_message: str) -> Dict:
+        conversation_id = await self.open_conversation(conversation_id)
         
-        # Qualify lead if conversation has enough context
-        lead_qualification = None
-        if len(self.conversations[conversation_id]) >= 4:  # At least 2 exchanges
-            lead_qualification = await self.ai_client.qualify_lead(
-                [msg.dict() for msg in self.conversations[conversation_id]]
-            )
+        ai_response, message_count = await self.reply(conversation_id, user_message)
+        lead_qualification = await self.qualify(conversation_id, message_count)
         
         return {
             "response": ai_response,
@@ -58,57 +112,94 @@ class ConversationManager:
             "feasibility_risk": lead_qualification.get("feasibilityRisk") if lead_qualification else None
         }
     
+    async def reply(self, conversation_id: str, user_message: str,
+                    on_token: Optional[Callable[[Optional[str]], None]] = None,
+                    on_message: Optional[Callable[[int, Dict], None]] = None) -> Tuple[str, int]:
+        """Add a user message and the assistant's reply; returns the reply and the conversation length.
+
+        With on_token the reply is streamed (see GeminiAIClient.stream_response);
+        on_message receives both stored messages as they are added.
+        """
+        with tracing.span("chat.process_message", conversation_id=conversation_id) as span:
+            # Add user message to conversation
+            message_count, message = await self.backend.run(self._store_message, conversation_id, "user", user_message)
+            if on_message is not None:
+                on_message(message_count - 1, message)
+            span.set_attribute("chat.message_count", message_count)
+            
+            # Get conversation context
+            with tracing.span("chat.build_context"):
+                context = await self.backend.run(self._build_context, conversation_id)
+            
+            # Generate AI response
+            with tracing.span("chat.generate_response"):
+                if on_token is None:
+                    ai_response = await self.ai_client.generate_response(user_message, context)
+                else:
+                    ai_response = await self.ai_client.stream_response(user_message, context, on_token)
+            
+            # Add AI response to conversation
+            message_count, message = await self.backend.run(self._store_message, conversation_id, "assistant", ai_response)
+            if on_message is not None:
+                on_message(message_count - 1, message)
+        return ai_response, message_count
+    
+    async def qualify(self, conversation_id: str, message_count: int) -> Optional[Dict]:
+        """Lead qualification once the conversation has enough context, else None"""
+        if message_count < 4:  # At least 2 exchanges
+            return None
+        with tracing.span("chat.qualify_lead", conversation_id=conversation_id):
+            # Messages serialized on earlier turns are reused; only new ones are encoded
+            log = await self.backend.run(self._log, conversation_id)
+            return await self.ai_client.qualify_lead(log.to_json())
+    
+    def get_messages(self, conversation_id: str, start: int = 0) -> List[Dict]:
+        """Stored message dicts from index start onwards"""
+        return self._log(conversation_id).messages(start)
+    
     def _build_context(self, conversation_id: str) -> Dict:
-        conversation = self.conversations.get(conversation_id, [])
+        log = self._log(conversation_id)
+        conversation_length = len(log)
         
         # Extract key information from conversation for AI context
         context = {
-            "conversation_length": len(conversation),
-            "previous_messages": [msg.dict() for msg in conversation[-4:]]  # Last 4 messages
+            "conversation_length": conversation_length,
+            "previous_messages": log.messages(conversation_length - 4)  # Last 4 messages
         }
         
         # Extract company information for AI project analysis
-        company_info = self._extract_company_info(conversation)
+        company_info = self._extract_company_info(conversation_id, log)
         if company_info:
             context["company_profile"] = company_info
         
         return context
     
-    def _extract_company_info(self, conversation: List) -> Dict:
+    def _extract_company_info(self, conversation_id: str, log: Optional[ConversationLog] = None) -> Dict:
         """Extract company information mentioned in conversation for AI project recommendations"""
+        log = log or self._log(conversation_id)
+        profile = self.company_profiles.setdefault(
+            conversation_id, {"processed": 0, "industries": set(), "sizes": set()}
+        )
+
+        # Only scan user messages added since the last call
+        for i in range(profile["processed"], len(log)):
+            if log.role(i) == "user":
+                profile["industries"].update(self.INDUSTRY_MATCHER.find_labels(log.contents[i]))
+                profile["sizes"].update(self.SIZE_MATCHER.find_labels(log.contents[i]))
+        profile["processed"] = len(log)
+
         company_info = {}
-        
-        # Simple keyword extraction (in production, this would use NLP)
-        conversation_text = " ".join([msg.content.lower() for msg in conversation if msg.role == "user"])
-        
-        # Industry detection
-        industries = {
-            "manufacturing": ["manufacturing", "factory", "production", "assembly"],
-            "retail": ["retail", "store", "ecommerce", "shopping", "merchandise"],
-            "finance": ["bank", "financial", "insurance", "investment", "fintech"],
-            "healthcare": ["healthcare", "hospital", "medical", "pharmaceutical", "clinic"],
-            "logistics": ["shipping", "logistics", "supply chain", "warehouse", "delivery"],
-            "technology": ["software", "tech", "saas", "platform", "development"]
-        }
-        
-        for industry, keywords in industries.items():
-            if any(keyword in conversation_text for keyword in keywords):
-                company_info["industry"] = industry
-                break
-        
-        # Company size indicators
-        size_indicators = {
-            "large": ["enterprise", "corporation", "multinational", "fortune", "1000+", "5000+"],
-            "medium": ["medium", "500", "growing", "expanding", "regional"],
-            "small": ["startup", "small", "team", "local", "boutique"]
-        }
-        
-        for size, keywords in size_indicators.items():
-            if any(keyword in conversation_text for keyword in keywords):
-                company_info["size"] = size
-                break
-        
+
+        industry = self.INDUSTRY_MATCHER.first_label(profile["industries"])
+        if industry:
+            company_info["industry"] = industry
+
+        size = self.SIZE_MATCHER.first_label(profile["sizes"])
+        if size:
+            company_info["size"] = size
+
         return company_info
     
     def get_conversation(self, conversation_id: str) -> List[ChatMessage]:
-        return self.conversations.get(conversation_id, [])
\ No newline at end of file
+        # Messages were validated when they were added
+        return [ChatMessage.model_construct(**msg) for msg in self._log(conversation_id).messages()]
\ No newline at end of file
@@ -0,0 +1,112 @@
+import asyncio
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from src import tracing
+
+class DiscoveryPipeline:
+    """Overlaps company validation, detail inference and pre-engagement research.
+
+    Detail inference starts speculatively alongside validation, and the
+    pre-engagement analysis starts as soon as industry and size are known.
+    Results for the speculative stages are held back until validation
+    confirms the company, and all outstanding work is cancelled if it does not.
+    Once validated, partial analysis results are streamed as they arrive
+    (coalesced to the latest one) ahead of the final analysis event.
+    """
+
+    def __init__(self, ai_client):
+        self.ai_client = ai_client
+
+    async def run(self, company_name: str) -> AsyncIterator[Dict[str, Any]]:
+        """Yield one event per completed stage, ending with 'complete', 'cancelled' or 'error'"""
+        company_name = company_name.strip()
+        tasks: Dict[asyncio.Task, str] = {}
+
+        def start(stage: str, coro) -> asyncio.Task:
+            task = asyncio.create_task(self._run_stage(stage, coro))
+            tasks[task] = stage
+            return task
+
+        start("validation", self.ai_client.validate_company_name(company_name))
+        start("company_details", self.ai_client.infer_company_details(company_name))
+
+        analysis_task: Optional[asyncio.Task] = None
+        validation: Optional[Dict[str, Any]] = None
+        held_back: List[Dict[str, Any]] = []
+        pending = set(tasks)
+
+        latest_partial: Dict[str, Any] = {}
+        partial_ready = asyncio.Event()
+
+        def on_partial(value: Dict[str, Any]):
+            latest_partial["result"] = value
+            partial_ready.set()
+
+        partial_waiter = asyncio.create_task(partial_ready.wait())
+
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending | {partial_waiter}, return_when=asyncio.FIRST_COMPLETED)
+                pending.discard(partial_waiter)
+                if partial_waiter in done:
+                    done.discard(partial_waiter)
+                    partial_ready.clear()
+                    partial_waiter = asyncio.create_task(partial_ready.wait())
+                    # Partials are only useful before the final result and once the company is confirmed
+                    if validation is not None and analysis_task not in done:
+                        yield {"stage": "pre_engagement_analysis_partial", "company_info": company_info,
+                               "result": latest_partial["result"]}
+                # Handle validation first when several stages finish together
+                for task in sorted(done, key=lambda t: tasks[t] != "validation"):
+                    stage = tasks[task]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        print(f"Discovery pipeline {stage} error: {e}")
+                        yield {"stage": "error", "failed_stage": stage, "message": str(e)}
+                        return
+
+                    if stage == "validation":
+                        validation = result
+                        yield {"stage": "validation", "result": result}
+                        if result.get("status") != "valid":
+                            yield {"stage": "cancelled", "reason": f"validation_{result.get('status')}"}
+                            return
+                        for event in held_back:
+                            yield event
+                        held_back.clear()
+                        continue
+
+                    if stage == "company_details":
+                        company_info = {
+                            "companyName": (validation or {}).get("company_name") or company_name,
+                            "industry": result.get("industry"),
+                            "companySize": result.get("company_size"),
+                            "description": result.get("description"),
+                            "confidence": result.get("confidence")
+                        }
+                        analysis_task = start(
+                            "pre_engagement_analysis",
+                            self.ai_client.generate_pre_engagement_analysis(company_info, on_partial)
+                        )
+                        pending.add(analysis_task)
+                        event = {"stage": "company_details", "result": result}
+                    else:
+                        event = {"stage": stage, "company_info": company_info, "result": result}
+
+                    if validation is None:
+                        held_back.append(event)
+                    else:
+                        yield event
+
+            yield {"stage": "complete"}
+        finally:
+            # Covers invalid companies, stage errors and clients disconnecting mid-stream
+            partial_waiter.cancel()
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _run_stage(self, stage: str, coro):
+        with tracing.span(f"discovery.{stage}", stage=stage):
+            return await coro
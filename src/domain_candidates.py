@@ -0,0 +1,87 @@
+import asyncio
+import os
+import re
+import socket
+from typing import Dict, List, Optional, Sequence
+
+from .gazetteer import base_name, normalize_name
+from .metrics import record_cache_lookup
+from .state_backend import StateBackend, get_state_backend
+
+DEFAULT_TLDS = ('com', 'io', 'co', 'net', 'ai')
+ACRONYM_STOPWORDS = {'and', 'of', 'the', 'for'}
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+def domain_candidates(company_name: str, tlds: Sequence[str] = DEFAULT_TLDS, limit: Optional[int] = None) -> List[str]:
+    """Likely domains for a company name, most likely first and without duplicates.
+
+    Labels come from the name as typed ("AT&T" -> att), without corporate
+    suffixes ("Tesla Inc" -> tesla), hyphenated and as an acronym of a
+    multi-word name. Every label is tried with the first TLD before any
+    other TLD. A single word of a multi-word name is not a label: it
+    names other companies too ("General Fake Holdings" -> general.com).
+    """
+    normalized = normalize_name(company_name)
+    words = base_name(normalized).split()
+    if not words:
+        return []
+    labels = [
+        _NON_ALNUM.sub('', company_name.lower()),
+        ''.join(words),
+        '-'.join(words),
+    ]
+    if len(words) > 1:
+        acronym = ''.join(word[0] for word in words if word not in ACRONYM_STOPWORDS)
+        if len(acronym) >= 2:
+            labels.append(acronym)
+
+    unique_labels = []
+    for label in labels:
+        if 0 < len(label) <= 63 and label not in unique_labels:
+            unique_labels.append(label)
+    candidates = [f"{label}.{tld}" for tld in tlds for label in unique_labels]
+    return candidates[:limit] if limit else candidates
+
+class DomainResolver:
+    """Concurrent DNS pre-checks with a TTL cache in the shared state backend.
+
+    A guessed domain that does not resolve would cost a full navigation
+    timeout in Chromium, so candidates are resolved together first (through
+    the event loop's getaddrinfo, which runs in its thread pool) and only
+    live ones are probed. Answers are cached, failures for a shorter time.
+    """
+
+    def __init__(self, timeout: float = 2.0, ttl: float = 3600.0, negative_ttl: float = 600.0,
+                 state: Optional[StateBackend] = None):
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.state = state or get_state_backend()
+
+    @classmethod
+    def from_env(cls) -> "DomainResolver":
+        return cls(
+            timeout=float(os.getenv('VALIDATOR_DNS_TIMEOUT', 2)),
+            ttl=float(os.getenv('VALIDATOR_DNS_TTL', 3600)),
+            negative_ttl=float(os.getenv('VALIDATOR_DNS_NEGATIVE_TTL', 600)),
+        )
+
+    async def resolves(self, domain: str) -> bool:
+        cached = await self.state.run(self.state.get, 'dns_cache', domain)
+        record_cache_lookup('dns', cached is not None)
+        if cached is not None:
+            return cached
+        try:
+            await asyncio.wait_for(
+                asyncio.get_running_loop().getaddrinfo(domain, 443, type=socket.SOCK_STREAM), self.timeout)
+            resolved = True
+        except (OSError, UnicodeError, asyncio.TimeoutError):
+            resolved = False
+        await self.state.run(self.state.set, 'dns_cache', domain, resolved,
+                             ttl=self.ttl if resolved else self.negative_ttl)
+        return resolved
+
+    async def resolve_all(self, domains: Sequence[str]) -> Dict[str, bool]:
+        """Whether each domain resolves, looked up concurrently"""
+        results = await asyncio.gather(*(self.resolves(domain) for domain in domains))
+        return dict(zip(domains, results))
@@ -0,0 +1,35 @@
+"""orjson-backed JSON for API responses, prompts and model output.
+
+orjson encodes several times faster than the json module and writes bytes
+directly, which matters for the large recommendation and research payloads.
+Values it cannot encode natively (such as Pydantic models) are dumped with
+model_dump() first.
+"""
+from typing import Any
+
+import orjson
+from fastapi.responses import JSONResponse
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def _default(value: Any) -> Any:
+    if hasattr(value, 'model_dump'):
+        return value.model_dump(mode='json')
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumpb(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=_OPTIONS)
+
+def dumps(value: Any) -> str:
+    return dumpb(value).decode('utf-8')
+
+# Raises orjson.JSONDecodeError, a subclass of ValueError like json.loads' error
+loads = orjson.loads
+
+class FastJSONResponse(JSONResponse):
+    """Default response class: renders with orjson instead of json.dumps"""
+
+    def render(self, content: Any) -> bytes:
+        return dumpb(content)
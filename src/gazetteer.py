@@ -0,0 +1,168 @@
+import csv
+import difflib
+import json
+import os
+import re
+from array import array
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'companies.jsonl')
+
+CORPORATE_SUFFIXES = {'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'llc', 'ltd', 'limited', 'plc',
+                      'group', 'holdings', 'sa', 'se', 'ag', 'nv', 'n v', 'gmbh', 'the'}
+_NON_ALNUM = re.compile(r'[^a-z0-9]+')
+
+def normalize_name(name: str) -> str:
+    """Lowercase, '&' as 'and', punctuation folded to single spaces"""
+    return _NON_ALNUM.sub(' ', name.lower().replace('&', ' and ')).strip()
+
+def base_name(normalized: str) -> str:
+    """Normalized name without a leading 'the' or trailing corporate suffixes"""
+    words = normalized.split()
+    if words and words[0] == 'the':
+        words = words[1:]
+    while len(words) > 1 and words[-1] in CORPORATE_SUFFIXES:
+        words.pop()
+    return ' '.join(words)
+
+def _trigrams(text: str) -> set:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+@dataclass
+class GazetteerEntry:
+    name: str
+    aliases: List[str] = field(default_factory=list)
+    domain: Optional[str] = None
+    industry: Optional[str] = None
+    company_size: Optional[str] = None
+    description: Optional[str] = None
+
+@dataclass
+class GazetteerMatch:
+    status: str  # 'valid' or 'ambiguous'; fuzzy matches are always 'ambiguous' suggestions
+    entries: List[GazetteerEntry]
+    confidence: int  # 0-100
+    match_type: str  # 'exact', 'base' or 'fuzzy'
+
+class Gazetteer:
+    """Known companies with exact, suffix-insensitive and fuzzy name lookup.
+
+    Names and aliases are indexed three ways: normalized exactly, without
+    corporate suffixes ("Apple Incorporated" -> "apple"), and by character
+    trigrams for typos. A name shared by several entries ("morgan",
+    "progressive") is ambiguous and resolves to all of them. A typo match is
+    only ever a suggestion: "Metal Inc" is one letter from Meta but may well
+    be another company, so it is returned as ambiguous too. The trigram
+    postings are compact arrays, so a few thousand entries index in
+    milliseconds and exact lookups are a dict access.
+    """
+
+    def __init__(self, entries: Iterable[GazetteerEntry], fuzzy_threshold: float = 0.85, min_fuzzy_length: int = 5):
+        self.entries: List[GazetteerEntry] = list(entries)
+        self.fuzzy_threshold = fuzzy_threshold
+        self.min_fuzzy_length = min_fuzzy_length
+        self._exact: Dict[str, List[int]] = {}
+        self._base: Dict[str, List[int]] = {}
+        for entry_id, entry in enumerate(self.entries):
+            for name in [entry.name] + entry.aliases:
+                normalized = normalize_name(name)
+                if not normalized:
+                    continue
+                for index, key in ((self._exact, normalized), (self._base, base_name(normalized))):
+                    ids = index.setdefault(key, [])
+                    if entry_id not in ids:
+                        ids.append(entry_id)
+
+        self._keys: List[str] = list(self._base)
+        postings: Dict[str, List[int]] = {}
+        for key_id, key in enumerate(self._keys):
+            for gram in _trigrams(key):
+                postings.setdefault(gram, []).append(key_id)
+        self._postings: Dict[str, array] = {gram: array('I', ids) for gram, ids in postings.items()}
+
+    @classmethod
+    def load(cls, path: str) -> "Gazetteer":
+        """Load entries from a JSONL or CSV file (CSV aliases are '|'-separated)"""
+        entries = []
+        with open(path, encoding='utf-8', newline='') as f:
+            if path.lower().endswith('.csv'):
+                for row in csv.DictReader(f):
+                    aliases = [alias.strip() for alias in (row.get('aliases') or '').split('|') if alias.strip()]
+                    entries.append(GazetteerEntry(
+                        name=row['name'], aliases=aliases, domain=row.get('domain') or None,
+                        industry=row.get('industry') or None, company_size=row.get('company_size') or None,
+                        description=row.get('description') or None,
+                    ))
+            else:
+                for line in f:
+                    if line.strip():
+                        entries.append(GazetteerEntry(**json.loads(line)))
+        return cls(entries)
+
+    @classmethod
+    def from_env(cls) -> "Gazetteer":
+        path = os.getenv('GAZETTEER_PATH', DEFAULT_PATH)
+        if not os.path.exists(path):
+            return cls([])
+        try:
+            return cls.load(path)
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            print(f"Error loading gazetteer from {path}: {e}")
+            return cls([])
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _match(self, entry_ids: List[int], confidence: int, match_type: str) -> GazetteerMatch:
+        entries = [self.entries[entry_id] for entry_id in entry_ids]
+        valid = len(entries) == 1 and match_type != 'fuzzy'
+        return GazetteerMatch('valid' if valid else 'ambiguous', entries, confidence, match_type)
+
+    def lookup(self, company_name: str) -> Optional[GazetteerMatch]:
+        """Resolve a company name to known entries, or None when it is not in the gazetteer"""
+        normalized = normalize_name(company_name)
+        if not normalized:
+            return None
+        entry_ids = self._exact.get(normalized)
+        if entry_ids:
+            return self._match(entry_ids, 100, 'exact')
+        key = base_name(normalized)
+        entry_ids = self._base.get(key)
+        if entry_ids:
+            return self._match(entry_ids, 95, 'base')
+        if len(key) < self.min_fuzzy_length:
+            return None
+
+        # Fuzzy: a close name shares at least half of the trigrams, so it must appear in
+        # the postings of one of the rarest len - min_overlap + 1 trigrams (prefix filtering)
+        grams = sorted(_trigrams(key), key=lambda gram: len(self._postings.get(gram, ())))
+        min_overlap = max(2, len(grams) // 2)
+        candidates = set()
+        for gram in grams[:len(grams) - min_overlap + 1]:
+            candidates.update(self._postings.get(gram, ()))
+        # ratio() = 2 * matches / total length, which bounds how different the lengths can be
+        max_length_gap = 2 * len(key) * (1 - self.fuzzy_threshold) / self.fuzzy_threshold
+        matcher = difflib.SequenceMatcher(None, b=key)
+        scored = []
+        for key_id in candidates:
+            candidate = self._keys[key_id]
+            # Short names are one typo away from too many real words ("visa" / "vista")
+            if len(candidate) < self.min_fuzzy_length or abs(len(candidate) - len(key)) > max_length_gap:
+                continue
+            matcher.set_seq1(candidate)
+            if matcher.quick_ratio() < self.fuzzy_threshold:
+                continue
+            score = matcher.ratio()
+            if score >= self.fuzzy_threshold:
+                scored.append((score, key_id))
+        if not scored:
+            return None
+        best = max(score for score, _ in scored)
+        # Near-ties between different names are as ambiguous as a shared name
+        entry_ids = []
+        for score, key_id in sorted(scored, reverse=True):
+            if best - score <= 0.02:
+                entry_ids.extend(i for i in self._base[self._keys[key_id]] if i not in entry_ids)
+        return self._match(entry_ids, int(best * 90), 'fuzzy')
@@ -0,0 +1,225 @@
+import asyncio
+import os
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Dict, Optional
+
+from .metrics import VALIDATOR_CIRCUIT_REJECTIONS, VALIDATOR_CIRCUIT_STATE, VALIDATOR_CIRCUIT_TRIPS
+from .state_backend import StateBackend, get_state_backend
+
+CIRCUIT_STATES = {'closed': 0, 'half_open': 1, 'open': 2}
+
+class HostUnavailable(Exception):
+    """An outbound host is not taking requests: its circuit is open or its queue is too long"""
+
+    def __init__(self, host: str, reason: str, retry_after: float):
+        super().__init__(f"{host} unavailable ({reason}), retry in {retry_after:.0f}s")
+        self.host = host
+        self.reason = reason
+        self.retry_after = retry_after
+
+@dataclass
+class HostPolicy:
+    max_concurrency: int = 4
+    min_interval: float = 0.0  # seconds between request starts
+    failure_threshold: int = 3  # consecutive block/timeout failures that open the circuit
+
+@dataclass
+class _Host:
+    policy: HostPolicy
+    semaphore: asyncio.Semaphore
+    next_start: float = 0.0
+    failures: int = 0
+    tripped: bool = False  # opened and not yet closed again by a success
+    probing: bool = False  # half-open trial request in flight
+    open_until: float = 0.0  # wall-clock end of the last cooldown seen by this worker
+    active: int = 0  # admitted requests not yet finished
+    trips: int = 0
+    rejected: int = 0
+
+    @property
+    def circuit(self) -> str:
+        if self.open_until > time.time():
+            return 'open'
+        return 'half_open' if self.tripped else 'closed'
+
+    @property
+    def idle(self) -> bool:
+        return not self.tripped and not self.active and self.next_start <= time.monotonic()
+
+class RequestSlot:
+    """Handle for one admitted request; fail() marks a block signature seen in the response"""
+
+    def __init__(self):
+        self.failed = False
+
+    def fail(self):
+        self.failed = True
+
+def is_timeout(error: BaseException) -> bool:
+    # Playwright raises its own TimeoutError, not a subclass of the builtin one
+    return isinstance(error, (asyncio.TimeoutError, TimeoutError)) or type(error).__name__ == 'TimeoutError'
+
+class HostScheduler:
+    """Politeness limits and circuit breakers for outbound validator traffic, per host.
+
+    Each host gets a concurrency limit and a minimum spacing between request
+    starts; a request that would wait longer than max_wait for its turn is
+    rejected instead. Consecutive block signatures (bot challenges, 429s) or
+    timeouts open the host's circuit for cooldown seconds, during which
+    requests fail immediately. The open state lives in the shared state
+    backend like the model router's rate-limit cooldowns, so every worker
+    backs off together. After the cooldown a single trial request decides
+    whether the circuit closes or opens again. Up to max_hosts idle hosts with
+    closed circuits are remembered; the least recently used are dropped first.
+    """
+
+    def __init__(self, default_policy: Optional[HostPolicy] = None, policies: Optional[Dict[str, HostPolicy]] = None,
+                 cooldown: float = 60.0, max_wait: float = 5.0, state: Optional[StateBackend] = None,
+                 max_hosts: int = 1024):
+        self.default_policy = default_policy or HostPolicy()
+        self.policies = dict(policies or {})
+        self.cooldown = cooldown
+        self.max_wait = max_wait
+        self.state = state or get_state_backend()
+        self.max_hosts = max_hosts
+        self._hosts: "OrderedDict[str, _Host]" = OrderedDict()
+
+    @classmethod
+    def from_env(cls, search_host: Optional[str] = None) -> "HostScheduler":
+        """Scheduler from VALIDATOR_HOST_* / VALIDATOR_SEARCH_* / VALIDATOR_BREAKER_* settings.
+
+        The search engine (search_host) gets its own, stricter policy since
+        every search strategy goes through it.
+        """
+        failure_threshold = int(os.getenv('VALIDATOR_BREAKER_FAILURES', 3))
+        policies = {}
+        if search_host:
+            policies[search_host] = HostPolicy(
+                max_concurrency=int(os.getenv('VALIDATOR_SEARCH_CONCURRENCY', 2)),
+                min_interval=float(os.getenv('VALIDATOR_SEARCH_INTERVAL', 1.0)),
+                failure_threshold=failure_threshold,
+            )
+        return cls(
+            default_policy=HostPolicy(max_concurrency=int(os.getenv('VALIDATOR_HOST_CONCURRENCY', 4)),
+                                      failure_threshold=failure_threshold),
+            policies=policies,
+            cooldown=float(os.getenv('VALIDATOR_BREAKER_COOLDOWN', 60)),
+            max_wait=float(os.getenv('VALIDATOR_HOST_MAX_WAIT', 5)),
+            max_hosts=int(os.getenv('VALIDATOR_MAX_HOSTS', 1024)),
+        )
+
+    def _host(self, host: str) -> _Host:
+        state = self._hosts.get(host)
+        if state is None:
+            policy = self.policies.get(host, self.default_policy)
+            state = self._hosts[host] = _Host(policy, asyncio.Semaphore(policy.max_concurrency))
+            self._evict()
+        else:
+            self._hosts.move_to_end(host)
+        return state
+
+    def _evict(self):
+        excess = len(self._hosts) - self.max_hosts
+        if excess <= 0:
+            return
+        for host in [host for host, state in self._hosts.items() if state.idle][:excess]:
+            del self._hosts[host]
+
+    async def circuit_state(self, host: str) -> str:
+        """Breaker state of host, including a circuit opened by another worker"""
+        if await self.state.run(self.state.get, 'circuit_open', host) is not None:
+            return 'open'
+        state = self._hosts.get(host)
+        return 'half_open' if state is not None and state.tripped else 'closed'
+
+    def _reject(self, host: str, state: _Host, reason: str, retry_after: float):
+        state.rejected += 1
+        VALIDATOR_CIRCUIT_REJECTIONS.inc(host=host)
+        raise HostUnavailable(host, reason, retry_after)
+
+    def _admit(self, host: str, state: _Host, opened: Optional[Dict[str, float]]):
+        if opened is not None:
+            state.open_until = max(state.open_until, opened['until'])
+            self._reject(host, state, 'circuit_open', max(0.0, opened['until'] - time.time()))
+        if state.tripped:
+            # Cooldown over: half-open, one trial request at a time
+            if state.probing:
+                self._reject(host, state, 'circuit_half_open', 1.0)
+            state.probing = True
+
+    def _record(self, host: str, state: _Host, failed: bool) -> bool:
+        """Update host's counters; True when the failure opens its circuit"""
+        state.probing = False
+        if not failed:
+            state.failures = 0
+            if state.tripped:
+                state.tripped = False
+                VALIDATOR_CIRCUIT_STATE.set(CIRCUIT_STATES['closed'], host=host)
+            return False
+        state.failures += 1
+        if state.tripped or state.failures >= state.policy.failure_threshold:
+            state.tripped = True
+            state.trips += 1
+            state.open_until = time.time() + self.cooldown
+            VALIDATOR_CIRCUIT_TRIPS.inc(host=host)
+            VALIDATOR_CIRCUIT_STATE.set(CIRCUIT_STATES['open'], host=host)
+            return True
+        return False
+
+    @asynccontextmanager
+    async def request(self, host: str) -> AsyncIterator[RequestSlot]:
+        """Admit one request to host, waiting for its concurrency and spacing limits.
+
+        Raises HostUnavailable when the circuit is open or the wait would
+        exceed max_wait. A timeout raised inside the block, or slot.fail(),
+        counts towards opening the circuit; other errors (such as a domain
+        that does not resolve) say nothing about the host's health.
+        """
+        state = self._host(host)
+        state.active += 1  # keeps the host from being evicted while in use
+        try:
+            self._admit(host, state, await self.state.run(self.state.get, 'circuit_open', host))
+            outcome: Optional[bool] = None  # failed?
+            try:
+                try:
+                    await asyncio.wait_for(state.semaphore.acquire(), self.max_wait)
+                except asyncio.TimeoutError:
+                    self._reject(host, state, 'busy', self.max_wait)
+                try:
+                    now = time.monotonic()
+                    delay = state.next_start - now
+                    if delay > self.max_wait:
+                        self._reject(host, state, 'busy', delay)
+                    state.next_start = max(now, state.next_start) + state.policy.min_interval
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    slot = RequestSlot()
+                    try:
+                        yield slot
+                    except Exception as e:
+                        if is_timeout(e):
+                            outcome = True
+                        raise
+                    else:
+                        outcome = slot.failed
+                finally:
+                    state.semaphore.release()
+            finally:
+                if outcome is None:
+                    state.probing = False
+                elif self._record(host, state, outcome):
+                    await self.state.run(self.state.set, 'circuit_open', host,
+                                         {'until': time.time() + self.cooldown}, ttl=self.cooldown)
+        finally:
+            state.active -= 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Breaker state and counters of hosts whose circuit has opened, as this worker saw it"""
+        return {
+            host: {'state': state.circuit, 'failures': state.failures,
+                   'trips': state.trips, 'rejected': state.rejected}
+            for host, state in self._hosts.items() if state.trips
+        }
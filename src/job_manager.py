@@ -0,0 +1,252 @@
+"""Background jobs for long-running AI operations.
+
+A job is submitted with a kind and parameters and runs in a bounded pool of
+asyncio workers. Its record (status, stage events, result) lives in the
+shared state backend with a TTL, so any API worker can answer a poll or an
+event stream and expired jobs clean themselves up. An idempotency key maps a
+repeated submission (a browser refresh, a client retry) to the job already
+running instead of starting another expensive one. Records of jobs running
+here are also kept in memory and written to the backend by one background
+task, so a slow backend never holds up the event loop.
+
+Code running inside a job reports stages with report_progress(); outside a
+job the call does nothing, so the same client methods serve plain requests.
+"""
+import asyncio
+import contextvars
+import math
+import os
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from .metrics import JOB_QUEUE_DEPTH, JOBS
+from .state_backend import StateBackend, get_state_backend
+
+TERMINAL_STATUSES = ('done', 'failed')
+# A resubmitted idempotency key reuses a job in these states; a failed job is run again
+REATTACH_STATUSES = ('queued', 'running', 'done')
+
+JobRunner = Callable[[Dict[str, Any]], Awaitable[Any]]
+_current_job: contextvars.ContextVar[Optional["_RunningJob"]] = contextvars.ContextVar('current_job', default=None)
+
+class JobQueueFull(Exception):
+    """Too many jobs are waiting; retry after the given number of seconds"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Job queue is full, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+def report_progress(stage: str, **data):
+    """Record a stage event on the job running in this context, if any"""
+    job = _current_job.get()
+    if job is not None:
+        job.manager._add_event(job.record, stage, data)
+
+@dataclass
+class _RunningJob:
+    manager: "JobManager"
+    record: Dict[str, Any]
+
+class JobManager:
+    """Bounded pool of background jobs with stage events and idempotency keys"""
+
+    def __init__(self, state: Optional[StateBackend] = None, workers: int = 4, queue_size: int = 64,
+                 ttl: float = 3600.0, max_events: int = 200):
+        self.state = state or get_state_backend()
+        self.workers = max(1, workers)
+        self.ttl = ttl
+        self.max_events = max_events
+        self._runners: Dict[str, JobRunner] = {}
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._consumers: List[asyncio.Task] = []
+        self._changed: Dict[str, asyncio.Event] = {}
+        self._records: Dict[str, Dict[str, Any]] = {}  # jobs of this process not yet written as finished
+        self._pending: Dict[str, Dict[str, Any]] = {}  # latest unwritten snapshot per job
+        self._wake = asyncio.Event()
+        self._writer: Optional[asyncio.Task] = None
+        self._job_seconds = 10.0  # EWMA of job duration, for Retry-After
+
+    @classmethod
+    def from_env(cls) -> "JobManager":
+        return cls(
+            workers=int(os.getenv('JOB_WORKERS', 4)),
+            queue_size=int(os.getenv('JOB_QUEUE_SIZE', 64)),
+            ttl=float(os.getenv('JOB_TTL', 3600)),
+        )
+
+    def register(self, kind: str, runner: JobRunner):
+        """Run jobs of this kind with runner(params), which returns the job result"""
+        self._runners[kind] = runner
+
+    @property
+    def kinds(self) -> List[str]:
+        return list(self._runners)
+
+    def start(self):
+        if not self._consumers:
+            self._consumers = [asyncio.create_task(self._consume()) for _ in range(self.workers)]
+        if self._writer is None:
+            self._writer = asyncio.create_task(self._write_pending())
+
+    async def close(self):
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        while not self._queue.empty():
+            record = self._queue.get_nowait()
+            record.update(status='failed', error='Server shutting down')
+            self._save(record)
+        if self._writer is not None:
+            self._writer.cancel()
+            await asyncio.gather(self._writer, return_exceptions=True)
+            self._writer = None
+        await self._flush()
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        record = self._records.get(job_id)
+        if record is not None:
+            return record
+        return await self.state.run(self.state.get, 'jobs', job_id)
+
+    def retry_after(self) -> float:
+        return max(1.0, math.ceil(self._job_seconds * (self._queue.qsize() + 1) / self.workers))
+
+    async def submit(self, kind: str, params: Dict[str, Any], idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+        """Queue a job and return its record, or the existing job for a known idempotency key"""
+        if kind not in self._runners:
+            raise ValueError(f"Unknown job kind {kind!r}; expected one of {', '.join(self._runners)}")
+        if self._queue.full():
+            JOBS.inc(kind=kind, outcome='rejected')
+            raise JobQueueFull(self.retry_after())
+        now = time.time()
+        record = {'job_id': str(uuid.uuid4()), 'kind': kind, 'status': 'queued', 'stage': 'queued',
+                  'params': params, 'events': [], 'result': None, 'error': None,
+                  'created_at': now, 'updated_at': now}
+        key = f"{kind}:{idempotency_key}" if idempotency_key else None
+        if key:
+            job_id = await self.state.run(self.state.get, 'job_keys', key)
+            existing = await self.get(job_id) if job_id else None
+            if existing is not None and existing['status'] in REATTACH_STATUSES:
+                JOBS.inc(kind=kind, outcome='reattached')
+                return existing
+            # Written before the key points at it, so a submission that loses the claim can read it.
+            # The key of a failed or expired job (job_id) is taken over.
+            await self.state.run(self.state.set, 'jobs', record['job_id'], record, ttl=self.ttl)
+            winner = await self.state.run(self.state.claim, 'job_keys', key, record['job_id'],
+                                          ttl=self.ttl, stale=job_id)
+            if winner != record['job_id']:
+                await self.state.run(self.state.delete, 'jobs', record['job_id'])
+                existing = await self.get(winner)
+                if existing is not None:
+                    JOBS.inc(kind=kind, outcome='reattached')
+                    return existing
+
+        try:
+            self._queue.put_nowait(record)
+        except asyncio.QueueFull:
+            JOBS.inc(kind=kind, outcome='rejected')
+            if key:
+                # The key now names this job; failing it lets a retry take the key over
+                record.update(status='failed', error='Job queue is full')
+                self._add_event(record, 'failed', {})
+            raise JobQueueFull(self.retry_after())
+        JOB_QUEUE_DEPTH.set(self._queue.qsize())
+        self._add_event(record, 'queued', {})
+        return record
+
+    def _save(self, record: Dict[str, Any]):
+        record['updated_at'] = time.time()
+        self._records[record['job_id']] = record
+        # Snapshot: the writer serializes it in another thread while the job carries on
+        self._pending[record['job_id']] = {**record, 'events': list(record['events'])}
+        self._wake.set()
+        changed = self._changed.pop(record['job_id'], None)
+        if changed is not None:
+            changed.set()
+
+    async def _flush(self):
+        """Write the pending snapshots to the state backend"""
+        while self._pending:
+            job_id = next(iter(self._pending))
+            record = self._pending.pop(job_id)
+            await self.state.run(self.state.set, 'jobs', job_id, record, ttl=self.ttl)
+            if record['status'] in TERMINAL_STATUSES and job_id not in self._pending:
+                self._records.pop(job_id, None)
+
+    async def _write_pending(self):
+        while True:
+            await self._wake.wait()
+            self._wake.clear()
+            try:
+                await self._flush()
+            except Exception as e:
+                print(f"Failed to save job records: {e}")
+
+    def _add_event(self, record: Dict[str, Any], stage: str, data: Dict[str, Any]):
+        events = record['events']
+        seq = events[-1]['seq'] + 1 if events else 1
+        events.append({'seq': seq, 'stage': stage, 'at': time.time(), **data})
+        if len(events) > self.max_events:
+            del events[:len(events) - self.max_events]
+        record['stage'] = stage
+        self._save(record)
+
+    async def _consume(self):
+        while True:
+            record = await self._queue.get()
+            JOB_QUEUE_DEPTH.set(self._queue.qsize())
+            record['status'] = 'running'
+            self._add_event(record, 'running', {})
+            start = time.monotonic()
+            token = _current_job.set(_RunningJob(self, record))
+            try:
+                record['result'] = await self._runners[record['kind']](record['params'])
+                record['status'] = 'done'
+            except Exception as e:
+                print(f"Job {record['job_id']} ({record['kind']}) failed: {e}")
+                record['status'], record['error'] = 'failed', str(e)
+            except asyncio.CancelledError:
+                # Shutting down: don't leave a record that streams and reattaches as running
+                record['status'], record['error'] = 'failed', 'Server shutting down'
+                JOBS.inc(kind=record['kind'], outcome='failed')
+                self._add_event(record, 'failed', {})
+                raise
+            finally:
+                _current_job.reset(token)
+            self._job_seconds += 0.2 * (time.monotonic() - start - self._job_seconds)
+            JOBS.inc(kind=record['kind'], outcome=record['status'])
+            self._add_event(record, record['status'], {})
+
+    async def events(self, job_id: str, after: int = 0, heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Stage events of a job with seq > after, ending after the terminal one.
+
+        The terminal event ('done' or 'failed') carries the result or error.
+        Yields None when nothing happened for heartbeat seconds. Jobs run by
+        another worker process are picked up by re-reading the state backend
+        at least once a second.
+        """
+        idle = 0.0
+        while True:
+            record = await self.get(job_id)
+            if record is None:
+                return
+            for event in record['events']:
+                if event['seq'] > after:
+                    after = event['seq']
+                    idle = 0.0
+                    if event['stage'] in TERMINAL_STATUSES:
+                        event = {**event, 'result': record['result'], 'error': record['error']}
+                    yield event
+            if record['status'] in TERMINAL_STATUSES:
+                return
+            changed = self._changed.setdefault(job_id, asyncio.Event())
+            try:
+                await asyncio.wait_for(changed.wait(), 1.0)
+            except asyncio.TimeoutError:
+                idle += 1.0
+                if idle >= heartbeat:
+                    idle = 0.0
+                    yield None
@@ -0,0 +1,74 @@
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+class KeywordMatcher:
+    """Precompiled multi-keyword matcher for label detection.
+
+    All keywords are compiled into a single regex alternation so a text is
+    scanned once regardless of how many keywords or labels are configured.
+    Matches must start at a word boundary ("team" does not match "steam").
+    With ``whole_words=True`` they must also end at one; otherwise keywords
+    act as stems ("bank" matches "banking", "inefficien" matches
+    "inefficiencies").
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]], whole_words: bool = False):
+        # Label order is significant: first_label() honours insertion order
+        self.labels: List[str] = list(groups.keys())
+        self.whole_words = whole_words
+        self._keyword_labels: Dict[str, List[str]] = {}
+        for label, keywords in groups.items():
+            for keyword in keywords:
+                labels = self._keyword_labels.setdefault(keyword.lower(), [])
+                if label not in labels:
+                    labels.append(label)
+
+        # Longest keywords first so the alternation prefers the longest match
+        keywords = sorted(self._keyword_labels, key=len, reverse=True)
+        tail = r'(?![a-z0-9])' if whole_words else ''
+        alternation = '|'.join(re.escape(keyword) for keyword in keywords) or r'(?!)'
+        # Zero-width lookahead lets finditer report a match at every word start,
+        # so keywords nested inside longer ones are still found
+        self._pattern = re.compile(rf'(?<![a-z0-9])(?=((?:{alternation}){tail}))')
+
+        # Shorter keywords that also match wherever a longer keyword matches
+        self._implied: Dict[str, List[str]] = {}
+        for keyword in keywords:
+            implied = []
+            for other in keywords:
+                if other != keyword and keyword.startswith(other):
+                    if not whole_words or not keyword[len(other)].isalnum():
+                        implied.append(other)
+            self._implied[keyword] = implied
+
+    def find_keywords(self, text: str) -> Set[str]:
+        """Return every configured keyword present in text"""
+        found: Set[str] = set()
+        for match in self._pattern.finditer(text.lower()):
+            keyword = match.group(1)
+            found.add(keyword)
+            found.update(self._implied[keyword])
+        return found
+
+    def find_labels(self, text: str) -> Set[str]:
+        """Return every label with at least one keyword present in text"""
+        return self.labels_for(self.find_keywords(text))
+
+    def labels_for(self, keywords: Iterable[str]) -> Set[str]:
+        """Map a set of matched keywords back to their labels"""
+        labels: Set[str] = set()
+        for keyword in keywords:
+            labels.update(self._keyword_labels.get(keyword, ()))
+        return labels
+
+    def first_label(self, labels: Iterable[str]) -> Optional[str]:
+        """Pick the highest-precedence label out of a set of matched labels"""
+        matched = set(labels)
+        for label in self.labels:
+            if label in matched:
+                return label
+        return None
+
+    def match_first(self, text: str) -> Optional[str]:
+        """Return the first label (in configuration order) matching text"""
+        return self.first_label(self.find_labels(text))
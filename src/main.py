@@ -1,16 +1,67 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request, Response, WebSocket
 from fastapi.staticfiles import StaticFiles
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
+import asyncio
+import math
 import os
+import tempfile
+import time
+from typing import Optional
 
+from src.ai_client import track_degraded
+from src.chat_socket import ChatSocket
+from src.company_suggest import CompanySuggester
 from src.models import ConversationRequest, ConversationResponse, AIProjectRecommendation, ROICalculatorInput, ROICalculatorResult, ProjectROIInput
 from src.conversation_manager import ConversationManager
 from src.roi_calculator import ROICalculator
+from src.discovery_pipeline import DiscoveryPipeline
+from src.fast_json import FastJSONResponse
+from src.job_manager import JobManager, JobQueueFull, report_progress
+from src.materialized_store import MaterializedStore
+from src.state_backend import get_state_backend
+from src.web_validator import close_web_validator, get_web_validator, web_validator_ready
+from src import fast_json, metrics, tracing
 
 load_dotenv()
 
-app = FastAPI(title="AI Sales Assistant POC", version="1.0.0")
+async def warm_up():
+    """Pay one-off startup costs (SDK import, Chromium launch) before traffic arrives"""
+    with tracing.span("startup.warm_up") as span:
+        await asyncio.to_thread(lambda: conversation_manager.ai_client.client)
+        if os.getenv('PREWARM_BROWSER', '1') != '0':
+            try:
+                await get_web_validator()
+            except Exception as e:
+                # Validation still works through the LLM fallback
+                print(f"Browser pre-warm failed: {e}")
+                span.set_attribute("startup.browser_error", str(e))
+    app.state.ready = True
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    app.state.ready = False
+    event_loop_monitor = asyncio.create_task(metrics.monitor_event_loop_lag())
+    warm_up_task = asyncio.create_task(warm_up())
+    job_manager.start()
+    try:
+        yield
+    finally:
+        app.state.ready = False
+        await job_manager.close()
+        # Cancelling Playwright mid-launch can leave the driver hanging, so let warm-up finish first
+        await asyncio.wait([warm_up_task], timeout=30)
+        warm_up_task.cancel()
+        event_loop_monitor.cancel()
+        # Persist recommendations written through for materialized accounts
+        materialized_store.save()
+        await close_web_validator()
+        await asyncio.to_thread(tracing.shutdown)
+
+app = FastAPI(title="AI Sales Assistant POC", version="1.0.0", lifespan=lifespan,
+              default_response_class=FastJSONResponse)
 
 # Enable CORS for frontend integration
 app.add_middleware(
@@ -21,12 +72,37 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.middleware("http")
+async def record_request_metrics(request: Request, call_next):
+    start = time.perf_counter()
+    status = 500
+    with tracing.span(f"{request.method} {request.url.path}", kind=tracing.SPAN_KIND_SERVER,
+                      **{"http.method": request.method, "http.target": request.url.path}) as span:
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            # Label by route template (e.g. /conversation/{conversation_id}) to keep cardinality bounded
+            route = request.scope.get("route")
+            path = getattr(route, "path", "unmatched")
+            span.set_attributes({"http.route": path, "http.status_code": status})
+            metrics.HTTP_REQUEST_DURATION.observe(
+                time.perf_counter() - start, method=request.method, path=path, status=str(status)
+            )
+
 # Mount static files for the frontend
 app.mount("/static", StaticFiles(directory="public"), name="static")
 
 # Initialize conversation manager and ROI calculator
 conversation_manager = ConversationManager()
 roi_calculator = ROICalculator()
+discovery_pipeline = DiscoveryPipeline(conversation_manager.ai_client)
+materialized_store = MaterializedStore.for_client(conversation_manager.ai_client)
+state = get_state_backend()
+company_suggester = CompanySuggester(conversation_manager.ai_client.gazetteer, state)
+_suggest_refresh = None
+job_manager = JobManager.from_env()
 
 @app.get("/")
 async def root():
@@ -44,11 +120,12 @@ async def chat(request: ConversationRequest):
             raise HTTPException(status_code=400, detail="Message cannot be empty")
         
         result = await conversation_manager.process_user_message(
-            request.conversation_id or conversation_manager.create_conversation(),
+            request.conversation_id,
             request.message
         )
         
-        return ConversationResponse(**result)
+        # Built from our own result dict; FastAPI validates it against response_model anyway
+        return ConversationResponse.model_construct(**result)
     
     except HTTPException:
         raise
@@ -56,9 +133,19 @@ async def chat(request: ConversationRequest):
         print(f"Unexpected error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail="An unexpected error occurred")
 
+@app.websocket("/ws/chat")
+async def chat_socket(websocket: WebSocket, conversation_id: Optional[str] = None, after: int = 0):
+    if not os.getenv('GEMINI_API_KEY'):
+        await websocket.close(code=1011, reason="GEMINI_API_KEY not configured")
+        return
+    heartbeat = float(os.getenv('CHAT_WS_HEARTBEAT', 20))
+    max_pending = int(os.getenv('CHAT_WS_MAX_PENDING', 3))
+    await ChatSocket(websocket, conversation_manager, heartbeat=heartbeat,
+                     max_pending=max_pending).serve(conversation_id, after)
+
 @app.get("/conversation/{conversation_id}")
 async def get_conversation(conversation_id: str):
-    conversation = conversation_manager.get_conversation(conversation_id)
+    conversation = await state.run(conversation_manager.get_conversation, conversation_id)
     return {"conversation_id": conversation_id, "messages": conversation}
 
 @app.post("/validate-company")
@@ -69,11 +156,71 @@ async def validate_company(request_data: dict):
         if not company_name:
             raise HTTPException(status_code=400, detail="Company name is required")
         
-        validation = await conversation_manager.ai_client.validate_company_name(company_name)
+        validation = materialized_store.get(company_name, "validation")
+        if validation is None:
+            validation = await conversation_manager.ai_client.validate_company_name(company_name)
         return validation
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _validation_job_view(job: dict) -> dict:
+    """A validate_company job in the shape /validate-company/jobs has always returned"""
+    view = {"job_id": job["job_id"], "company_name": job["params"].get("company_name"), "status": job["status"]}
+    if job["status"] == "done":
+        view["result"] = job["result"]
+    elif job["status"] == "failed":
+        view["error"] = job["error"]
+    return view
+
+@app.post("/validate-company/jobs", status_code=202)
+async def submit_validation_job(request_data: dict, request: Request):
+    """Queue a company validation and return a job ID to poll.
+
+    Runs as a validate_company job on the job manager, so it shares its
+    statuses, Idempotency-Key handling and queue limit. Answers 429 with
+    Retry-After when the job queue is full.
+    """
+    company_name = (request_data.get('company_name') or '').strip()
+    if not company_name:
+        raise HTTPException(status_code=400, detail="Company name is required")
+    try:
+        job = await job_manager.submit("validate_company", {"company_name": company_name},
+                                       request.headers.get('Idempotency-Key'))
+    except JobQueueFull as e:
+        return FastJSONResponse(status_code=429, content={"detail": str(e)},
+                                headers={"Retry-After": str(math.ceil(e.retry_after))})
+    return FastJSONResponse(status_code=202, content=_validation_job_view(job))
+
+@app.get("/companies/suggest")
+async def suggest_companies(q: str = "", limit: int = 8):
+    """Typeahead completions from known and previously validated companies.
+
+    ambiguous is set when the text typed so far already names several known
+    companies, so the rep can pick one before any validation starts.
+    """
+    global _suggest_refresh
+    if company_suggester.stale and (_suggest_refresh is None or _suggest_refresh.done()):
+        _suggest_refresh = asyncio.create_task(asyncio.to_thread(company_suggester.refresh))
+    suggestions = company_suggester.suggest(q, limit=max(1, min(limit, 20)))
+    match = company_suggester.gazetteer.lookup(q) if len(q.strip()) >= 2 else None
+    ambiguous = match is not None and match.status == 'ambiguous' and match.match_type != 'fuzzy'
+    return {"query": q, "suggestions": suggestions, "ambiguous": ambiguous}
+
+@app.get("/validate-company/jobs/{job_id}")
+async def get_validation_job(job_id: str):
+    job = await job_manager.get(job_id)
+    if job is None or job["kind"] != "validate_company":
+        raise HTTPException(status_code=404, detail="Unknown or expired validation job")
+    if job["status"] not in ("done", "failed"):
+        return FastJSONResponse(content=_validation_job_view(job), headers={"Retry-After": "1"})
+    return _validation_job_view(job)
+
+@app.get("/validator/strategies")
+async def validator_strategies():
+    """Learned validation strategy hit rates, block rates and latencies per company name shape"""
+    validator = await get_web_validator()
+    return {"strategies": await validator.strategy_stats()}
+
 @app.post("/infer-company-details")
 async def infer_company_details(request_data: dict):
     """Infer industry and company size from company name"""
@@ -82,20 +229,56 @@ async def infer_company_details(request_data: dict):
         if not company_name:
             raise HTTPException(status_code=400, detail="Company name is required")
         
-        details = await conversation_manager.ai_client.infer_company_details(company_name)
+        details = materialized_store.get(company_name, "company_details")
+        if details is None:
+            details = await conversation_manager.ai_client.infer_company_details(company_name)
         return details
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/discover")
+async def discover_company(request_data: dict):
+    """Validate, infer details and research a company in one pipelined call.
+
+    Streams newline-delimited JSON events, one per completed stage.
+    """
+    company_name = request_data.get('company_name', '')
+    if not company_name or not company_name.strip():
+        raise HTTPException(status_code=400, detail="Company name is required")
+    
+    materialized = materialized_store.discovery_ndjson(company_name)
+    
+    async def event_stream():
+        if materialized is not None:
+            for line in materialized:
+                yield line
+            return
+        async for event in discovery_pipeline.run(company_name):
+            yield fast_json.dumpb(event) + b"\n"
+    
+    return StreamingResponse(event_stream(), media_type="application/x-ndjson")
+
 @app.post("/pre-engagement-analysis")
 async def get_pre_engagement_analysis(company_info: dict):
     """Generate pre-engagement research and hypotheses for a company"""
     try:
-        analysis = await conversation_manager.ai_client.generate_pre_engagement_analysis(company_info)
+        analysis = materialized_store.get_research(company_info)
+        if analysis is None:
+            analysis = await conversation_manager.ai_client.generate_pre_engagement_analysis(company_info)
         return analysis
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _generate_recommendations(company_info: dict, selected_hypotheses: list):
+    with track_degraded() as degraded:
+        recommendations = await conversation_manager.ai_client.generate_ai_project_recommendations(
+            company_info, selected_hypotheses
+        )
+    # Demo output after an error must not be written through as a current result
+    if not degraded:
+        materialized_store.put_recommendations(company_info, selected_hypotheses, recommendations)
+    return recommendations
+
 @app.post("/ai-recommendations")
 async def get_ai_recommendations(request_data: dict):
     """Generate AI project recommendations based on company profile and selected hypotheses"""
@@ -103,13 +286,98 @@ async def get_ai_recommendations(request_data: dict):
         company_info = request_data.get('company_info', {})
         selected_hypotheses = request_data.get('selected_hypotheses', [])
         
-        recommendations = await conversation_manager.ai_client.generate_ai_project_recommendations(
-            company_info, selected_hypotheses
-        )
-        return recommendations
+        encoded = materialized_store.get_recommendations_json(company_info, selected_hypotheses)
+        if encoded is not None:
+            return Response(content=encoded, media_type="application/json")
+        return await _generate_recommendations(company_info, selected_hypotheses)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+async def _validate_company_job(params: dict):
+    company_name = (params.get('company_name') or '').strip()
+    if not company_name:
+        raise ValueError("Company name is required")
+    validation = materialized_store.get(company_name, "validation")
+    if validation is None:
+        validation = await conversation_manager.ai_client.validate_company_name(company_name)
+    return validation
+
+async def _pre_engagement_job(company_info: dict):
+    analysis = materialized_store.get_research(company_info)
+    if analysis is not None:
+        return analysis
+    shown = {"items": 0}
+
+    def on_partial(partial: dict):
+        # Only report partials that add a finding or hypothesis, not every streamed token
+        items = len(partial.get('research_findings') or []) + len(partial.get('strategic_hypotheses') or [])
+        if items > shown["items"]:
+            shown["items"] = items
+            report_progress("partial", result=partial)
+    return await conversation_manager.ai_client.generate_pre_engagement_analysis(company_info, on_partial)
+
+async def _recommendations_job(params: dict):
+    company_info = params.get('company_info', {})
+    selected_hypotheses = params.get('selected_hypotheses', [])
+    recommendations = materialized_store.get_recommendations(company_info, selected_hypotheses)
+    if recommendations is None:
+        recommendations = await _generate_recommendations(company_info, selected_hypotheses)
+    return recommendations
+
+job_manager.register("validate_company", _validate_company_job)
+job_manager.register("pre_engagement_analysis", _pre_engagement_job)
+job_manager.register("ai_recommendations", _recommendations_job)
+
+@app.post("/jobs", status_code=202)
+async def submit_job(request_data: dict, request: Request):
+    """Run a long AI operation in the background and return its job to poll or stream.
+
+    kind is validate_company, pre_engagement_analysis or ai_recommendations,
+    params the body the matching endpoint takes. Resubmitting with the same
+    Idempotency-Key header returns the existing job instead of a new one.
+    """
+    kind = request_data.get('kind')
+    if kind not in job_manager.kinds:
+        raise HTTPException(status_code=400, detail=f"kind must be one of {', '.join(job_manager.kinds)}")
+    try:
+        job = await job_manager.submit(kind, request_data.get('params') or {}, request.headers.get('Idempotency-Key'))
+    except JobQueueFull as e:
+        return FastJSONResponse(status_code=429, content={"detail": str(e)},
+                                headers={"Retry-After": str(math.ceil(e.retry_after))})
+    return FastJSONResponse(status_code=202, content=job)
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    job = await job_manager.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    if job["status"] not in ("done", "failed"):
+        return FastJSONResponse(content=job, headers={"Retry-After": "1"})
+    return job
+
+@app.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: str, request: Request, after: int = 0):
+    """Server-sent stage events of a job, ending with 'done' (with the result) or 'failed'.
+
+    Reconnecting clients resume after the Last-Event-ID they last received.
+    """
+    if await job_manager.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+    last_event_id = request.headers.get('Last-Event-ID')
+    if last_event_id and last_event_id.isdigit():
+        after = int(last_event_id)
+
+    async def event_stream():
+        async for event in job_manager.events(job_id, after):
+            if event is None:
+                yield ": keep-alive\n\n"
+            else:
+                # Unnamed events, so one EventSource.onmessage handler sees every stage
+                yield f"id: {event['seq']}\ndata: {fast_json.dumps(event)}\n\n"
+
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.post("/roi-calculator", response_model=ROICalculatorResult)
 async def calculate_roi(input_data: ROICalculatorInput):
     """Calculate ROI and business case for AI implementation"""
@@ -138,7 +406,9 @@ async def calculate_catalog_roi(request_data: dict):
         if not roi_config or not variable_values:
             raise HTTPException(status_code=400, detail="Missing roi_config or variable_values")
         
-        result = roi_calculator.calculate_catalog_roi(roi_config, variable_values)
+        result = materialized_store.get_roi(roi_config, variable_values)
+        if result is None:
+            result = roi_calculator.calculate_catalog_roi(roi_config, variable_values)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Catalog ROI calculation failed: {str(e)}")
@@ -147,10 +417,44 @@ async def calculate_catalog_roi(request_data: dict):
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness for traffic: 503 until start-up warm-up has finished, and while shutting down"""
+    checks = {
+        "warm_up": getattr(app.state, "ready", False),
+        "browser": web_validator_ready(),
+    }
+    if not checks["warm_up"]:
+        return FastJSONResponse(status_code=503, content={"status": "starting", "checks": checks})
+    return {"status": "ready", "checks": checks}
+
+@app.get("/metrics")
+async def get_metrics():
+    """Expose application metrics in the Prometheus text format"""
+    return Response(content=metrics.REGISTRY.render(), media_type=metrics.CONTENT_TYPE)
+
 def main():
     import uvicorn
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    if workers <= 1:
+        uvicorn.run(app, host="0.0.0.0", port=port)
+        return
+
+    # Workers share conversations, validator results and rate limits through SQLite,
+    # and a single browser service process instead of one Chromium each
+    from src.browser_service import start_browser_service
+    os.environ.setdefault("STATE_BACKEND", "sqlite")
+    browser_service = None
+    if not os.getenv("BROWSER_SERVICE_SOCKET"):
+        os.environ["BROWSER_SERVICE_SOCKET"] = os.path.join(tempfile.gettempdir(), f"ai-sales-browser-{os.getpid()}.sock")
+        browser_service = start_browser_service(os.environ["BROWSER_SERVICE_SOCKET"])
+    try:
+        uvicorn.run("src.main:app", host="0.0.0.0", port=port, workers=workers)
+    finally:
+        if browser_service is not None:
+            browser_service.terminate()
+            browser_service.wait(timeout=30)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
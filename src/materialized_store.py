@@ -0,0 +1,393 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import fast_json
+from .metrics import record_cache_lookup
+
+DEFAULT_PATH = os.path.join(os.path.dirname(__file__), 'data', 'materialized.json')
+
+# Which versions each stage's result depends on; a stage is stale once any of them changes
+STAGE_DEPENDENCIES = {
+    "validation": ("prompt",),
+    "company_details": ("prompt",),
+    "research": ("prompt",),
+    "recommendations": ("prompt", "catalog"),
+}
+
+def _company_key(company_name: str) -> str:
+    return " ".join((company_name or "").lower().split())
+
+def recommendation_key(company_info: Dict[str, Any], selected_hypotheses: Optional[List[str]] = None) -> str:
+    industry = (company_info.get('industry') or '').lower()
+    company_size = company_info.get('companySize') or 'medium'
+    return json.dumps([industry, company_size, sorted(selected_hypotheses or [])])
+
+def roi_key(roi_config: Dict[str, Any], variable_values: Dict[str, Any]) -> str:
+    payload = json.dumps([roi_config, variable_values], sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+class MaterializedStore:
+    """Precomputed discovery results for a configured list of target accounts.
+
+    Each stage result is stored with the catalog and prompt versions it was
+    computed from and is only served while those versions are current, so a
+    catalog or prompt change invalidates exactly the stages that depend on it.
+    Recommendations computed on demand for a tracked account are written
+    through, so any hypothesis selection a rep makes is instant the next time.
+    Served results are also kept JSON-encoded, so a repeated request sends
+    the stored bytes instead of serializing the same payload again.
+
+    Several processes share the file (API workers, a refresh run), so it is
+    re-read whenever it changes and saving merges with what is on disk,
+    keeping the current and most recently computed version of each record.
+    """
+
+    def __init__(self, path: str, catalog_version: str, prompt_version: str, reload_interval: float = 5.0):
+        self.path = path
+        self.versions = {"catalog": catalog_version, "prompt": prompt_version}
+        self.reload_interval = reload_interval
+        self._lock = threading.Lock()
+        self._data: Dict[str, Any] = {"accounts": {}, "roi": {}}
+        self._dirty = False
+        # (kind, key) -> encoded result; cleared whenever a result is stored
+        self._encoded: Dict[Tuple[str, str], Any] = {}
+        self._mtime: Optional[int] = None
+        self._checked_at = time.monotonic()
+        if os.path.exists(path):
+            self._mtime = self._stat()
+            data = self._read()
+            if data is not None:
+                self._data = data
+
+    @classmethod
+    def for_client(cls, ai_client, path: Optional[str] = None) -> "MaterializedStore":
+        return cls(
+            path or os.getenv('MATERIALIZED_RESULTS_PATH', DEFAULT_PATH),
+            catalog_version=ai_client.catalog_manager.catalog_version,
+            prompt_version=ai_client.PROMPT_VERSION,
+        )
+
+    def _stat(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _read(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            print(f"Error loading materialized results from {self.path}: {e}")
+            return None
+        data.setdefault("accounts", {})
+        data.setdefault("roi", {})
+        return data
+
+    def _preferred(self, stage: str, record: Dict[str, Any], other: Optional[Dict[str, Any]]) -> bool:
+        """Whether record should replace other: current versions first, then the newer one"""
+        if other is None:
+            return True
+        return ((self._current(stage, record), record.get("computed_at", 0))
+                > (self._current(stage, other), other.get("computed_at", 0)))
+
+    def _merge(self, data: Dict[str, Any]):
+        """Merge records from another copy of the file into this one; call with the lock held"""
+        for key, account in data["accounts"].items():
+            mine = self._data["accounts"].setdefault(
+                key, {"company_name": account.get("company_name"), "stages": {}, "recommendations": {}}
+            )
+            for stage, record in account.get("stages", {}).items():
+                if self._preferred(stage, record, mine["stages"].get(stage)):
+                    mine["stages"][stage] = record
+            for selection, record in account.get("recommendations", {}).items():
+                if self._preferred("recommendations", record, mine["recommendations"].get(selection)):
+                    mine["recommendations"][selection] = record
+        for key, result in data["roi"].items():
+            self._data["roi"].setdefault(key, result)
+        self._encoded.clear()
+
+    def _refresh(self):
+        """Merge in the file if another process has replaced it, checking every reload_interval seconds"""
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_interval:
+            return
+        self._checked_at = now
+        mtime = self._stat()
+        if mtime is None or mtime == self._mtime:
+            return
+        data = self._read()
+        with self._lock:
+            self._mtime = mtime
+            if data is not None:
+                self._merge(data)
+
+    def _current(self, stage: str, record: Optional[Dict[str, Any]]) -> bool:
+        return record is not None and all(
+            record.get("versions", {}).get(dep) == self.versions[dep] for dep in STAGE_DEPENDENCIES[stage]
+        )
+
+    def _record(self, stage: str, value: Any) -> Dict[str, Any]:
+        return {
+            "value": value,
+            "versions": {dep: self.versions[dep] for dep in STAGE_DEPENDENCIES[stage]},
+            "computed_at": time.time(),
+        }
+
+    def is_tracked(self, company_name: str) -> bool:
+        self._refresh()
+        return _company_key(company_name) in self._data["accounts"]
+
+    def get(self, company_name: str, stage: str) -> Optional[Any]:
+        """Current materialized result of a stage for an account, or None"""
+        self._refresh()
+        account = self._data["accounts"].get(_company_key(company_name))
+        record = account["stages"].get(stage) if account else None
+        hit = self._current(stage, record)
+        if account:
+            record_cache_lookup("materialized", hit)
+        return record["value"] if hit else None
+
+    def put(self, company_name: str, stage: str, value: Any):
+        with self._lock:
+            account = self._data["accounts"].setdefault(
+                _company_key(company_name), {"company_name": company_name, "stages": {}, "recommendations": {}}
+            )
+            account["stages"][stage] = self._record(stage, value)
+            self._dirty = True
+            self._encoded.clear()
+
+    def get_recommendations(self, company_info: Dict[str, Any], selected_hypotheses: Optional[List[str]] = None) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        account = self._data["accounts"].get(_company_key(company_info.get('companyName')))
+        if not account:
+            return None
+        record = account["recommendations"].get(recommendation_key(company_info, selected_hypotheses))
+        hit = self._current("recommendations", record)
+        record_cache_lookup("materialized", hit)
+        return record["value"] if hit else None
+
+    def put_recommendations(self, company_info: Dict[str, Any], selected_hypotheses: Optional[List[str]],
+                            value: Dict[str, Any], track: bool = False):
+        """Store recommendations; unless track is set, only for accounts already materialized"""
+        key = _company_key(company_info.get('companyName'))
+        with self._lock:
+            account = self._data["accounts"].get(key)
+            if account is None:
+                if not track:
+                    return
+                account = self._data["accounts"][key] = {
+                    "company_name": company_info.get('companyName'), "stages": {}, "recommendations": {}
+                }
+            account["recommendations"][recommendation_key(company_info, selected_hypotheses)] = \
+                self._record("recommendations", value)
+            self._dirty = True
+            self._encoded.clear()
+
+    def get_recommendations_json(self, company_info: Dict[str, Any],
+                                 selected_hypotheses: Optional[List[str]] = None) -> Optional[bytes]:
+        """get_recommendations() already encoded as a JSON response body, or None"""
+        self._refresh()
+        cache_key = ("recommendations", _company_key(company_info.get('companyName')) + "\n"
+                     + recommendation_key(company_info, selected_hypotheses))
+        encoded = self._encoded.get(cache_key)
+        if encoded is not None:
+            record_cache_lookup("materialized", True)
+            return encoded
+        value = self.get_recommendations(company_info, selected_hypotheses)
+        if value is None:
+            return None
+        encoded = self._encoded[cache_key] = fast_json.dumpb(value)
+        return encoded
+
+    def get_roi(self, roi_config: Dict[str, Any], variable_values: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        self._refresh()
+        if not self._data["roi"]:
+            return None
+        record = self._data["roi"].get(roi_key(roi_config, variable_values))
+        record_cache_lookup("materialized_roi", record is not None)
+        return record
+
+    def put_roi(self, roi_config: Dict[str, Any], variable_values: Dict[str, Any], result: Dict[str, Any]):
+        # Keyed by the full config and inputs, so a catalog change simply produces new keys
+        with self._lock:
+            self._data["roi"][roi_key(roi_config, variable_values)] = result
+            self._dirty = True
+
+    def discovery_events(self, company_name: str) -> Optional[List[Dict[str, Any]]]:
+        """The /discover event sequence for a fully materialized account, or None"""
+        validation = self.get(company_name, "validation")
+        if validation is None:
+            return None
+        events = [{"stage": "validation", "result": validation}]
+        if validation.get("status") != "valid":
+            return events + [{"stage": "cancelled", "reason": f"validation_{validation.get('status')}"}]
+
+        details = self.get(company_name, "company_details")
+        research = self.get(company_name, "research")
+        if details is None or research is None:
+            return None
+        return events + [
+            {"stage": "company_details", "result": details},
+            {"stage": "pre_engagement_analysis", "company_info": company_info_for(company_name, validation, details),
+             "result": research},
+            {"stage": "complete"},
+        ]
+
+    def discovery_ndjson(self, company_name: str) -> Optional[List[bytes]]:
+        """discovery_events() as encoded NDJSON lines, or None"""
+        self._refresh()
+        cache_key = ("discovery", _company_key(company_name))
+        lines = self._encoded.get(cache_key)
+        if lines is not None:
+            record_cache_lookup("materialized", True)
+            return lines
+        events = self.discovery_events(company_name)
+        if events is None:
+            return None
+        lines = self._encoded[cache_key] = [fast_json.dumpb(event) + b"\n" for event in events]
+        return lines
+
+    def get_research(self, company_info: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Materialized research, provided it was generated for the same industry and size"""
+        company_name = company_info.get('companyName')
+        details = self.get(company_name, "company_details")
+        if not details or (details.get("industry"), details.get("company_size")) != (
+                company_info.get('industry'), company_info.get('companySize')):
+            return None
+        return self.get(company_name, "research")
+
+    def save(self):
+        """Merge changes into the file as it is now and replace it atomically"""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = self._read()
+            if data is not None:
+                self._merge(data)
+            directory = os.path.dirname(self.path) or '.'
+            os.makedirs(directory, exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
+            self._mtime = self._stat()
+            self._dirty = False
+
+def company_info_for(company_name: str, validation: Dict[str, Any], details: Dict[str, Any]) -> Dict[str, Any]:
+    """companyInfo as assembled by the discovery pipeline and the frontend"""
+    return {
+        "companyName": validation.get("company_name") or company_name,
+        "industry": details.get("industry"),
+        "companySize": details.get("company_size"),
+        "description": details.get("description"),
+        "confidence": details.get("confidence"),
+    }
+
+async def materialize_account(store: MaterializedStore, ai_client, roi_calculator, company_name: str) -> List[str]:
+    """Recompute the stale stages of one account; returns the stages refreshed.
+
+    A result the AI client produced from a fallback (demo output after an
+    error, or without an API key) is not stored, and neither is anything
+    derived from it, so the next run computes them again.
+    """
+    from .ai_client import track_degraded
+
+    refreshed = []
+    unstored = []
+
+    async def stage(name: str, compute):
+        value = store.get(company_name, name)
+        if value is None:
+            with track_degraded() as degraded:
+                value = await compute()
+            if degraded:
+                unstored.append(name)
+                refreshed.append(f"{name} (not stored: {'; '.join(degraded)})")
+            else:
+                store.put(company_name, name, value)
+                refreshed.append(name)
+        return value
+
+    validation = await stage("validation", lambda: ai_client.validate_company_name(company_name))
+    if validation.get("status") != "valid":
+        return refreshed
+    details = await stage("company_details", lambda: ai_client.infer_company_details(company_name))
+    company_info = company_info_for(company_name, validation, details)
+    research = await stage("research", lambda: ai_client.generate_pre_engagement_analysis(company_info))
+    if unstored:
+        return refreshed
+    if refreshed and company_info["companyName"] != company_name:
+        # Serve lookups made with the validated name as well as the listed one
+        for copied, value in (("validation", validation), ("company_details", details), ("research", research)):
+            store.put(company_info["companyName"], copied, value)
+
+    hypotheses = [h.get("hypothesis") for h in research.get("strategic_hypotheses", []) if h.get("hypothesis")]
+    for selection in ([], hypotheses):
+        if store.get_recommendations(company_info, selection) is not None:
+            continue
+        with track_degraded() as degraded:
+            recommendations = await ai_client.generate_ai_project_recommendations(company_info, selection)
+        name = "recommendations" if not selection else "hypothesis_recommendations"
+        if degraded:
+            refreshed.append(f"{name} (not stored: {'; '.join(degraded)})")
+            continue
+        store.put_recommendations(company_info, selection, recommendations, track=True)
+        refreshed.append(name)
+
+        # ROI with the catalog's default inputs, as first shown in the ROI calculator
+        for project in recommendations.get("projects", []):
+            roi_config = project.get("roi_calculator")
+            if not roi_config or not roi_config.get("variables"):
+                continue
+            defaults = {name: spec.get("default", 0) for name, spec in roi_config["variables"].items()}
+            if store.get_roi(roi_config, defaults) is None:
+                store.put_roi(roi_config, defaults, roi_calculator.calculate_catalog_roi(roi_config, defaults))
+    return refreshed
+
+async def materialize(store: MaterializedStore, ai_client, roi_calculator, companies: List[str], concurrency: int = 4):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(company_name: str):
+        async with semaphore:
+            try:
+                refreshed = await materialize_account(store, ai_client, roi_calculator, company_name)
+                print(f"{company_name}: {', '.join(refreshed) if refreshed else 'up to date'}")
+            except Exception as e:
+                print(f"{company_name}: failed ({e})")
+
+    await asyncio.gather(*(run(name) for name in companies))
+    store.save()
+
+def main(argv=None):
+    """Materialize (or incrementally refresh) results for the accounts listed in a file"""
+    from dotenv import load_dotenv
+    from .ai_client import GeminiAIClient
+    from .batch_enrich import read_companies
+    from .roi_calculator import ROICalculator
+
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Precompute discovery results for target accounts")
+    parser.add_argument("accounts", help="CSV, JSONL or text file of company names")
+    parser.add_argument("--column", help="Input column/field holding the company name")
+    parser.add_argument("--path", help=f"Materialized results file (default $MATERIALIZED_RESULTS_PATH or {DEFAULT_PATH})")
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args(argv)
+
+    ai_client = GeminiAIClient()
+    store = MaterializedStore.for_client(ai_client, args.path)
+    companies = list(dict.fromkeys(read_companies(args.accounts, args.column)))
+    asyncio.run(materialize(store, ai_client, ROICalculator(), companies, args.concurrency))
+    print(f"Materialized {len(companies)} accounts to {store.path} "
+          f"(catalog {store.versions['catalog']}, prompts {store.versions['prompt']})")
+
+if __name__ == "__main__":
+    main()
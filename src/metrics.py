@@ -0,0 +1,251 @@
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# Default latency buckets in seconds, spanning cache hits up to slow LLM retries
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 40.0)
+
+def _format_value(value: float) -> str:
+    if value == float('inf'):
+        return '+Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+def _escape_label(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(labelnames: Sequence[str], labelvalues: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(labelnames, labelvalues)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+class _Metric:
+    metric_type = 'untyped'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"Metric {self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def render(self) -> List[str]:
+        return [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.metric_type}']
+
+class Counter(_Metric):
+    """Monotonically increasing counter"""
+    metric_type = 'counter'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+class Gauge(_Metric):
+    """Value that can go up and down"""
+    metric_type = 'gauge'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, value in self._values.items():
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed buckets"""
+    metric_type = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        # Per label set: [bucket counts..., sum, count]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            state[-2] += value
+            state[-1] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the wall-clock duration of a block"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> List[str]:
+        lines = super().render()
+        with self._lock:
+            for key, state in self._values.items():
+                cumulative = 0
+                for i, bound in enumerate(self.buckets):
+                    cumulative += state[i]
+                    labels = _format_labels(self.labelnames, key, ('le', _format_value(bound)))
+                    lines.append(f'{self.name}_bucket{labels} {_format_value(cumulative)}')
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f'{self.name}_sum{labels} {_format_value(state[-2])}')
+                lines.append(f'{self.name}_count{labels} {_format_value(state[-1])}')
+        return lines
+
+class MetricsRegistry:
+    """Holds all metrics and renders them in the Prometheus text exposition format"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+REGISTRY = MetricsRegistry()
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+# HTTP layer
+HTTP_REQUEST_DURATION = REGISTRY.register(Histogram(
+    'http_request_duration_seconds', 'HTTP request latency by endpoint', ('method', 'path', 'status')))
+
+# Gemini calls (operation is the name passed to GeminiAIClient._retry_api_call)
+GEMINI_REQUEST_DURATION = REGISTRY.register(Histogram(
+    'gemini_request_duration_seconds', 'Latency of individual Gemini API attempts', ('operation', 'model', 'outcome')))
+GEMINI_TOKENS = REGISTRY.register(Counter(
+    'gemini_tokens_total', 'Gemini tokens consumed', ('operation', 'kind')))
+GEMINI_RETRIES = REGISTRY.register(Counter(
+    'gemini_retries_total', 'Gemini API attempts retried after a retryable error', ('operation',)))
+AI_FALLBACKS = REGISTRY.register(Counter(
+    'ai_fallbacks_total', 'Responses served from a demo or fallback path instead of the model', ('operation', 'reason')))
+
+# Model routing (see src/model_router.py)
+MODEL_ROUTE_DECISIONS = REGISTRY.register(Counter(
+    'gemini_route_decisions_total', 'Model selected per attempt and why', ('operation', 'model', 'reason')))
+MODEL_SATURATION = REGISTRY.register(Gauge(
+    'gemini_model_saturation_ratio', 'In-flight Gemini calls relative to the per-model limit', ('model',)))
+SHADOW_AGREEMENT = REGISTRY.register(Histogram(
+    'gemini_shadow_agreement_ratio', 'Agreement between served and shadow model outputs', ('operation', 'shadow_model'),
+    buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 0.99, 1.0)))
+
+# Company validator
+VALIDATOR_STRATEGY_DURATION = REGISTRY.register(Histogram(
+    'validator_strategy_duration_seconds', 'Latency of each company validation strategy', ('strategy',)))
+VALIDATOR_STRATEGY_RESULTS = REGISTRY.register(Counter(
+    'validator_strategy_results_total', 'Company validation strategy outcomes', ('strategy', 'outcome')))
+VALIDATOR_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'validator_queue_depth', 'Validation jobs waiting for a browser worker'))
+VALIDATOR_JOBS = REGISTRY.register(Counter(
+    'validator_jobs_total', 'Validation jobs by outcome (ok, cached, rejected, timeout, error)', ('outcome',)))
+VALIDATOR_CIRCUIT_STATE = REGISTRY.register(Gauge(
+    'validator_circuit_state', 'Outbound circuit breaker state per host (0 closed, 1 half-open, 2 open)', ('host',)))
+VALIDATOR_CIRCUIT_TRIPS = REGISTRY.register(Counter(
+    'validator_circuit_trips_total', 'Times an outbound host circuit opened', ('host',)))
+VALIDATOR_CIRCUIT_REJECTIONS = REGISTRY.register(Counter(
+    'validator_circuit_rejections_total', 'Outbound requests fast-failed by an open circuit or full host queue', ('host',)))
+
+# Background jobs (see src/job_manager.py)
+JOB_QUEUE_DEPTH = REGISTRY.register(Gauge(
+    'job_queue_depth', 'Background jobs waiting for a worker'))
+JOBS = REGISTRY.register(Counter(
+    'jobs_total', 'Background jobs by kind and outcome (done, failed, rejected, reattached)', ('kind', 'outcome')))
+
+# Caches
+CACHE_REQUESTS = REGISTRY.register(Counter(
+    'cache_requests_total', 'Cache lookups by cache and result', ('cache', 'result')))
+
+# Event loop health
+EVENT_LOOP_LAG = REGISTRY.register(Gauge(
+    'event_loop_lag_last_seconds', 'Most recent event loop scheduling delay'))
+EVENT_LOOP_LAG_HISTOGRAM = REGISTRY.register(Histogram(
+    'event_loop_lag_seconds', 'Event loop scheduling delay',
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)))
+
+def record_cache_lookup(cache: str, hit: bool):
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+def strategy_outcome(result: Dict) -> str:
+    """Outcome label of a validator strategy result dict"""
+    if result.get('error') == 'timeout':
+        return 'timeout'
+    if result.get('error'):
+        return 'error'
+    if result.get('unavailable'):
+        return 'unavailable'
+    if result.get('blocked'):
+        return 'blocked'
+    return 'found' if result.get('found') else 'not_found'
+
+def record_strategy_outcome(strategy: str, outcome: str, duration: float):
+    VALIDATOR_STRATEGY_DURATION.observe(duration, strategy=strategy)
+    VALIDATOR_STRATEGY_RESULTS.inc(strategy=strategy, outcome=outcome)
+
+def record_strategy_result(strategy: str, result: Dict, duration: float):
+    """Record timing and outcome of a validator strategy result dict"""
+    record_strategy_outcome(strategy, strategy_outcome(result), duration)
+
+async def monitor_event_loop_lag(interval: float = 0.5):
+    """Sample how late the event loop wakes up relative to the requested sleep"""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lag = max(0.0, loop.time() - start - interval)
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HISTOGRAM.observe(lag)
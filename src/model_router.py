@@ -0,0 +1,232 @@
+import difflib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+from .metrics import MODEL_ROUTE_DECISIONS, MODEL_SATURATION, SHADOW_AGREEMENT
+from .state_backend import StateBackend, get_state_backend
+from .structured_output import parse_json
+
+FAST_MODEL = 'gemini-1.5-flash-8b'
+STANDARD_MODEL = 'gemini-1.5-flash'
+
+@dataclass
+class Route:
+    """Model choice for one GeminiAIClient operation"""
+    model: str
+    # Faster model used when the primary misses its latency SLO or is saturated
+    fallback_model: Optional[str] = None
+    latency_slo: Optional[float] = None  # seconds, per attempt
+    shadow_model: Optional[str] = None
+
+@dataclass
+class _LatencyStats:
+    ewma: float
+    updated_at: float
+
+def _is_rate_limit(error: Exception) -> bool:
+    error_str = str(error).lower()
+    return any(code in error_str for code in ('429', 'resource_exhausted', 'quota', 'rate limit', 'too many requests'))
+
+def compare_outputs(primary: str, shadow: str) -> float:
+    """Agreement between two model outputs in [0, 1].
+
+    JSON objects are compared field by field (share of top-level keys with
+    equal values); anything else falls back to a text similarity ratio.
+    """
+    try:
+        a, b = parse_json(primary), parse_json(shadow)
+    except ValueError:
+        a = b = None
+    if isinstance(a, dict) and isinstance(b, dict):
+        keys = set(a) | set(b)
+        if not keys:
+            return 1.0
+        def normalize(value):
+            return value.strip().lower() if isinstance(value, str) else json.dumps(value, sort_keys=True)
+        return sum(1 for key in keys if key in a and key in b and normalize(a[key]) == normalize(b[key])) / len(keys)
+    return difflib.SequenceMatcher(None, primary or "", shadow or "").ratio()
+
+class ModelRouter:
+    """Per-operation model selection with latency SLOs, saturation downgrade and shadowing.
+
+    Classification-style operations default to the fast tier and generation to
+    the standard tier. A route falls back to its faster model while the primary
+    is saturated (too many calls in flight, or rate limited within the cooldown)
+    or while its smoothed latency is above the SLO; the primary is re-probed
+    periodically so it can recover.
+    """
+
+    DEFAULT_ROUTES = {
+        "Chat response": Route(STANDARD_MODEL, fallback_model=FAST_MODEL, latency_slo=8.0),
+        "Pre-engagement analysis": Route(STANDARD_MODEL, fallback_model=FAST_MODEL, latency_slo=15.0),
+        "Hypothesis-based recommendations": Route(STANDARD_MODEL, fallback_model=FAST_MODEL, latency_slo=20.0),
+        "Lead qualification": Route(FAST_MODEL, latency_slo=5.0),
+        "LLM Company validation": Route(FAST_MODEL, latency_slo=5.0),
+        "Company details inference": Route(FAST_MODEL, latency_slo=5.0),
+    }
+
+    def __init__(self, default_model: str = STANDARD_MODEL, routes: Optional[Dict[str, Route]] = None,
+                 max_in_flight: int = 16, rate_limit_cooldown: float = 30.0, probe_interval: float = 30.0,
+                 ewma_alpha: float = 0.3, shadow_sample_rate: float = 1.0, state: Optional[StateBackend] = None,
+                 sync_interval: float = 1.0):
+        self.default_model = default_model
+        self.routes = dict(self.DEFAULT_ROUTES if routes is None else routes)
+        self.max_in_flight = max_in_flight
+        self.rate_limit_cooldown = rate_limit_cooldown
+        self.probe_interval = probe_interval
+        self.ewma_alpha = ewma_alpha
+        self.shadow_sample_rate = shadow_sample_rate
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, int] = {}
+        # Rate-limit cooldowns are shared between workers; in-flight counts stay per process.
+        # select() runs on the event loop, so it reads a local copy of the cooldowns that is
+        # refreshed from the state backend in the background every sync_interval seconds.
+        self.state = state or get_state_backend()
+        self.sync_interval = sync_interval
+        self._cooldowns: Dict[str, float] = {}  # model -> wall-clock end of its rate-limit cooldown
+        self._synced_at = float('-inf')
+        self._syncing = False
+        self._latency: Dict[Tuple[str, str], _LatencyStats] = {}
+        self._shadow_counter = 0
+
+    @classmethod
+    def from_env(cls) -> "ModelRouter":
+        """Build a router from GEMINI_* environment overrides.
+
+        GEMINI_MODEL / GEMINI_FAST_MODEL replace the standard and fast tiers,
+        GEMINI_MODEL_ROUTES is a JSON object of per-operation overrides
+        ({"Lead qualification": {"model": "...", "latency_slo": 3}}),
+        GEMINI_SHADOW_MODEL with GEMINI_SHADOW_OPERATIONS (comma separated,
+        default all) enables shadow comparisons, sampled at GEMINI_SHADOW_SAMPLE_RATE.
+        """
+        standard = os.getenv('GEMINI_MODEL', STANDARD_MODEL)
+        fast = os.getenv('GEMINI_FAST_MODEL', FAST_MODEL)
+        tiers = {STANDARD_MODEL: standard, FAST_MODEL: fast}
+        routes = {
+            operation: Route(tiers[route.model], tiers.get(route.fallback_model), route.latency_slo)
+            for operation, route in cls.DEFAULT_ROUTES.items()
+        }
+        overrides = os.getenv('GEMINI_MODEL_ROUTES')
+        if overrides:
+            for operation, values in json.loads(overrides).items():
+                base = routes.get(operation, Route(standard))
+                routes[operation] = Route(**{**base.__dict__, **values})
+
+        shadow_model = os.getenv('GEMINI_SHADOW_MODEL')
+        if shadow_model:
+            operations = [op.strip() for op in os.getenv('GEMINI_SHADOW_OPERATIONS', '').split(',') if op.strip()]
+            for operation in operations or list(routes):
+                routes.setdefault(operation, Route(standard)).shadow_model = shadow_model
+
+        return cls(
+            default_model=standard,
+            routes=routes,
+            max_in_flight=int(os.getenv('GEMINI_MAX_IN_FLIGHT', 16)),
+            shadow_sample_rate=float(os.getenv('GEMINI_SHADOW_SAMPLE_RATE', 1.0)),
+        )
+
+    def route_for(self, operation: str) -> Route:
+        return self.routes.get(operation) or Route(self.default_model)
+
+    def _saturated(self, model: str, now: float) -> bool:
+        return (self._in_flight.get(model, 0) >= self.max_in_flight
+                or self._cooldowns.get(model, 0.0) > time.time())
+
+    def _in_background(self, func: Callable[[], None]):
+        # A blocking backend (SQLite) must not be waited on from the event loop
+        if self.state.blocking:
+            threading.Thread(target=func, daemon=True).start()
+        else:
+            func()
+
+    def _sync_cooldowns(self):
+        try:
+            shared = {model: limited_at + self.rate_limit_cooldown
+                      for model, limited_at in self.state.items("rate_limited")}
+            with self._lock:
+                for model, until in shared.items():
+                    self._cooldowns[model] = max(self._cooldowns.get(model, 0.0), until)
+        except Exception as e:
+            print(f"Error syncing model rate limits: {e}")
+        finally:
+            self._syncing = False
+
+    def _record_rate_limit(self, model: str, limited_at: float):
+        try:
+            self.state.set("rate_limited", model, limited_at, ttl=self.rate_limit_cooldown)
+        except Exception as e:
+            print(f"Error sharing rate limit of {model}: {e}")
+
+    def _over_slo(self, operation: str, route: Route, now: float) -> bool:
+        stats = self._latency.get((operation, route.model))
+        if route.latency_slo is None or stats is None or stats.ewma <= route.latency_slo:
+            return False
+        # Let a call through now and then so a recovered primary can win traffic back
+        return now - stats.updated_at < self.probe_interval
+
+    def select(self, operation: str) -> str:
+        """Choose the model for the next attempt of an operation"""
+        route = self.route_for(operation)
+        now = time.monotonic()
+        if now - self._synced_at >= self.sync_interval and not self._syncing:
+            self._synced_at, self._syncing = now, True
+            self._in_background(self._sync_cooldowns)
+        with self._lock:
+            model, reason = route.model, "primary"
+            if route.fallback_model and not self._saturated(route.fallback_model, now):
+                if self._saturated(route.model, now):
+                    model, reason = route.fallback_model, "saturated"
+                elif self._over_slo(operation, route, now):
+                    model, reason = route.fallback_model, "slo"
+        MODEL_ROUTE_DECISIONS.inc(operation=operation, model=model, reason=reason)
+        return model
+
+    def acquire(self, model: str):
+        with self._lock:
+            self._in_flight[model] = self._in_flight.get(model, 0) + 1
+            in_flight = self._in_flight[model]
+        MODEL_SATURATION.set(in_flight / self.max_in_flight, model=model)
+
+    def release(self, operation: str, model: str, duration: float, error: Optional[Exception] = None):
+        """Record the outcome of an attempt started with acquire()"""
+        now = time.monotonic()
+        limited_at = None
+        with self._lock:
+            self._in_flight[model] = max(0, self._in_flight.get(model, 0) - 1)
+            in_flight = self._in_flight[model]
+            if error is not None:
+                if _is_rate_limit(error):
+                    limited_at = time.time()
+                    self._cooldowns[model] = limited_at + self.rate_limit_cooldown
+            else:
+                stats = self._latency.get((operation, model))
+                if stats is None:
+                    self._latency[(operation, model)] = _LatencyStats(duration, now)
+                else:
+                    stats.ewma += self.ewma_alpha * (duration - stats.ewma)
+                    stats.updated_at = now
+        if limited_at is not None:
+            self._in_background(lambda: self._record_rate_limit(model, limited_at))
+        MODEL_SATURATION.set(in_flight / self.max_in_flight, model=model)
+
+    def shadow_model_for(self, operation: str, served_model: str) -> Optional[str]:
+        """Model to shadow this call with, honouring the sample rate, or None"""
+        shadow = self.route_for(operation).shadow_model
+        if not shadow or shadow == served_model or self.shadow_sample_rate <= 0:
+            return None
+        with self._lock:
+            self._shadow_counter += 1
+            # Deterministic sampling: every Nth call
+            every = max(1, round(1 / self.shadow_sample_rate))
+            if self._shadow_counter % every:
+                return None
+        return shadow
+
+    def record_shadow(self, operation: str, shadow_model: str, primary_text: str, shadow_text: str) -> float:
+        agreement = compare_outputs(primary_text, shadow_text)
+        SHADOW_AGREEMENT.observe(agreement, operation=operation, shadow_model=shadow_model)
+        return agreement
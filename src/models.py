@@ -75,4 +75,41 @@ class ROICalculatorResult(BaseModel):
     ai_scenario: Dict[str, Any]
     roi_metrics: ROIMetrics
     consulting_pricing: Dict[str, Any]
-    business_case_summary: str
\ No newline at end of file
+    business_case_summary: str
+
+# Structured-output schemas for Gemini JSON responses (see src/structured_output.py)
+class CompanyValidation(BaseModel):
+    status: str
+    message: str
+    suggestions: List[str] = []
+    company_name: Optional[str] = None
+
+class CompanyDetails(BaseModel):
+    industry: str
+    company_size: str
+    description: str
+    confidence: str
+
+class StrategicHypothesis(BaseModel):
+    hypothesis: str
+    rationale: str
+    ai_opportunity: str
+
+class PreEngagementAnalysis(BaseModel):
+    research_findings: List[str]
+    strategic_hypotheses: List[StrategicHypothesis]
+
+class HypothesisProject(BaseModel):
+    title: str
+    description: str
+    priority: str
+    expected_roi: str
+    timeline: str
+    investment_range: str
+    business_value: str
+    implementation_notes: str
+    hypothesis_alignment: str
+
+class HypothesisRecommendations(BaseModel):
+    projects: List[HypothesisProject]
+    strategic_insights: str
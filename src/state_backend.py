@@ -0,0 +1,294 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, List, Optional, Tuple, TypeVar
+
+T = TypeVar('T')
+
+class StateBackend(ABC):
+    """Key/value and append-only list storage for state shared between API workers.
+
+    Values must be JSON-serializable. Keys live in namespaces (conversations,
+    validator cache, rate limits...) and may expire after a TTL in seconds.
+    Backends whose calls can block on disk or locks set blocking; async code
+    reaches them through run() so a busy database never stalls the event loop.
+    """
+
+    blocking = False
+
+    @abstractmethod
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        ...
+
+    @abstractmethod
+    def claim(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None, stale: Any = None) -> Any:
+        """Atomically set key to value unless it holds a live value other than stale.
+
+        Returns the value the key holds afterwards: value if the claim won.
+        """
+
+    @abstractmethod
+    def delete(self, namespace: str, key: str):
+        ...
+
+    @abstractmethod
+    def items(self, namespace: str) -> List[Tuple[str, Any]]:
+        """Unexpired keys and values of a namespace"""
+
+    @abstractmethod
+    def append(self, namespace: str, key: str, item: Any) -> int:
+        """Append to a list, returning its new length"""
+
+    @abstractmethod
+    def get_list(self, namespace: str, key: str, start: int = 0) -> List[Any]:
+        """Items of a list from index start onwards"""
+
+    @abstractmethod
+    def list_length(self, namespace: str, key: str) -> int:
+        ...
+
+    def close(self):
+        pass
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Call func (which uses this backend) from async code: in a worker thread if the backend blocks"""
+        if not self.blocking:
+            return func(*args, **kwargs)
+        return await asyncio.to_thread(func, *args, **kwargs)
+
+class MemoryBackend(StateBackend):
+    """Process-local backend; the default for a single worker"""
+
+    def __init__(self):
+        self._values: Dict[Tuple[str, str], Tuple[Any, Optional[float]]] = {}
+        self._lists: Dict[Tuple[str, str], List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        entry = self._values.get((namespace, key))
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            self._values.pop((namespace, key), None)
+            return None
+        return value
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        self._values[(namespace, key)] = (value, time.time() + ttl if ttl else None)
+
+    def claim(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None, stale: Any = None) -> Any:
+        with self._lock:
+            current = self.get(namespace, key)
+            if current is not None and current != stale:
+                return current
+            self.set(namespace, key, value, ttl)
+            return value
+
+    def delete(self, namespace: str, key: str):
+        self._values.pop((namespace, key), None)
+        self._lists.pop((namespace, key), None)
+
+    def items(self, namespace: str) -> List[Tuple[str, Any]]:
+        now = time.time()
+        return [(key, value) for (ns, key), (value, expires_at) in list(self._values.items())
+                if ns == namespace and (expires_at is None or expires_at > now)]
+
+    def append(self, namespace: str, key: str, item: Any) -> int:
+        with self._lock:
+            items = self._lists.setdefault((namespace, key), [])
+            items.append(item)
+            return len(items)
+
+    def get_list(self, namespace: str, key: str, start: int = 0) -> List[Any]:
+        return self._lists.get((namespace, key), [])[start:]
+
+    def list_length(self, namespace: str, key: str) -> int:
+        return len(self._lists.get((namespace, key), ()))
+
+class SQLiteBackend(StateBackend):
+    """Backend in a local SQLite database (WAL mode) shared by all workers on the box.
+
+    Expired keys are deleted when read, and all of them every purge_every
+    writes, so keys that are never read again do not pile up.
+    """
+
+    blocking = True
+
+    def __init__(self, path: str, purge_every: int = 1000):
+        self.path = path
+        self.purge_every = purge_every
+        self._writes = 0
+        self._writes_lock = threading.Lock()
+        self._local = threading.local()
+        with self._connection() as conn:
+            backfill = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'list_lengths'"
+            ).fetchone() is None
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS kv (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    PRIMARY KEY (namespace, key)
+                );
+                CREATE TABLE IF NOT EXISTS list_items (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS list_items_key ON list_items (namespace, key, id);
+                CREATE TABLE IF NOT EXISTS list_lengths (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    length INTEGER NOT NULL,
+                    PRIMARY KEY (namespace, key)
+                );
+                CREATE INDEX IF NOT EXISTS kv_expires_at ON kv (expires_at);
+            """)
+            if backfill:
+                # Databases from before list lengths were tracked
+                conn.execute("INSERT OR IGNORE INTO list_lengths (namespace, key, length) "
+                             "SELECT namespace, key, COUNT(*) FROM list_items GROUP BY namespace, key")
+        self.purge_expired()
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; asyncio.to_thread callers get their own
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        row = self._connection().execute(
+            "SELECT value, expires_at FROM kv WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        if row is None:
+            return None
+        if row[1] is not None and row[1] <= time.time():
+            self.delete(namespace, key)
+            return None
+        return json.loads(row[0])
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        self._connection().execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+            (namespace, key, json.dumps(value), time.time() + ttl if ttl else None)
+        )
+        self._written()
+
+    def _written(self):
+        with self._writes_lock:
+            self._writes += 1
+            due = self._writes % self.purge_every == 0
+        if due:
+            self.purge_expired()
+
+    def purge_expired(self):
+        """Delete every expired key"""
+        self._connection().execute(
+            "DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),)
+        )
+
+    def claim(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None, stale: Any = None) -> Any:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time())
+            ).fetchone()
+            current = json.loads(row[0]) if row is not None else None
+            if current is None or current == stale:
+                conn.execute(
+                    "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at) VALUES (?, ?, ?, ?)",
+                    (namespace, key, json.dumps(value), time.time() + ttl if ttl else None)
+                )
+                current = value
+            conn.execute("COMMIT")
+            if current is value:
+                self._written()
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return current
+
+    def delete(self, namespace: str, key: str):
+        conn = self._connection()
+        conn.execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+        conn.execute("DELETE FROM list_items WHERE namespace = ? AND key = ?", (namespace, key))
+        conn.execute("DELETE FROM list_lengths WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def items(self, namespace: str) -> List[Tuple[str, Any]]:
+        rows = self._connection().execute(
+            "SELECT key, value FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, time.time())
+        ).fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def append(self, namespace: str, key: str, item: Any) -> int:
+        conn = self._connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("INSERT INTO list_items (namespace, key, value) VALUES (?, ?, ?)",
+                         (namespace, key, json.dumps(item)))
+            conn.execute("INSERT INTO list_lengths (namespace, key, length) VALUES (?, ?, 1) "
+                         "ON CONFLICT (namespace, key) DO UPDATE SET length = length + 1", (namespace, key))
+            length = conn.execute("SELECT length FROM list_lengths WHERE namespace = ? AND key = ?",
+                                  (namespace, key)).fetchone()[0]
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return length
+
+    def get_list(self, namespace: str, key: str, start: int = 0) -> List[Any]:
+        rows = self._connection().execute(
+            "SELECT value FROM list_items WHERE namespace = ? AND key = ? ORDER BY id LIMIT -1 OFFSET ?",
+            (namespace, key, start)
+        ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def list_length(self, namespace: str, key: str) -> int:
+        row = self._connection().execute(
+            "SELECT length FROM list_lengths WHERE namespace = ? AND key = ?", (namespace, key)
+        ).fetchone()
+        return row[0] if row else 0
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+_backend: Optional[StateBackend] = None
+
+def get_state_backend() -> StateBackend:
+    """Shared backend selected by STATE_BACKEND (memory or sqlite, with STATE_DB_PATH)"""
+    global _backend
+    if _backend is None:
+        kind = os.getenv('STATE_BACKEND', 'memory').lower()
+        if kind == 'sqlite':
+            _backend = SQLiteBackend(os.getenv('STATE_DB_PATH', 'state.db'))
+        elif kind == 'memory':
+            _backend = MemoryBackend()
+        else:
+            raise ValueError(f"Unknown STATE_BACKEND {kind!r}; expected 'memory' or 'sqlite'")
+    return _backend
+
+def set_state_backend(backend: StateBackend):
+    global _backend
+    _backend = backend
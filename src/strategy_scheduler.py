@@ -0,0 +1,180 @@
+import asyncio
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from .metrics import strategy_outcome
+
+CORPORATE_SUFFIXES = {'inc', 'llc', 'ltd', 'limited', 'corp', 'corporation', 'co', 'company', 'gmbh', 'ag', 'sa',
+                      'plc', 'group', 'holdings', 'bv', 'nv', 'pty', 'srl', 'spa'}
+
+def name_shape(company_name: str) -> str:
+    """Coarse class of a company name; strategy hit rates differ a lot between them"""
+    words = company_name.split()
+    if len(words) == 1 and words[0].isupper() and len(words[0]) <= 5:
+        return 'acronym'
+    shape = 'one_word' if len(words) == 1 else 'two_words' if len(words) == 2 else 'multi_word'
+    if len(words) > 1 and words[-1].lower().strip('.,') in CORPORATE_SUFFIXES:
+        shape += '_suffixed'
+    return shape
+
+@dataclass
+class Strategy:
+    name: str
+    weight: int  # confidence points when the strategy finds the company
+    prior_hit_rate: float
+    prior_latency: float  # seconds
+    timeout: Optional[float] = None
+
+@dataclass
+class _Counts:
+    attempts: int = 0
+    found: int = 0
+    blocked: int = 0
+    errors: int = 0
+    latency: Optional[float] = None  # EWMA seconds
+
+class StrategyStats:
+    """Per strategy and name shape outcome counts and smoothed latency"""
+
+    def __init__(self, ewma_alpha: float = 0.2):
+        self.ewma_alpha = ewma_alpha
+        self._counts: Dict[Tuple[str, str], _Counts] = {}
+        self._lock = threading.Lock()
+
+    def record(self, strategy: str, shape: str, outcome: str, duration: float):
+        if outcome == 'unavailable':
+            # Fast-failed by an open circuit: says nothing about the strategy itself
+            return
+        with self._lock:
+            counts = self._counts.setdefault((strategy, shape), _Counts())
+            counts.attempts += 1
+            counts.found += outcome == 'found'
+            counts.blocked += outcome == 'blocked'
+            counts.errors += outcome in ('error', 'timeout')
+            if counts.latency is None:
+                counts.latency = duration
+            else:
+                counts.latency += self.ewma_alpha * (duration - counts.latency)
+
+    def counts(self, strategy: str, shape: str) -> _Counts:
+        return self._counts.get((strategy, shape)) or _Counts()
+
+    def snapshot(self) -> Dict[str, Dict[str, Dict[str, Any]]]:
+        """Learned stats by name shape and strategy"""
+        with self._lock:
+            snapshot: Dict[str, Dict[str, Dict[str, Any]]] = {}
+            for (strategy, shape), c in sorted(self._counts.items(), key=lambda item: (item[0][1], item[0][0])):
+                snapshot.setdefault(shape, {})[strategy] = {
+                    'attempts': c.attempts,
+                    'hit_rate': round(c.found / c.attempts, 3),
+                    'block_rate': round(c.blocked / c.attempts, 3),
+                    'error_rate': round(c.errors / c.attempts, 3),
+                    'latency_seconds': round(c.latency, 3),
+                }
+            return snapshot
+
+class StrategyScheduler:
+    """Runs validation strategies in the order most likely to settle a lookup quickly.
+
+    Strategies are ranked by expected confidence gained per second from the
+    hit rates and latencies learned for the name's shape (starting from
+    priors). Strategies that almost never succeed for a shape are skipped,
+    except on every explore_every-th lookup so they can recover. A strategy
+    runs alone when it is likely to hit, otherwise together with the next
+    one. The lookup stops as soon as the threshold is reached or can no
+    longer be reached with the strategies left.
+    """
+
+    def __init__(self, strategies: List[Strategy], threshold: int = 80, multi_source_bonus: int = 10,
+                 stats: Optional[StrategyStats] = None, prior_weight: float = 5.0, skip_below: float = 0.05,
+                 min_samples: int = 20, explore_every: int = 20, solo_hit_rate: float = 0.6):
+        self.strategies = {strategy.name: strategy for strategy in strategies}
+        self.threshold = threshold
+        self.multi_source_bonus = multi_source_bonus
+        self.stats = stats or StrategyStats()
+        self.prior_weight = prior_weight
+        self.skip_below = skip_below
+        self.min_samples = min_samples
+        self.explore_every = explore_every
+        self.solo_hit_rate = solo_hit_rate
+        self._lookups: Dict[str, int] = {}
+
+    def score(self, found: List[str]) -> int:
+        score = sum(self.strategies[name].weight for name in found)
+        if len(found) >= 2:
+            score += self.multi_source_bonus
+        return score
+
+    def hit_rate(self, strategy: Strategy, shape: str) -> float:
+        counts = self.stats.counts(strategy.name, shape)
+        return (counts.found + strategy.prior_hit_rate * self.prior_weight) / (counts.attempts + self.prior_weight)
+
+    def latency(self, strategy: Strategy, shape: str) -> float:
+        counts = self.stats.counts(strategy.name, shape)
+        return counts.latency if counts.latency is not None else strategy.prior_latency
+
+    def plan(self, shape: str) -> Tuple[List[Strategy], List[str]]:
+        """Strategies to try in order, and the ones skipped for this lookup"""
+        self._lookups[shape] = lookup = self._lookups.get(shape, 0) + 1
+        explore = lookup % self.explore_every == 0
+        planned, skipped = [], []
+        for strategy in self.strategies.values():
+            counts = self.stats.counts(strategy.name, shape)
+            if (not explore and counts.attempts >= self.min_samples
+                    and self.hit_rate(strategy, shape) < self.skip_below):
+                skipped.append(strategy.name)
+            else:
+                planned.append(strategy)
+        planned.sort(key=lambda s: s.weight * self.hit_rate(s, shape) / max(self.latency(s, shape), 0.01),
+                     reverse=True)
+        return planned, skipped
+
+    async def _run(self, strategy: Strategy, shape: str,
+                   run_strategy: Callable[[str], Awaitable[Dict[str, Any]]]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        start = time.perf_counter()
+        try:
+            result = await asyncio.wait_for(run_strategy(strategy.name), strategy.timeout)
+        except asyncio.TimeoutError:
+            result = {'found': False, 'error': 'timeout'}
+        except Exception as e:
+            result = {'found': False, 'error': str(e)}
+        run = {'strategy': strategy.name, 'outcome': strategy_outcome(result),
+               'duration': round(time.perf_counter() - start, 3)}
+        self.stats.record(strategy.name, shape, run['outcome'], run['duration'])
+        return result, run
+
+    async def run(self, company_name: str,
+                  run_strategy: Callable[[str], Awaitable[Dict[str, Any]]]) -> Tuple[List[str], Dict[str, Any]]:
+        """Run strategies for a name; returns the strategies that found it and per-strategy details.
+
+        details maps each successful strategy to its result and has a
+        'schedule' entry describing the shape, runs, skips and stop reason.
+        """
+        shape = name_shape(company_name)
+        pending, skipped = self.plan(shape)
+        found: List[str] = []
+        details: Dict[str, Any] = {}
+        runs: List[Dict[str, Any]] = []
+        stopped = 'exhausted'
+        while pending:
+            score = self.score(found)
+            if score >= self.threshold:
+                stopped = 'threshold_reached'
+                break
+            if self.score(found + [s.name for s in pending]) < self.threshold:
+                stopped = 'threshold_unreachable'
+                break
+            batch = [pending.pop(0)]
+            if pending and self.hit_rate(batch[0], shape) < self.solo_hit_rate:
+                # Unlikely to settle it alone; overlap with the next best strategy
+                batch.append(pending.pop(0))
+            for strategy, (result, run) in zip(batch, await asyncio.gather(
+                    *(self._run(strategy, shape, run_strategy) for strategy in batch))):
+                runs.append(run)
+                if result.get('found'):
+                    found.append(strategy.name)
+                    details[strategy.name] = result
+        details['schedule'] = {'shape': shape, 'runs': runs, 'skipped': skipped, 'stopped': stopped}
+        return found, details
@@ -0,0 +1,250 @@
+import json
+import re
+from typing import Any, Dict, List, Optional, Type
+
+from pydantic import BaseModel
+
+from . import fast_json
+
+_LITERALS = {"True": "true", "False": "false", "None": "null", "true": "true", "false": "false", "null": "null"}
+_CLOSERS = {"{": "}", "[": "]"}
+_QUOTE_PAIRS = {'"': '"', "'": "'", "“": "”"}
+_STRING_ESCAPES = {"\n": "\\n", "\r": "\\r", "\t": "\\t"}
+_PARTIAL_UNICODE_ESCAPE = re.compile(r'\\u[0-9a-fA-F]{0,3}$')
+_NUMBER = re.compile(r'-?\d+(\.\d+)?([eE][+-]?\d+)?$')
+
+def response_config(schema: Type[BaseModel]) -> Dict[str, Any]:
+    """Generation config asking Gemini for JSON constrained to a Pydantic model's schema"""
+    return {"response_mime_type": "application/json", "response_schema": schema}
+
+class _JSONScanner:
+    """Character-level scanner that rewrites model output into strict JSON.
+
+    Text before the first ``{``/``[`` (markdown fences, preamble prose) and
+    after the top-level value closes is dropped. Along the way it removes
+    trailing commas, escapes raw newlines inside strings, converts single or
+    curly quoted strings, quotes bare object keys and maps Python literals
+    (True/False/None). State is kept between feed() calls so streamed chunks
+    are scanned once; snapshot() closes whatever is still open.
+    """
+
+    def __init__(self):
+        self.out: List[str] = []
+        self.stack: List[str] = []
+        self.started = False
+        self.done = False
+        self.start = -1  # offset of the opening bracket in the text fed so far
+        self.closed = 0  # containers closed so far
+        self._fed = 0
+        self._quote: Optional[str] = None
+        self._string_is_key = False
+        self._escape = False
+        self._token: List[str] = []
+        self._expect_key = False
+        # Longest prefix of out that is valid JSON once the recorded containers are closed
+        self._safe_length = 0
+        self._safe_stack: List[str] = []
+
+    def _mark_safe(self):
+        self._safe_length = len(self.out)
+        self._safe_stack = list(self.stack)
+
+    def _strip_trailing_comma(self):
+        i = len(self.out)
+        while i and self.out[i - 1].isspace():
+            i -= 1
+        if i and self.out[i - 1] == ",":
+            del self.out[i - 1:]
+
+    def _flush_token(self):
+        if not self._token:
+            return
+        token = "".join(self._token)
+        self._token = []
+        if self.stack and self.stack[-1] == "{" and self._expect_key:
+            self.out.append(json.dumps(token))
+            return
+        self.out.append(_LITERALS.get(token, token))
+        if token in _LITERALS or _NUMBER.match(token):
+            self._mark_safe()
+
+    def _feed_string_char(self, ch: str):
+        if self._escape:
+            self._escape = False
+            if ch == "'":
+                # \' is not a JSON escape, whichever quote the string uses
+                self.out.append("'")
+            else:
+                self.out.append("\\" + ch)
+        elif ch == "\\":
+            self._escape = True
+        elif ch == _QUOTE_PAIRS[self._quote]:
+            self.out.append('"')
+            self._quote = None
+            if not self._string_is_key:
+                self._mark_safe()
+        elif ch == '"':
+            self.out.append('\\"')
+        else:
+            self.out.append(_STRING_ESCAPES.get(ch, ch))
+
+    def feed(self, text: str):
+        fed, self._fed = self._fed, self._fed + len(text)
+        for i, ch in enumerate(text):
+            if self.done:
+                return
+            if self._quote:
+                self._feed_string_char(ch)
+                continue
+            if not self.started:
+                if ch in _CLOSERS:
+                    self.started = True
+                    self.start = fed + i
+                else:
+                    continue
+            if ch.isalnum() or ch in "_.+-":
+                self._token.append(ch)
+                continue
+            self._flush_token()
+
+            if ch in _QUOTE_PAIRS:
+                self._quote = ch
+                self._string_is_key = bool(self.stack) and self.stack[-1] == "{" and self._expect_key
+                self.out.append('"')
+            elif ch in _CLOSERS:
+                self.stack.append(ch)
+                self._expect_key = ch == "{"
+                self.out.append(ch)
+                self._mark_safe()
+            elif ch in "}]":
+                if not self.stack:
+                    continue
+                self._strip_trailing_comma()
+                self.out.append(_CLOSERS[self.stack.pop()])
+                self._expect_key = False
+                self.closed += 1
+                self._mark_safe()
+                if not self.stack:
+                    self.done = True
+            elif ch == ",":
+                self.out.append(ch)
+                self._expect_key = bool(self.stack) and self.stack[-1] == "{"
+            elif ch == ":":
+                self.out.append(ch)
+                self._expect_key = False
+            elif ch.isspace():
+                self.out.append(ch)
+
+    def snapshot(self) -> str:
+        """Current output with open strings and containers closed"""
+        if self._quote and not self._string_is_key:
+            # Surface a string value that is still streaming in
+            text = "".join(self.out)
+            text = _PARTIAL_UNICODE_ESCAPE.sub("", text) + '"'
+            stack = self.stack
+        else:
+            in_key = bool(self.stack) and self.stack[-1] == "{" and self._expect_key
+            if self._token and not in_key:
+                token = "".join(self._token)
+                if token in _LITERALS or _NUMBER.match(token):
+                    # Keep a trailing number or literal; while streaming it may still grow
+                    return "".join(self.out) + _LITERALS.get(token, token) + "".join(
+                        _CLOSERS[c] for c in reversed(self.stack))
+            text = "".join(self.out[:self._safe_length])
+            stack = self._safe_stack
+        return text + "".join(_CLOSERS[c] for c in reversed(stack))
+
+def repair_json(text: str) -> str:
+    """Best-effort rewrite of malformed or truncated model output into parseable JSON"""
+    scanner = _JSONScanner()
+    scanner.feed(text)
+    return scanner.snapshot() if scanner.started else ""
+
+def parse_json(text: str) -> Any:
+    """Parse model output as JSON, repairing common malformations when strict parsing fails.
+
+    When the value starting at the first bracket cannot be repaired (a
+    bracket in preamble prose), each later ``{``/``[`` is tried in turn.
+    Raises ValueError when no JSON object or array can be recovered.
+    """
+    if not text:
+        raise ValueError("Empty response from AI model")
+    try:
+        return fast_json.loads(text)
+    except ValueError:
+        pass
+    error: Optional[ValueError] = None
+    offset = 0
+    while True:
+        scanner = _JSONScanner()
+        scanner.feed(text[offset:])
+        if not scanner.started:
+            raise error or ValueError("No JSON object found in model output")
+        try:
+            return fast_json.loads(scanner.snapshot())
+        except ValueError as e:
+            error = error or e
+            offset += scanner.start + 1
+
+class IncrementalJSONParser:
+    """Parse a JSON document as it streams in, exposing the fields received so far.
+
+    Each feed() returns the best-effort value parsed from all chunks so far,
+    or None when the new chunk did not change it. The document is only
+    re-parsed when a chunk closes an object or array and the output has grown
+    by an eighth since the last parse, so parsing a long stream costs a small
+    multiple of parsing it once. Partial values only contain fields whose
+    values have (at least partly) arrived; strings may be cut short and lists
+    may be missing trailing items until the stream completes. Like
+    parse_json(), a value that cannot be parsed once it closes (a bracket in
+    preamble prose) is skipped for the next ``{``/``[``.
+    """
+
+    def __init__(self):
+        self._scanner = _JSONScanner()
+        self._chunks: List[str] = []
+        self._offset = 0  # where the current scanner started reading the joined chunks
+        self._closed = 0
+        self._parsed_length = 0  # len(scanner.out) at the last parse
+        self._snapshot = ""
+        self.value: Any = None
+
+    @property
+    def complete(self) -> bool:
+        return self._scanner.done
+
+    def _parse(self) -> Any:
+        snapshot = self._scanner.snapshot()
+        if snapshot == self._snapshot:
+            return None
+        try:
+            value = fast_json.loads(snapshot)
+        except ValueError:
+            return None
+        self._snapshot = snapshot
+        self.value = value
+        return value
+
+    def feed(self, chunk: str) -> Any:
+        self._chunks.append(chunk)
+        self._scanner.feed(chunk)
+        while True:
+            scanner = self._scanner
+            if not scanner.started or scanner.closed == self._closed:
+                return None
+            if not scanner.done and len(scanner.out) - self._parsed_length < self._parsed_length // 8:
+                return None
+            self._closed, self._parsed_length = scanner.closed, len(scanner.out)
+            value = self._parse()
+            if not scanner.done or self._snapshot == scanner.snapshot():
+                return value
+            # The top-level value closed but does not parse: rescan from the next bracket
+            self._offset += scanner.start + 1
+            self._scanner, self._closed, self._parsed_length = _JSONScanner(), 0, 0
+            self._scanner.feed("".join(self._chunks)[self._offset:])
+
+    def result(self) -> Any:
+        """Final value once the stream has ended; raises ValueError if nothing was parsed"""
+        if self.value is None:
+            raise ValueError("No JSON object found in model output")
+        return self.value
@@ -0,0 +1,282 @@
+import atexit
+import contextvars
+import json
+import os
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+# Span kinds/status codes follow the OTLP JSON encoding so exported files can be
+# replayed into an OpenTelemetry collector (e.g. the otlpjsonfile receiver)
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+SERVICE_NAME = "ai-sales-assistant"
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    if isinstance(value, (list, tuple)):
+        return {"arrayValue": {"values": [_otlp_value(v) for v in value]}}
+    return {"stringValue": str(value)}
+
+class Span:
+    """A timed unit of work within a trace"""
+
+    def __init__(self, name: str, parent: Optional["Span"] = None, kind: int = SPAN_KIND_INTERNAL,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.name = name
+        self.trace_id = parent.trace_id if parent else secrets.token_hex(16)
+        self.span_id = secrets.token_hex(8)
+        self.parent_span_id = parent.span_id if parent else ""
+        self.kind = kind
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns = 0
+
+    def set_attribute(self, key: str, value: Any):
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def add_event(self, name: str, **attributes):
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes})
+
+    def record_exception(self, exc: BaseException):
+        self.add_event("exception", **{"exception.type": type(exc).__name__, "exception.message": str(exc)})
+        self.status_code = STATUS_ERROR
+        self.status_message = str(exc)
+
+    def end(self):
+        self.end_time_ns = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        return (self.end_time_ns - self.start_time_ns) / 1e6
+
+    def to_otlp(self) -> Dict[str, Any]:
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time_ns),
+            "endTimeUnixNano": str(self.end_time_ns),
+            "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in self.attributes.items()],
+            "events": [
+                {
+                    "timeUnixNano": str(event["time_ns"]),
+                    "name": event["name"],
+                    "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in event["attributes"].items()]
+                }
+                for event in self.events
+            ],
+            "status": {"code": self.status_code, "message": self.status_message}
+        }
+
+class _NoopSpan:
+    """Stand-in returned when tracing is disabled so call sites need no checks"""
+    trace_id = ""
+    span_id = ""
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]):
+        pass
+
+    def add_event(self, name: str, **attributes):
+        pass
+
+    def record_exception(self, exc: BaseException):
+        pass
+
+_NOOP_SPAN = _NoopSpan()
+
+class FileSpanExporter:
+    """Append finished spans to a file as OTLP JSON lines (one ExportTraceServiceRequest per line).
+
+    export() only queues the span; a background thread encodes and writes the
+    queue every flush_interval seconds, or as soon as max_batch spans are
+    waiting, so request handlers never wait on the disk.
+    """
+
+    def __init__(self, path: str, flush_interval: float = 1.0, max_batch: int = 512):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread: Optional[threading.Thread] = None
+
+    def export(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            if self._thread is None and not self._stopped:
+                self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+                self._thread.start()
+            if len(self._spans) >= self.max_batch:
+                self._wake.set()
+
+    def _run(self):
+        while not self._stopped:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Write the queued spans"""
+        with self._write_lock:
+            with self._lock:
+                spans, self._spans = self._spans, []
+            if not spans:
+                return
+            payload = {
+                "resourceSpans": [{
+                    "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": SERVICE_NAME}}]},
+                    "scopeSpans": [{"scope": {"name": "src.tracing"}, "spans": [span.to_otlp() for span in spans]}]
+                }]
+            }
+            try:
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(payload) + "\n")
+            except OSError as e:
+                print(f"Span export error: {e}")
+
+    def shutdown(self):
+        """Stop the background thread and write what is still queued"""
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+_exporter = None
+_exporter_loaded = False
+
+def get_exporter():
+    """Get the configured span exporter, or None when tracing is disabled"""
+    global _exporter, _exporter_loaded
+    if not _exporter_loaded:
+        path = os.getenv("TRACING_EXPORT_PATH")
+        _exporter = FileSpanExporter(path) if path else None
+        _exporter_loaded = True
+    return _exporter
+
+def shutdown():
+    """Flush the configured exporter; runs at exit, and on API shutdown"""
+    if _exporter is not None and hasattr(_exporter, "shutdown"):
+        _exporter.shutdown()
+
+atexit.register(shutdown)
+
+def set_exporter(exporter):
+    """Install a span exporter (any object with an export(span) method), or None to disable tracing"""
+    global _exporter, _exporter_loaded
+    _exporter = exporter
+    _exporter_loaded = True
+
+def current_span():
+    return _current_span.get() or _NOOP_SPAN
+
+@contextmanager
+def span(name: str, kind: int = SPAN_KIND_INTERNAL, **attributes):
+    """Trace a block as a child of the current span.
+
+    Context propagates through contextvars, so spans opened in tasks created
+    by asyncio.gather nest under the span that was active when they started.
+    """
+    exporter = get_exporter()
+    if exporter is None:
+        yield _NOOP_SPAN
+        return
+
+    current = Span(name, parent=_current_span.get(), kind=kind, attributes=attributes)
+    token = _current_span.set(current)
+    try:
+        yield current
+        if current.status_code == STATUS_UNSET:
+            current.status_code = STATUS_OK
+    except BaseException as e:
+        current.record_exception(e)
+        raise
+    finally:
+        _current_span.reset(token)
+        current.end()
+        try:
+            exporter.export(current)
+        except Exception as e:
+            print(f"Span export error: {e}")
+
+def load_spans(path: str) -> List[Dict[str, Any]]:
+    """Read spans back from a file written by FileSpanExporter"""
+    spans = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            for resource_spans in json.loads(line).get("resourceSpans", []):
+                for scope_spans in resource_spans.get("scopeSpans", []):
+                    spans.extend(scope_spans.get("spans", []))
+    return spans
+
+def format_trace_tree(spans: List[Dict[str, Any]]) -> str:
+    """Render spans as indented per-trace trees with durations, slowest work easy to spot"""
+    children: Dict[str, List[Dict[str, Any]]] = {}
+    roots = []
+    span_ids = {span["spanId"] for span in spans}
+    for span in spans:
+        parent = span.get("parentSpanId")
+        if parent and parent in span_ids:
+            children.setdefault(parent, []).append(span)
+        else:
+            roots.append(span)
+
+    lines = []
+
+    def render(span: Dict[str, Any], depth: int, trace_start: int):
+        start = int(span["startTimeUnixNano"])
+        duration_ms = (int(span["endTimeUnixNano"]) - start) / 1e6
+        offset_ms = (start - trace_start) / 1e6
+        attributes = ", ".join(
+            f"{attr['key']}={next(iter(attr['value'].values()))}" for attr in span.get("attributes", [])
+        )
+        error = " [ERROR]" if span.get("status", {}).get("code") == STATUS_ERROR else ""
+        lines.append(f"{'  ' * depth}{span['name']} {duration_ms:.1f}ms (+{offset_ms:.1f}ms){error}"
+                     + (f" {{{attributes}}}" if attributes else ""))
+        for child in sorted(children.get(span["spanId"], []), key=lambda s: int(s["startTimeUnixNano"])):
+            render(child, depth + 1, trace_start)
+
+    for root in sorted(roots, key=lambda s: int(s["startTimeUnixNano"])):
+        lines.append(f"trace {root['traceId']}")
+        render(root, 1, int(root["startTimeUnixNano"]))
+    return "\n".join(lines)
+
+def main():
+    import sys
+    path = sys.argv[1] if len(sys.argv) > 1 else os.getenv("TRACING_EXPORT_PATH", "traces.jsonl")
+    print(format_trace_tree(load_spans(path)))
+
+if __name__ == "__main__":
+    main()
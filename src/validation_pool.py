@@ -0,0 +1,281 @@
+"""Web company validation in a pool of browser worker processes.
+
+Each worker is a child process (``python -m src.validation_pool``) owning
+its own Chromium through a WebCompanyValidator and handling one job at a
+time, fed over stdin/stdout as JSON lines. The API process only queues jobs:
+the queue is bounded, so a validation spike is rejected with ValidatorBusy
+(and a Retry-After estimate) instead of piling up browser work, and every
+job has a timeout after which its worker is restarted.
+
+Workers share circuit breakers and the DNS and search caches through the
+state backend. The in-memory backend is private to each process, so with
+several workers and STATE_BACKEND=memory the workers get a SQLite backend of
+their own, in a temporary file removed when the pool shuts down.
+"""
+import asyncio
+import json
+import math
+import os
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from src.host_scheduler import CIRCUIT_STATES
+from src.metrics import (VALIDATOR_CIRCUIT_REJECTIONS, VALIDATOR_CIRCUIT_STATE, VALIDATOR_CIRCUIT_TRIPS, VALIDATOR_JOBS,
+                         VALIDATOR_QUEUE_DEPTH, record_cache_lookup, record_strategy_outcome)
+from src.state_backend import get_state_backend
+from src.strategy_scheduler import StrategyStats
+from src.web_validator import ValidationResult, WebCompanyValidator
+
+class ValidatorBusy(Exception):
+    """The validation queue is full; retry after the given number of seconds"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Validation queue is full, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+@dataclass
+class _Job:
+    company_name: str
+    future: asyncio.Future
+    queued_at: float
+
+class _BrowserWorker:
+    """Handle on one validator worker process"""
+
+    def __init__(self, env: Optional[Dict[str, str]] = None):
+        self.env = env
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.ready = False
+        self.started_at = 0.0
+        # Last circuit breaker snapshot reported by the worker
+        self.circuits: Dict[str, Dict[str, Any]] = {}
+
+    async def start(self, launch_timeout: float):
+        self.started_at = time.monotonic()
+        self.circuits = {}
+        self.process = await asyncio.create_subprocess_exec(
+            sys.executable, "-m", "src.validation_pool",
+            stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, limit=2 ** 20, env=self.env,
+        )
+        try:
+            # The worker reports whether its browser launched before taking jobs
+            line = await asyncio.wait_for(self.process.stdout.readline(), launch_timeout)
+            self.ready = bool(line) and json.loads(line).get("ready", False)
+        except asyncio.TimeoutError:
+            self.ready = False
+        if not self.ready:
+            await self.stop()
+
+    async def validate(self, company_name: str) -> ValidationResult:
+        self.process.stdin.write(json.dumps({"company_name": company_name}).encode("utf-8") + b"\n")
+        await self.process.stdin.drain()
+        line = await self.process.stdout.readline()
+        if not line:
+            self.ready = False
+            raise ConnectionError("Validator worker exited")
+        response = json.loads(line)
+        self._record_circuits(response.get("circuits", {}))
+        if "error" in response:
+            raise RuntimeError(response["error"])
+        return ValidationResult(**response["result"])
+
+    def _record_circuits(self, circuits: Dict[str, Dict[str, Any]]):
+        # Metrics recorded inside the worker never reach /metrics; mirror its breaker counters here
+        for host, current in circuits.items():
+            previous = self.circuits.get(host, {})
+            VALIDATOR_CIRCUIT_STATE.set(CIRCUIT_STATES[current["state"]], host=host)
+            for counter, key in ((VALIDATOR_CIRCUIT_TRIPS, "trips"), (VALIDATOR_CIRCUIT_REJECTIONS, "rejected")):
+                if current[key] > previous.get(key, 0):
+                    counter.inc(current[key] - previous.get(key, 0), host=host)
+        self.circuits = circuits
+
+    async def stop(self, timeout: float = 10.0):
+        self.ready = False
+        process, self.process = self.process, None
+        if process is None or process.returncode is not None:
+            return
+        # Closing stdin asks the worker to close its browser and exit
+        process.stdin.close()
+        try:
+            await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await process.wait()
+
+class ValidationPool:
+    """Bounded job queue in front of a pool of browser worker processes.
+
+    Offers the WebCompanyValidator interface (validate_company) plus submit(),
+    which queues a job and returns a future for its result, raising
+    ValidatorBusy when the queue is full. Results are cached in the shared
+    state backend before jobs are queued, so repeat lookups never wait.
+    """
+
+    def __init__(self, workers: int = 2, queue_size: int = 32, job_timeout: float = 45.0,
+                 launch_timeout: float = 60.0, relaunch_interval: float = 30.0):
+        self.job_timeout = job_timeout
+        self.launch_timeout = launch_timeout
+        self.relaunch_interval = relaunch_interval
+        self.cache = get_state_backend()
+        self.cache_ttl = 24 * 3600
+        self._state_db: Optional[str] = None
+        env = None
+        if workers > 1 and os.getenv('STATE_BACKEND', 'memory').lower() == 'memory':
+            self._state_db = os.path.join(tempfile.gettempdir(), f"ai-sales-validator-{os.getpid()}.db")
+            env = {**os.environ, 'STATE_BACKEND': 'sqlite', 'STATE_DB_PATH': self._state_db}
+        self._workers = [_BrowserWorker(env) for _ in range(max(1, workers))]
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self._consumers: List[asyncio.Task] = []
+        self._job_seconds = 5.0  # EWMA of job duration, for Retry-After
+        # Strategy outcomes from all workers; each worker schedules from its own copy
+        self.stats = StrategyStats()
+
+    @classmethod
+    def from_env(cls) -> "ValidationPool":
+        return cls(
+            workers=int(os.getenv('VALIDATOR_WORKERS', 2)),
+            queue_size=int(os.getenv('VALIDATOR_QUEUE_SIZE', 32)),
+            job_timeout=float(os.getenv('VALIDATOR_JOB_TIMEOUT', 45)),
+        )
+
+    @property
+    def ready(self) -> bool:
+        return any(worker.ready for worker in self._workers)
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize()
+
+    async def __aenter__(self):
+        await asyncio.gather(*(worker.start(self.launch_timeout) for worker in self._workers))
+        self._consumers = [asyncio.create_task(self._consume(worker)) for worker in self._workers]
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+        await asyncio.gather(*(worker.stop() for worker in self._workers))
+        while not self._queue.empty():
+            job = self._queue.get_nowait()
+            if not job.future.done():
+                job.future.set_exception(RuntimeError("Validation pool shut down"))
+        if self._state_db:
+            for suffix in ('', '-wal', '-shm'):
+                try:
+                    os.remove(self._state_db + suffix)
+                except FileNotFoundError:
+                    pass
+
+    def retry_after(self) -> float:
+        """Seconds until the queue has likely drained enough to accept a job"""
+        return max(1.0, math.ceil(self._job_seconds * (self._queue.qsize() + 1) / len(self._workers)))
+
+    async def submit(self, company_name: str) -> asyncio.Future:
+        """Queue a validation; the returned future resolves to its ValidationResult"""
+        future = asyncio.get_running_loop().create_future()
+        cache_key = company_name.lower().strip()
+        cached = await self.cache.run(self.cache.get, 'validator_cache', cache_key)
+        record_cache_lookup('validator_pool', cached is not None)
+        if cached is not None:
+            VALIDATOR_JOBS.inc(outcome='cached')
+            future.set_result(ValidationResult(**cached))
+            return future
+        try:
+            self._queue.put_nowait(_Job(company_name, future, time.monotonic()))
+        except asyncio.QueueFull:
+            VALIDATOR_JOBS.inc(outcome='rejected')
+            raise ValidatorBusy(self.retry_after())
+        VALIDATOR_QUEUE_DEPTH.set(self._queue.qsize())
+        return future
+
+    async def validate_company(self, company_name: str) -> ValidationResult:
+        return await (await self.submit(company_name))
+
+    async def strategy_stats(self) -> Dict[str, Any]:
+        return self.stats.snapshot()
+
+    def _record_schedule(self, result: ValidationResult):
+        # Metrics recorded inside the workers never reach /metrics, so record the runs here
+        schedule = result.details.get('schedule') or {}
+        for run in schedule.get('runs', []):
+            self.stats.record(run['strategy'], schedule['shape'], run['outcome'], run['duration'])
+            record_strategy_outcome(run['strategy'], run['outcome'], run['duration'])
+
+    async def _consume(self, worker: _BrowserWorker):
+        while True:
+            job = await self._queue.get()
+            VALIDATOR_QUEUE_DEPTH.set(self._queue.qsize())
+            if job.future.done():
+                # The caller gave up while the job was queued
+                continue
+            if not worker.ready and time.monotonic() - worker.started_at >= self.relaunch_interval:
+                await worker.start(self.launch_timeout)
+
+            start = time.monotonic()
+            try:
+                if not worker.ready:
+                    raise RuntimeError("browser unavailable")
+                result = await asyncio.wait_for(worker.validate(job.company_name), self.job_timeout)
+            except asyncio.TimeoutError:
+                VALIDATOR_JOBS.inc(outcome='timeout')
+                if not job.future.done():
+                    job.future.set_exception(TimeoutError(
+                        f"Validation of {job.company_name!r} timed out after {self.job_timeout:.0f}s"))
+                # The worker may be stuck mid-navigation and its reply would arrive out of turn
+                await worker.stop()
+                await worker.start(self.launch_timeout)
+                continue
+            except Exception as e:
+                VALIDATOR_JOBS.inc(outcome='error')
+                if not job.future.done():
+                    job.future.set_exception(e)
+                continue
+
+            self._job_seconds += 0.2 * (time.monotonic() - start - self._job_seconds)
+            self._record_schedule(result)
+            await self.cache.run(self.cache.set, 'validator_cache', job.company_name.lower().strip(), asdict(result),
+                                 ttl=self.cache_ttl)
+            VALIDATOR_JOBS.inc(outcome='ok')
+            if not job.future.done():
+                job.future.set_result(result)
+
+async def _worker_main():
+    # Keep stdout for replies; prints from the validator and the Playwright driver go to stderr
+    replies = os.fdopen(os.dup(sys.stdout.fileno()), "wb", buffering=0)
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+
+    def reply(message: dict):
+        replies.write(json.dumps(message).encode("utf-8") + b"\n")
+
+    validator = WebCompanyValidator()
+    try:
+        await validator.__aenter__()
+    except Exception as e:
+        print(f"Validator worker could not launch Chromium: {e}")
+    reply({"ready": validator.ready})
+    if not validator.ready:
+        return
+
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader(limit=2 ** 20)
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin)
+    try:
+        while True:
+            line = await reader.readline()
+            if not line:
+                return
+            try:
+                result = await validator.validate_company(json.loads(line)["company_name"])
+                reply({"result": asdict(result), "circuits": validator.hosts.snapshot()})
+            except Exception as e:
+                reply({"error": str(e), "circuits": validator.hosts.snapshot()})
+    finally:
+        await validator.__aexit__(None, None, None)
+
+if __name__ == "__main__":
+    asyncio.run(_worker_main())
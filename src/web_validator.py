@@ -1,11 +1,81 @@
 import asyncio
 import logging
-from typing import Dict, Any, List, Optional
-from dataclasses import dataclass
-from playwright.async_api import async_playwright, Browser, Page
+import os
+import random
+import time
+from typing import TYPE_CHECKING, Dict, Any, List, Optional
+from dataclasses import asdict, dataclass
 import re
 import urllib.parse
 from datetime import datetime, timedelta
+from src.metrics import record_cache_lookup, record_strategy_result
+from src import tracing
+from src.domain_candidates import DEFAULT_TLDS, DomainResolver, domain_candidates
+from src.host_scheduler import HostScheduler, HostUnavailable, is_timeout
+from src.state_backend import get_state_backend
+from src.strategy_scheduler import Strategy, StrategyScheduler
+
+if TYPE_CHECKING:
+    from playwright.async_api import Browser, Playwright
+
+# Validation strategies and the confidence each adds when it finds the company
+VALIDATION_STRATEGIES = [
+    Strategy('direct_domain', weight=50, prior_hit_rate=0.6, prior_latency=3.0),
+    Strategy('official_website', weight=40, prior_hit_rate=0.5, prior_latency=4.0, timeout=10.0),
+    Strategy('linkedin', weight=20, prior_hit_rate=0.4, prior_latency=4.0, timeout=10.0),
+    Strategy('wikipedia', weight=15, prior_hit_rate=0.3, prior_latency=4.0, timeout=10.0),
+]
+# Bot challenges and login walls served instead of results
+BLOCKED_URL_MARKERS = ('authwall', 'checkpoint', '/login', 'captcha', 'anomaly')
+BLOCKED_TITLE_MARKERS = ('captcha', 'are you a robot', 'unusual traffic', 'access denied', 'sign in', 'bots use duckduckgo')
+
+# Lean navigation profile: we only read titles, links and a few selectors
+BLOCKED_RESOURCE_TYPES = {'image', 'media', 'font', 'stylesheet', 'texttrack', 'eventsource', 'websocket', 'manifest'}
+TRACKER_DOMAINS = (
+    'google-analytics.com', 'googletagmanager.com', 'googlesyndication.com', 'doubleclick.net', 'adservice.google.com',
+    'facebook.net', 'connect.facebook.com', 'hotjar.com', 'segment.com', 'segment.io', 'optimizely.com',
+    'newrelic.com', 'nr-data.net', 'scorecardresearch.com', 'quantserve.com', 'hs-analytics.net', 'hubspot.com',
+    'clarity.ms', 'bing.com/bat', 'snap.licdn.com', 'ads.linkedin.com', 'px.ads.linkedin.com', 'criteo.com',
+    'taboola.com', 'outbrain.com', 'mixpanel.com', 'fullstory.com', 'intercom.io', 'cookielaw.org', 'onetrust.com',
+)
+
+# Collects search results and links in a single page.evaluate round trip
+EXTRACT_PAGE_JS = """
+({resultSelectors, hrefPatterns, limit}) => {
+    const text = (el) => el ? (el.innerText || el.textContent || '').trim() : '';
+    let nodes = [];
+    for (const selector of resultSelectors) {
+        nodes = document.querySelectorAll(selector);
+        if (nodes.length) break;
+    }
+    const results = Array.from(nodes).slice(0, limit).map((result) => {
+        const link = result.querySelector('a[data-testid="result-title-a"]') || result.querySelector('a');
+        const heading = result.querySelector('h2') || result.querySelector('a[data-testid="result-title-a"]');
+        return {url: link ? link.getAttribute('href') : null, title: text(heading)};
+    });
+    const links = [];
+    if (hrefPatterns.length) {
+        for (const a of document.querySelectorAll('a[href]')) {
+            const url = a.getAttribute('href');
+            if (hrefPatterns.some((pattern) => url.includes(pattern))) links.push({url, text: text(a)});
+            if (links.length >= limit) break;
+        }
+    }
+    return {results, links};
+}
+"""
+
+# One search covers the official site, LinkedIn and Wikipedia strategies
+SEARCH_RESULT_SELECTORS = ['article[data-testid="result"]', 'div.results_links']
+LINKEDIN_COMPANY_PATH = 'linkedin.com/company'
+WIKIPEDIA_ARTICLE_PATH = 'wikipedia.org/wiki/'
+
+STRATEGY_SOURCES = {
+    'direct_domain': 'Direct Domain',
+    'official_website': 'Official Website',
+    'linkedin': 'LinkedIn',
+    'wikipedia': 'Wikipedia',
+}
 
 @dataclass
 class ValidationResult:
@@ -19,9 +89,36 @@ class ValidationResult:
 
 class WebCompanyValidator:
     def __init__(self):
-        self.browser: Optional[Browser] = None
-        self.cache = {}  # Simple in-memory cache
+        self.playwright: Optional["Playwright"] = None
+        self.browser: Optional["Browser"] = None
+        # Results cache in the shared state backend, so all workers benefit
+        self.cache = get_state_backend()
         self.cache_ttl = timedelta(hours=24)
+        self.scheduler = StrategyScheduler(VALIDATION_STRATEGIES)
+        self._strategies = {
+            'direct_domain': self._try_direct_domain_validation,
+            'official_website': self._search_official_website,
+            'linkedin': self._search_linkedin_company,
+            'wikipedia': self._search_wikipedia,
+        }
+        
+        # Outbound endpoints (overridable to point validation at a local fixture server)
+        self.domain_url_template = os.getenv('VALIDATOR_DOMAIN_URL_TEMPLATE', 'https://{domain}')
+        self.search_url = os.getenv('VALIDATOR_SEARCH_URL', 'https://duckduckgo.com/')
+        # Politeness limits and circuit breakers per outbound host (the search engine, each probed domain)
+        self.search_host = urllib.parse.urlsplit(self.search_url).netloc
+        self.hosts = HostScheduler.from_env(search_host=self.search_host)
+        # Guessed domains are resolved before any navigation, unless probes go through a stand-in host
+        self.domain_tlds = [tld.strip() for tld in os.getenv('VALIDATOR_DOMAIN_TLDS', ','.join(DEFAULT_TLDS)).split(',')
+                            if tld.strip()]
+        self.dns_precheck = (os.getenv('VALIDATOR_DNS_PRECHECK', '1') != '0'
+                             and '{domain}' in urllib.parse.urlsplit(self.domain_url_template).netloc)
+        self.resolver = DomainResolver.from_env()
+        # Abort images, fonts, media and trackers on validator page loads (VALIDATOR_LEAN_PAGES=0 to disable)
+        self.lean_pages = os.getenv('VALIDATOR_LEAN_PAGES', '1') != '0'
+        # Combined search results by query, shared by the search strategies of a lookup
+        self.search_cache_ttl = float(os.getenv('VALIDATOR_SEARCH_CACHE_TTL', 3600))
+        self._searches: Dict[str, asyncio.Future] = {}
         
         # User agents to rotate
         self.user_agents = [
@@ -30,27 +127,53 @@ class WebCompanyValidator:
             "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
         ]
 
+    @property
+    def ready(self) -> bool:
+        return self.browser is not None
+
     async def __aenter__(self):
-        playwright = await async_playwright().start()
-        self.browser = await playwright.chromium.launch(
-            headless=True,
-            args=['--no-sandbox', '--disable-dev-shm-usage']
-        )
+        # Imported here so loading the app does not pay for Playwright until a browser is needed
+        from playwright.async_api import async_playwright
+        self.playwright = await async_playwright().start()
+        try:
+            self.browser = await self.playwright.chromium.launch(
+                headless=True,
+                args=['--no-sandbox', '--disable-dev-shm-usage']
+            )
+        except Exception:
+            await self.playwright.stop()
+            self.playwright = None
+            raise
         return self
 
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         if self.browser:
             await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+    async def strategy_stats(self) -> Dict[str, Any]:
+        """Hit rates, block rates and latencies learned per name shape and strategy"""
+        return self.scheduler.stats.snapshot()
+
+    async def submit(self, company_name: str) -> asyncio.Future:
+        """Start a validation in this process; same interface as ValidationPool.submit"""
+        return asyncio.ensure_future(self.validate_company(company_name))
 
     async def validate_company(self, company_name: str) -> ValidationResult:
         """Main validation method using multiple strategies"""
         
         # Check cache first
         cache_key = company_name.lower().strip()
-        if cache_key in self.cache:
-            cached_result, timestamp = self.cache[cache_key]
-            if datetime.now() - timestamp < self.cache_ttl:
-                return cached_result
+        cached_result = await self.cache.run(self.cache.get, 'validator_cache', cache_key)
+        if cached_result is not None:
+            record_cache_lookup('validator', hit=True)
+            tracing.current_span().set_attribute('validator.cache_hit', True)
+            return ValidationResult(**cached_result)
+        record_cache_lookup('validator', hit=False)
+        tracing.current_span().set_attribute('validator.cache_hit', False)
 
         try:
             # Initialize validation result
@@ -64,53 +187,11 @@ class WebCompanyValidator:
                 details={}
             )
 
-            # Try direct domain validation first (fastest)
-            direct_result = await self._try_direct_domain_validation(company_name)
-            confidence_score = 0
-            sources = []
-            details = {}
-
-            if direct_result['found']:
-                confidence_score += 50
-                sources.append('Direct Domain')
-                details['direct_domain'] = direct_result
-
-            # If direct domain found, try additional validations in parallel
-            if confidence_score > 0:
-                try:
-                    # Run additional strategies with shorter timeout
-                    strategies = [
-                        self._search_linkedin_company(company_name),
-                        self._search_wikipedia(company_name)
-                    ]
-
-                    results = await asyncio.wait_for(
-                        asyncio.gather(*strategies, return_exceptions=True),
-                        timeout=10.0
-                    )
-
-                    # LinkedIn validation
-                    if results[0] and not isinstance(results[0], Exception):
-                        linkedin_data = results[0]
-                        if linkedin_data['found']:
-                            confidence_score += 20
-                            sources.append('LinkedIn')
-                            details['linkedin'] = linkedin_data
-
-                    # Wikipedia validation
-                    if results[1] and not isinstance(results[1], Exception):
-                        wikipedia_data = results[1]
-                        if wikipedia_data['found']:
-                            confidence_score += 15
-                            sources.append('Wikipedia')
-                            details['wikipedia'] = wikipedia_data
-
-                except asyncio.TimeoutError:
-                    logging.warning(f"Additional validation timeout for {company_name}")
-
-            # Multiple sources bonus
-            if len(sources) >= 2:
-                confidence_score += 10
+            # Strategies run in the order (and with the overlap) learned for this shape of name
+            found, details = await self.scheduler.run(company_name, lambda strategy: self._timed_strategy(
+                strategy, self._strategies[strategy](company_name)))
+            confidence_score = self.scheduler.score(found)
+            sources = [STRATEGY_SOURCES[strategy] for strategy in found]
 
             # Determine final status and message
             result.confidence = min(confidence_score, 100)
@@ -131,7 +212,8 @@ class WebCompanyValidator:
                 result.message = f"No reliable information found for '{company_name}'. Please verify the company name."
 
             # Cache the result
-            self.cache[cache_key] = (result, datetime.now())
+            await self.cache.run(self.cache.set, 'validator_cache', cache_key, asdict(result),
+                                 ttl=self.cache_ttl.total_seconds())
             
             return result
 
@@ -147,156 +229,234 @@ class WebCompanyValidator:
                 details={'error': str(e)}
             )
     
+    async def _timed_strategy(self, strategy: str, coro) -> Dict[str, Any]:
+        """Await a validation strategy and record its latency and outcome"""
+        start = time.perf_counter()
+        result = {'found': False, 'error': 'timeout'}
+        with tracing.span(f"validator.{strategy}", strategy=strategy) as span:
+            try:
+                result = await coro
+                return result
+            except Exception as e:
+                result = {'found': False, 'error': str(e)}
+                raise
+            finally:
+                span.set_attributes({'found': result.get('found', False), 'error': result.get('error')})
+                record_strategy_result(strategy, result, time.perf_counter() - start)
+
+    async def _new_page(self, user_agent: Optional[str] = None, first_party: Optional[str] = None):
+        """Open a page using the lean navigation profile.
+
+        With first_party set (a domain), scripts from any other host are
+        aborted as well, which is enough for reading a site's title.
+        """
+        page = await self.browser.new_page(user_agent=user_agent) if user_agent else await self.browser.new_page()
+        if not self.lean_pages:
+            return page
+
+        async def route_request(route):
+            request = route.request
+            host = urllib.parse.urlsplit(request.url).netloc.lower()
+            url = host + urllib.parse.urlsplit(request.url).path
+            if (request.resource_type in BLOCKED_RESOURCE_TYPES
+                    or (request.resource_type != 'document' and any(tracker in url for tracker in TRACKER_DOMAINS))
+                    or (first_party and request.resource_type == 'script'
+                        and not (host == first_party or host.endswith('.' + first_party)))):
+                await route.abort()
+            else:
+                await route.continue_()
+
+        await page.route('**/*', route_request)
+        return page
+
+    async def _extract_page(self, page, result_selectors: Optional[List[str]] = None,
+                            href_patterns: Optional[List[str]] = None, limit: int = 10) -> Dict[str, List[Dict[str, str]]]:
+        """Search results ({url, title}) and links whose href contains one of href_patterns ({url, text}).
+
+        Everything is read in one page.evaluate call instead of a Playwright
+        round trip per element; matching then happens in Python.
+        """
+        return await page.evaluate(EXTRACT_PAGE_JS, {
+            'resultSelectors': result_selectors or [],
+            'hrefPatterns': href_patterns or [],
+            'limit': limit,
+        })
+
+    async def _is_blocked(self, page) -> bool:
+        """Whether the page is a bot challenge or login wall rather than search results"""
+        if any(marker in page.url.lower() for marker in BLOCKED_URL_MARKERS):
+            return True
+        title = (await page.title()).lower()
+        return any(marker in title for marker in BLOCKED_TITLE_MARKERS)
+
     async def _try_direct_domain_validation(self, company_name: str) -> Dict[str, Any]:
         """Try to validate by directly checking likely company domains"""
         if not self.browser:
             return {'found': False, 'error': 'Browser not initialized'}
 
-        # Generate likely domain names
         company_clean = re.sub(r'[^a-zA-Z0-9]', '', company_name.lower())
         company_words = [word.lower() for word in company_name.split() if len(word) > 1]
-        
-        potential_domains = []
-        
-        # Direct company name
-        potential_domains.extend([
-            f"{company_clean}.com",
-            f"{company_name.lower().replace(' ', '')}.com",
-            f"{company_name.lower().replace(' ', '-')}.com"
-        ])
-        
-        # Individual words for single-word companies
-        if len(company_words) == 1:
-            potential_domains.append(f"{company_words[0]}.com")
-        
-        # Acronyms for multi-word companies
-        if len(company_words) > 1:
-            acronym = ''.join([word[0] for word in company_words])
-            potential_domains.append(f"{acronym}.com")
+
+        # Likely domains; dead guesses are dropped before they cost a navigation timeout each
+        potential_domains = domain_candidates(company_name, self.domain_tlds)
+        if self.dns_precheck:
+            with tracing.span('validator.dns_precheck', candidates=len(potential_domains)) as dns_span:
+                resolved = await self.resolver.resolve_all(potential_domains)
+                potential_domains = [domain for domain in potential_domains if resolved[domain]]
+                dns_span.set_attribute('resolved', len(potential_domains))
         
         # Try each potential domain
         for domain in potential_domains[:5]:  # Limit to first 5 attempts
-            try:
-                page = await self.browser.new_page()
-                
+            with tracing.span('validator.domain_probe', domain=domain) as probe_span:
                 try:
-                    response = await page.goto(f"https://{domain}", timeout=5000)
-                    status = response.status if response else 0
-                    
-                    # Accept various status codes that indicate domain exists
-                    if response and (status < 400 or status in [403, 429]):  # 403 = Forbidden, 429 = Rate Limited
-                        
-                        if status < 400:
-                            # Page loaded successfully, check title
-                            title = await page.title()
-                            
-                            # Check if title contains company name
-                            title_lower = title.lower()
-                            company_lower = company_name.lower()
-                            
-                            # Flexible matching for title validation
-                            if (company_lower in title_lower or 
-                                any(word in title_lower for word in company_words if len(word) > 2) or
-                                company_clean in title_lower.replace(' ', '')):
-                                
-                                await page.close()
-                                return {
-                                    'found': True,
-                                    'url': f"https://{domain}",
-                                    'title': title,
-                                    'domain': domain
-                                }
-                        else:
-                            # Domain exists but is blocking us (403, 429)
-                            # This is strong evidence the company exists
+                    async with self.hosts.request(domain) as slot:
+                        page = await self._new_page(first_party=domain)
+
+                        try:
+                            response = await page.goto(self.domain_url_template.format(domain=domain), timeout=5000,
+                                                       wait_until='domcontentloaded')
+                            status = response.status if response else 0
+                            probe_span.set_attribute('http.status_code', status)
+                            if status == 429:
+                                slot.fail()
+
+                            # Accept various status codes that indicate domain exists
+                            if response and (status < 400 or status in [403, 429]):  # 403 = Forbidden, 429 = Rate Limited
+
+                                if status < 400:
+                                    # Page loaded successfully, check title
+                                    title = await page.title()
+
+                                    # Check if title contains company name
+                                    title_lower = title.lower()
+                                    company_lower = company_name.lower()
+
+                                    # Flexible matching for title validation
+                                    if (company_lower in title_lower or
+                                        any(word in title_lower for word in company_words if len(word) > 2) or
+                                        company_clean in title_lower.replace(' ', '')):
+
+                                        return {
+                                            'found': True,
+                                            'url': f"https://{domain}",
+                                            'title': title,
+                                            'domain': domain
+                                        }
+                                else:
+                                    # Domain exists but is blocking us (403, 429)
+                                    # This is strong evidence the company exists
+                                    return {
+                                        'found': True,
+                                        'url': f"https://{domain}",
+                                        'title': f"{company_name} (Protected Domain)",
+                                        'domain': domain,
+                                        'status': status
+                                    }
+
+                        except Exception as e:
+                            # Domain doesn't exist or is not accessible; a timeout counts against the host
+                            probe_span.set_attribute('probe.error', type(e).__name__)
+                            if is_timeout(e):
+                                slot.fail()
+                        finally:
                             await page.close()
-                            return {
-                                'found': True,
-                                'url': f"https://{domain}",
-                                'title': f"{company_name} (Protected Domain)",
-                                'domain': domain,
-                                'status': status
-                            }
-                
-                except Exception:
-                    # Domain doesn't exist or is not accessible
-                    pass
-                finally:
-                    await page.close()
-                    
-            except Exception as e:
-                logging.debug(f"Error checking domain {domain}: {e}")
-                continue
+
+                except Exception as e:
+                    logging.debug(f"Error checking domain {domain}: {e}")
+                    continue
         
         return {'found': False}
 
+    async def _search(self, company_name: str) -> Dict[str, Any]:
+        """Results and LinkedIn/Wikipedia links of one combined search for a company.
+
+        The official website, LinkedIn and Wikipedia strategies all read this
+        search instead of loading a results page each. Strategies running at
+        the same time await the same page load, and later ones hit the search
+        cache. A blocked search comes back as {'blocked': True} and is not cached;
+        while the search engine's circuit is open it is {'blocked': True, 'unavailable': reason}
+        without any page load.
+        """
+        query = f'"{company_name}" (official website OR site:{LINKEDIN_COMPANY_PATH} OR site:wikipedia.org)'
+        cached = await self.cache.run(self.cache.get, 'search_cache', query)
+        record_cache_lookup('validator_search', cached is not None)
+        if cached is not None:
+            return cached
+
+        search = self._searches.get(query)
+        if search is None:
+            search = self._searches[query] = asyncio.ensure_future(self._fetch_search(query))
+
+            def done(future: asyncio.Future):
+                self._searches.pop(query, None)
+                if not future.cancelled():
+                    # Retrieved here too, in case every strategy waiting on it timed out
+                    future.exception()
+            search.add_done_callback(done)
+        # A strategy timing out must not cancel the page load the others wait for
+        return await asyncio.shield(search)
+
+    async def _fetch_search(self, query: str) -> Dict[str, Any]:
+        try:
+            async with self.hosts.request(self.search_host) as slot:
+                page = await self._new_page(user_agent=random.choice(self.user_agents))
+                try:
+                    search_url = f"{self.search_url}?q={urllib.parse.quote(query)}"
+                    await page.goto(search_url, timeout=8000, wait_until='domcontentloaded')
+                    if await self._is_blocked(page):
+                        slot.fail()
+                        return {'blocked': True}
+                    try:
+                        await page.wait_for_selector(', '.join(SEARCH_RESULT_SELECTORS), timeout=5000)
+                    except Exception:
+                        # No results rendered; the strategies simply find nothing
+                        pass
+                    extracted = await self._extract_page(page, result_selectors=SEARCH_RESULT_SELECTORS,
+                                                         href_patterns=[LINKEDIN_COMPANY_PATH, WIKIPEDIA_ARTICLE_PATH])
+                finally:
+                    await page.close()
+        except HostUnavailable as e:
+            return {'blocked': True, 'unavailable': e.reason}
+        await self.cache.run(self.cache.set, 'search_cache', query, extracted, ttl=self.search_cache_ttl)
+        return extracted
+
+    def _search_links(self, extracted: Dict[str, Any], pattern: str) -> List[Dict[str, str]]:
+        """Result titles and other links pointing at pattern, results first"""
+        links = [{'url': result['url'], 'text': result['title']} for result in extracted['results']
+                 if result['url'] and pattern in result['url']]
+        seen = {link['url'] for link in links}
+        links.extend(link for link in extracted['links'] if pattern in link['url'] and link['url'] not in seen)
+        return links
+
     async def _search_official_website(self, company_name: str) -> Dict[str, Any]:
-        """Search for official company website using DuckDuckGo (less restrictive)"""
+        """Find the official company website among the combined search results"""
         if not self.browser:
             return {'found': False, 'error': 'Browser not initialized'}
 
         try:
-            page = await self.browser.new_page(
-                user_agent=self.user_agents[0]
-            )
-            
-            # Use DuckDuckGo instead of Google (less bot detection)
-            search_query = f'"{company_name}" official website'
-            search_url = f"https://duckduckgo.com/?q={urllib.parse.quote(search_query)}"
-            
-            await page.goto(search_url, timeout=8000)
-            
-            # Wait for results to load
-            try:
-                await page.wait_for_selector('article[data-testid="result"]', timeout=5000)
-            except:
-                # Try alternate wait
-                await asyncio.sleep(2)
-
-            # Look for search results (DuckDuckGo structure)
-            search_results = await page.query_selector_all('article[data-testid="result"]')
-            
-            if not search_results:
-                # Fallback selectors for DuckDuckGo
-                search_results = await page.query_selector_all('div.results_links')
+            extracted = await self._search(company_name)
+            if extracted.get('blocked'):
+                return {'found': False, **extracted}
 
             website_info = {'found': False}
-            
-            for result in search_results[:5]:  # Check first 5 results
-                try:
-                    # Get URL from DuckDuckGo result
-                    link_element = await result.query_selector('a[data-testid="result-title-a"]')
-                    if not link_element:
-                        link_element = await result.query_selector('a')
-                    
-                    if link_element:
-                        url = await link_element.get_attribute('href')
-                        
-                        # DuckDuckGo sometimes uses redirect URLs
-                        if url and '/l/?uddg=' in url:
-                            # Skip redirect URLs for now
-                            continue
-                            
-                        if url and self._is_likely_official_domain(url, company_name):
-                            # Get title
-                            title_element = await result.query_selector('h2')
-                            if not title_element:
-                                title_element = await result.query_selector('a[data-testid="result-title-a"]')
-                            
-                            title = await title_element.inner_text() if title_element else ''
-                            
-                            website_info = {
-                                'found': True,
-                                'url': url,
-                                'title': title.strip(),
-                                'domain': self._extract_domain(url)
-                            }
-                            break
-                except Exception as e:
-                    logging.debug(f"Error processing search result: {e}")
+
+            for result in extracted['results']:
+                url = result['url']
+
+                # DuckDuckGo sometimes uses redirect URLs
+                if url and '/l/?uddg=' in url:
+                    # Skip redirect URLs for now
                     continue
 
-            await page.close()
+                if url and self._is_likely_official_domain(url, company_name):
+                    website_info = {
+                        'found': True,
+                        'url': url,
+                        'title': result['title'],
+                        'domain': self._extract_domain(url)
+                    }
+                    break
+
             return website_info
 
         except Exception as e:
@@ -304,42 +464,26 @@ class WebCompanyValidator:
             return {'found': False, 'error': str(e)}
 
     async def _search_linkedin_company(self, company_name: str) -> Dict[str, Any]:
-        """Search for LinkedIn company page using direct search"""
+        """Find the LinkedIn company page among the combined search results"""
         if not self.browser:
             return {'found': False, 'error': 'Browser not initialized'}
 
         try:
-            page = await self.browser.new_page(
-                user_agent=self.user_agents[1]
-            )
+            extracted = await self._search(company_name)
+            if extracted.get('blocked'):
+                return {'found': False, **extracted}
 
-            # Search DuckDuckGo for LinkedIn company pages
-            search_query = f'site:linkedin.com/company "{company_name}"'
-            search_url = f"https://duckduckgo.com/?q={urllib.parse.quote(search_query)}"
-            
-            await page.goto(search_url, timeout=8000)
-            await asyncio.sleep(2)  # Simple wait for results
-
-            # Look for any links containing LinkedIn
-            all_links = await page.query_selector_all('a')
-            
             linkedin_info = {'found': False}
-            
-            for link in all_links[:10]:  # Check first 10 links
-                try:
-                    url = await link.get_attribute('href')
-                    if url and 'linkedin.com/company' in url and company_name.lower().replace(' ', '') in url.lower():
-                        title = await link.inner_text()
-                        linkedin_info = {
-                            'found': True,
-                            'url': url,
-                            'title': title.strip()
-                        }
-                        break
-                except:
-                    continue
 
-            await page.close()
+            for link in self._search_links(extracted, LINKEDIN_COMPANY_PATH):
+                if company_name.lower().replace(' ', '') in link['url'].lower():
+                    linkedin_info = {
+                        'found': True,
+                        'url': link['url'],
+                        'title': link['text']
+                    }
+                    break
+
             return linkedin_info
 
         except Exception as e:
@@ -347,45 +491,29 @@ class WebCompanyValidator:
             return {'found': False, 'error': str(e)}
 
     async def _search_wikipedia(self, company_name: str) -> Dict[str, Any]:
-        """Search for Wikipedia page using DuckDuckGo"""
+        """Find the Wikipedia article among the combined search results"""
         if not self.browser:
             return {'found': False, 'error': 'Browser not initialized'}
 
         try:
-            page = await self.browser.new_page(
-                user_agent=self.user_agents[2]
-            )
-
-            # Search DuckDuckGo for Wikipedia pages
-            search_query = f'site:wikipedia.org "{company_name}"'
-            search_url = f"https://duckduckgo.com/?q={urllib.parse.quote(search_query)}"
-            
-            await page.goto(search_url, timeout=8000)
-            await asyncio.sleep(2)
+            extracted = await self._search(company_name)
+            if extracted.get('blocked'):
+                return {'found': False, **extracted}
 
-            # Look for Wikipedia results
-            all_links = await page.query_selector_all('a')
-            
             wikipedia_info = {'found': False}
-            
-            for link in all_links[:10]:
-                try:
-                    url = await link.get_attribute('href')
-                    if url and 'wikipedia.org/wiki/' in url:
-                        title = await link.inner_text()
-                        # More flexible matching for Wikipedia titles
-                        if title and (company_name.lower() in title.lower() or 
-                                     any(word.lower() in title.lower() for word in company_name.split() if len(word) > 2)):
-                            wikipedia_info = {
-                                'found': True,
-                                'url': url,
-                                'title': title.strip()
-                            }
-                            break
-                except:
-                    continue
 
-            await page.close()
+            for link in self._search_links(extracted, WIKIPEDIA_ARTICLE_PATH):
+                title = link['text']
+                # More flexible matching for Wikipedia titles
+                if title and (company_name.lower() in title.lower() or
+                              any(word.lower() in title.lower() for word in company_name.split() if len(word) > 2)):
+                    wikipedia_info = {
+                        'found': True,
+                        'url': link['url'],
+                        'title': title
+                    }
+                    break
+
             return wikipedia_info
 
         except Exception as e:
@@ -440,11 +568,42 @@ class WebCompanyValidator:
 
 # Singleton instance for reuse
 _web_validator = None
+_web_validator_lock = asyncio.Lock()
 
 async def get_web_validator():
-    """Get or create web validator instance"""
+    """Get or create web validator instance.
+
+    By default this is a ValidationPool of VALIDATOR_WORKERS browser worker
+    processes; VALIDATOR_WORKERS=0 runs the browser in this process instead.
+    With BROWSER_SERVICE_SOCKET set (multi-worker mode) it is a client for
+    the shared browser service.
+    """
     global _web_validator
     if _web_validator is None:
-        _web_validator = WebCompanyValidator()
-        await _web_validator.__aenter__()
-    return _web_validator
\ No newline at end of file
+        # Concurrent first requests must not each launch a browser
+        async with _web_validator_lock:
+            if _web_validator is None:
+                socket_path = os.getenv('BROWSER_SERVICE_SOCKET')
+                if socket_path:
+                    from src.browser_service import RemoteWebValidator
+                    validator = RemoteWebValidator(socket_path)
+                elif int(os.getenv('VALIDATOR_WORKERS', 2)) > 0:
+                    from src.validation_pool import ValidationPool
+                    validator = ValidationPool.from_env()
+                else:
+                    validator = WebCompanyValidator()
+                await validator.__aenter__()
+                _web_validator = validator
+    return _web_validator
+
+def web_validator_ready() -> bool:
+    """Whether the shared browser has been launched"""
+    return _web_validator is not None and _web_validator.ready
+
+async def close_web_validator():
+    """Close the shared browser (or browser workers) and stop the Playwright driver"""
+    global _web_validator
+    async with _web_validator_lock:
+        if _web_validator is not None:
+            validator, _web_validator = _web_validator, None
+            await validator.__aexit__(None, None, None)
\ No newline at end of file
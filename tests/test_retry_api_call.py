@@ -0,0 +1,27 @@
+import asyncio
+import threading
+import unittest
+
+from src.ai_client import GeminiAIClient
+
+class RetryApiCallCancellationTest(unittest.IsolatedAsyncioTestCase):
+    async def test_cancelled_call_releases_its_model(self):
+        client = GeminiAIClient()
+        started, finish = threading.Event(), threading.Event()
+
+        def slow_call(model):
+            started.set()
+            finish.wait(5)
+
+        task = asyncio.create_task(client._retry_api_call(slow_call, "Chat response"))
+        await asyncio.to_thread(started.wait, 5)
+        self.assertEqual(sum(client.router._in_flight.values()), 1)
+
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        finish.set()
+        self.assertEqual(sum(client.router._in_flight.values()), 0)
+
+if __name__ == "__main__":
+    unittest.main()